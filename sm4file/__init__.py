@@ -1,21 +1,48 @@
-from dataclasses import dataclass
+from __future__ import annotations
+import asyncio
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Iterator, List
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from datetime import datetime
 
 import numpy as np
-from numpy._typing import NDArray
+from numpy._typing import DTypeLike, NDArray
 
-from .sm4_object_types import StringData
+from .sm4_object_types import PageData, Prm, SequentialData, StringData
 
 from .sm4_file import (
+    ObjectDecoders,
+    ObjectSelection,
+    Source,
     Sm4FileAll,
+    RhkObjectType,
     RhkPageType,
     RhkLineType,
     RhkImageType,
     RhkScanType,
+    Sm4Page,
     Sm4PageHeaderDefault,
+    Sm4PageHeaderSequential,
+    select_objects,
 )
+from .scan import Sm4HeaderRecord, scan_headers
+from .parallel import load_many
+from .index import Sm4Index
+from .cache import CacheInfo, Sm4Cache
+from .stats import LoadStats
 
 
 @dataclass()
@@ -25,7 +52,9 @@ class Sm4Channel:
     Attributes:
         page_type: Type of page/channel
         line_type: Type of line
-        datetime: Datetime of measurement
+        datetime: Datetime of measurement. If it is not stored in the file,
+            the file's creation time, or None if the file is not read from a
+            path
         xres: Resolution in x, e.g. number of pixels for images
         yres: Resolution in y, e.g. number of pixels for images
         image_type: Type of image
@@ -41,13 +70,21 @@ class Sm4Channel:
         bias: Bias voltage (in V)
         current: Tunneling current (in A)
         angle: Scan angle (in deg)
-        data: Measuremet data
+        data: Measuremet data. None if the file is read with `keep_raw=True`,
+            `mmap=True` or `lazy=True`, until it is read or scaled with
+            [`load_data`][sm4file.Sm4Channel.load_data]
+        raw_data: Unscaled measurement data as stored in the file, only
+            available if the file is read with `keep_raw=True`, `mmap=True`
+            or `lazy=True`
+        thumbnail: Small preview of the unscaled measurement data as stored
+            in the file, if the file contains one. Also read with `lazy=True`,
+            without reading the measurement data
     """
 
     label: str
     page_type: RhkPageType
     line_type: RhkLineType
-    datetime: datetime
+    datetime: Optional[datetime]
     xres: int
     yres: int
     image_type: RhkImageType
@@ -63,7 +100,164 @@ class Sm4Channel:
     bias: float
     current: float
     angle: float
-    data: NDArray[np.float32]
+    data: Optional[NDArray[np.floating[Any]]] = None
+    thumbnail: Optional[NDArray[np.int32]] = field(default=None, repr=False)
+    _page_data: Optional[PageData] = field(
+        default=None, init=False, repr=False
+    )
+    _loader: Optional[Callable[[], PageData]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _region_loader: Optional[
+        Callable[[slice, slice], NDArray[np.floating[Any]]]
+    ] = field(default=None, init=False, repr=False, compare=False)
+
+    def load_data(self) -> NDArray[np.floating[Any]]:
+        """Get the measurement data, reading it from the file for lazily
+        loaded channels and scaling the raw data if it is not scaled yet
+
+        Returns:
+            The measurement data, which is also kept in `data`
+
+        Raises:
+            ValueError: If the channel has neither data nor raw data
+        """
+        if self.data is None:
+            self.data = self._load_page_data().data
+        return self.data
+
+    @property
+    def raw_data(self) -> NDArray[np.int32]:
+        """Unscaled measurement data"""
+        return self._load_page_data().raw_data
+
+    def _load_page_data(self) -> PageData:
+        if self._page_data is None:
+            if self._loader is None:
+                raise ValueError(f"No page data kept for channel {self.label}")
+            self._page_data = self._loader()
+        return self._page_data
+
+    def read_region(
+        self, rows: slice = slice(None), cols: slice = slice(None)
+    ) -> NDArray[np.floating[Any]]:
+        """Get a rectangular region of an image's measurement data. For
+        lazily loaded channels, whose data is not read yet, only the rows
+        containing the region are read from the file
+
+        Args:
+            rows: Rows of the region
+            cols: Columns of the region
+
+        Returns:
+            The data of the region, equal to `data[rows, cols]`
+
+        Raises:
+            ValueError: If the channel is not an image
+        """
+        if (
+            self.data is None
+            and self._page_data is None
+            and self._region_loader is not None
+        ):
+            return self._region_loader(rows, cols)
+
+        data = self.load_data()
+        if data.ndim != 2 or self.line_type != RhkLineType.RHK_LINE_NOT_A_LINE:
+            raise ValueError("Regions can only be read from images")
+        return data[rows, cols]
+
+    def preview(self, max_side: int = 256) -> NDArray[np.floating[Any]]:
+        """Get a downsampled image, taking every n-th row and column of the
+        measurement data, so that no side is longer than `max_side`. For
+        lazily loaded channels, whose data is not read yet, only the taken
+        rows are read from the file and only the taken values are scaled
+
+        Args:
+            max_side: Maximal number of rows and columns
+
+        Returns:
+            The downsampled data, oriented like `data`
+
+        Raises:
+            ValueError: If the channel is not an image
+        """
+        step = max(-(-max(self.xres, self.yres) // max_side), 1)
+        return self.read_region(
+            slice(None, None, step), slice(None, None, step)
+        )
+
+    def release(self) -> None:
+        """Release the measurement data. For lazily loaded channels it is read
+        again from the file by the next
+        [`load_data`][sm4file.Sm4Channel.load_data]. If the raw data is kept,
+        only the scaled data is released and computed again by the next
+        `load_data`. Data which cannot be read again is kept.
+        """
+        if self._loader is not None or self._page_data is not None:
+            self.data = None
+        if self._loader is not None:
+            self._page_data = None
+        elif self._page_data is not None:
+            self._page_data.release()
+
+
+@dataclass()
+class Sm4SequentialChannel:
+    """Class holding the information about a channel of a sequential page,
+    e.g. recorded by a data logger
+
+    Attributes:
+        param_labels: Label of every parameter
+        param_units: Unit of every parameter
+        param_gains: Gain of every parameter
+        data: Measurement data with a row for every sample and a column for
+            every parameter, scaled with the gains. For lazily loaded
+            channels it is read from the file on first access
+        raw_data: Unscaled measurement data as stored in the file
+    """
+
+    param_labels: List[str]
+    param_units: List[str]
+    param_gains: List[float]
+    _sequential_data: Optional[SequentialData] = field(
+        default=None, init=False, repr=False
+    )
+    _loader: Optional[Callable[[], SequentialData]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def label(self) -> str:
+        """Labels of the parameters, joined by commas"""
+        return ", ".join(self.param_labels)
+
+    @property
+    def data(self) -> NDArray[np.floating[Any]]:
+        """Measurement data"""
+        return self._load_sequential_data().data
+
+    @property
+    def raw_data(self) -> NDArray[Any]:
+        """Unscaled measurement data"""
+        return self._load_sequential_data().raw_data
+
+    def _load_sequential_data(self) -> SequentialData:
+        if self._sequential_data is None:
+            if self._loader is None:
+                raise ValueError(f"No data kept for channel {self.label}")
+            self._sequential_data = self._loader()
+        return self._sequential_data
+
+    def release(self) -> None:
+        """Release the measurement data. For lazily loaded channels it is read
+        again from the file on the next access of `data`, otherwise only the
+        scaled data is released and computed again on the next access.
+        """
+        if self._loader is not None:
+            self._sequential_data = None
+        elif self._sequential_data is not None:
+            self._sequential_data.release()
 
 
 class Sm4:
@@ -71,41 +265,104 @@ class Sm4:
 
     Contains all channels of the file as [`Sm4Channel`s][sm4file.Sm4Channel].
     To access the channels, the instantiated object can be indexed or iterated
-    over, like a list.
+    over, like a list. Sequential pages are available as
+    [`Sm4SequentialChannel`s][sm4file.Sm4SequentialChannel] in
+    `sequential_channels`. The file parameters are available as
+    [`Prm`][sm4file.sm4_object_types.Prm] in `prm`, and are only decompressed
+    when accessed.
 
     Args:
-        filepath: SM4-file to read
+        filepath: SM4-file to read. Instead of a path, the file's content as
+            bytes, an `io.BytesIO` or any seekable binary stream can be given
+        mmap: If True, the file is memory-mapped instead of read into memory.
+            The channels keep the unscaled data as views into the mapping and
+            the scaled data is only computed by
+            [`Sm4Channel.load_data`][sm4file.Sm4Channel.load_data]
+        lazy: If True, only the metadata is parsed and the channels' data is
+            read from the file by
+            [`Sm4Channel.load_data`][sm4file.Sm4Channel.load_data]
+        dtype: Floating point type of the channels' data, e.g. `np.float32`
+            to halve the memory of the data arrays
+        keep_raw: If True, the channels keep the unscaled data and the scaled
+            data is only computed by
+            [`Sm4Channel.load_data`][sm4file.Sm4Channel.load_data]
+        threads: If set, the channels are read concurrently by this number of
+            threads
+        coalesce: If set, the file is read with few large reads, merging
+            objects which are at most this number of bytes apart
+        stats: If set, the phases of reading, the reads and seeks and the
+            allocated arrays are recorded in this
+            [`LoadStats`][sm4file.stats.LoadStats]
+        objects: If set, only the Page Header objects of these types are
+            read, or of a preset like `"minimal"`, which reads only the
+            [`StringData`][sm4file.sm4_object_types.StringData] holding the
+            labels and dates, see
+            [`select_objects`][sm4file.sm4_file.select_objects]. The
+            StringData is read with every selection, as the channels need it
+        decoders: Decoders of Page Header objects for this file, overriding
+            the registered ones, see
+            [`Sm4FileAll`][sm4file.sm4_file.Sm4FileAll]
     """
 
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-        sm4file = Sm4FileAll(filepath)
-        self.prm_str = sm4file.file_header.prm.prm_data
+    def __init__(
+        self,
+        filepath: Source,
+        mmap: bool = False,
+        lazy: bool = False,
+        dtype: DTypeLike = np.float64,
+        keep_raw: bool = False,
+        threads: Optional[int] = None,
+        coalesce: Optional[int] = None,
+        stats: Optional[LoadStats] = None,
+        objects: Optional[ObjectSelection] = None,
+        decoders: Optional[ObjectDecoders] = None,
+    ):
+        selected = select_objects(objects)
+        if selected is not None:
+            selected |= {RhkObjectType.RHK_OBJECT_STRING_DATA}
+        sm4file = Sm4FileAll(
+            filepath,
+            mmap=mmap,
+            lazy=lazy,
+            dtype=dtype,
+            threads=threads,
+            coalesce=coalesce,
+            stats=stats,
+            objects=selected,
+            decoders=decoders,
+        )
+        self.filepath = sm4file.filepath
+        self.read_stats = sm4file.read_stats
+        self.prm: Prm = sm4file.file_header.prm
         self._channels: List[Sm4Channel] = []
-        for ch in sm4file.pages:
-            if isinstance(ch.header, Sm4PageHeaderDefault):
-                ch_datetime = None
-                for i in ch.header.page_header_objects:
-                    if type(i) == StringData:
-                        month_str, day_str, year_str = i.date.split("/")
-                        year_str = "20" + year_str
-                        month, day, year = (
-                            int(month_str),
-                            int(day_str),
-                            int(year_str),
-                        )
-                        hour, min, sec = [int(x) for x in i.time.split(":")]
-                        ch_datetime = datetime(
-                            year, month, day, hour, min, sec
+        self.sequential_channels: List[Sm4SequentialChannel] = []
+        phase = nullcontext() if stats is None else stats.phase("channels")
+        with phase:
+            for ch in sm4file.pages:
+                if isinstance(ch.header, Sm4PageHeaderSequential):
+                    sequential_channel = Sm4SequentialChannel(
+                        param_labels=ch.header.sequential_param_label,
+                        param_units=ch.header.sequential_param_unit,
+                        param_gains=ch.header.sequential_param_gain,
+                    )
+                    sequential_channel._sequential_data = ch.sequential_data
+                    if lazy:
+                        sequential_channel._loader = (
+                            self._sequential_channel_loader(sm4file, ch)
                         )
+                    self.sequential_channels.append(sequential_channel)
+                if isinstance(ch.header, Sm4PageHeaderDefault):
+                    ch_datetime = None
+                    for i in ch.header.page_header_objects:
+                        if type(i) == StringData:
+                            ch_datetime = i.measurement_datetime()
 
-                # fallback to file stats
-                if ch_datetime is None:
-                    file_datetime = Path(filepath).stat().st_ctime
-                    ch_datetime = datetime.fromtimestamp(file_datetime)
+                    # fallback to file stats
+                    if ch_datetime is None and self.filepath is not None:
+                        file_datetime = Path(self.filepath).stat().st_ctime
+                        ch_datetime = datetime.fromtimestamp(file_datetime)
 
-                self._channels.append(
-                    Sm4Channel(
+                    channel = Sm4Channel(
                         label=ch.label,
                         page_type=ch.header.page_type,
                         line_type=ch.header.line_type,
@@ -125,9 +382,126 @@ class Sm4:
                         bias=ch.header.bias,
                         current=ch.header.current,
                         angle=ch.header.angle,
-                        data=ch.data.data,
+                        data=(
+                            None
+                            if ch.data is None or keep_raw or mmap
+                            else ch.data.data
+                        ),
+                        thumbnail=(
+                            None
+                            if ch.thumbnail is None
+                            else ch.thumbnail.thumbnail_data
+                        ),
                     )
-                )
+                    if keep_raw or mmap:
+                        channel._page_data = ch.data
+                    if lazy:
+                        channel._loader = self._channel_loader(sm4file, ch)
+                        channel._region_loader = partial(
+                            sm4file.load_page_region, ch
+                        )
+                    self._channels.append(channel)
+
+        if stats is not None and threads is None:
+            # with threads, the data is scaled and counted by Sm4FileAll
+            stats.add_allocated(
+                sum(0 if ch.data is None else ch.data.nbytes for ch in self)
+            )
+
+    @staticmethod
+    def _channel_loader(
+        sm4file: Sm4FileAll, page: Sm4Page
+    ) -> Callable[[], PageData]:
+        """Create the function reading a lazily loaded channel's data"""
+
+        def load() -> PageData:
+            page_data = sm4file.load_page_data(page)
+            # the channel holds the only reference, so it can be released
+            page.data = None
+            return page_data
+
+        return load
+
+    @staticmethod
+    def _sequential_channel_loader(
+        sm4file: Sm4FileAll, page: Sm4Page
+    ) -> Callable[[], SequentialData]:
+        """Create the function reading a lazily loaded sequential channel's
+        data
+        """
+
+        def load() -> SequentialData:
+            sequential_data = sm4file.load_sequential_data(page)
+            # the channel holds the only reference, so it can be released
+            page.sequential_data = None
+            return sequential_data
+
+        return load
+
+    @classmethod
+    async def open_async(
+        cls,
+        filepath: Source,
+        mmap: bool = False,
+        dtype: DTypeLike = np.float64,
+    ) -> Sm4:
+        """Read a SM4-file in a worker thread, without blocking the event loop
+
+        Only the metadata is parsed, like with `lazy=True`. The channels'
+        data is read when iterating with `async for`, see
+        [`iter_async`][sm4file.Sm4.iter_async].
+
+        Args:
+            filepath: SM4-file to read
+            mmap: If True, the file is memory-mapped instead of read into
+                memory
+            dtype: Floating point type of the channels' data
+
+        Returns:
+            The [`Sm4`][sm4file.Sm4] with lazily loaded channels
+        """
+        return await asyncio.to_thread(
+            cls, filepath, mmap=mmap, lazy=True, dtype=dtype
+        )
+
+    async def iter_async(
+        self, concurrency: int = 2
+    ) -> AsyncIterator[Sm4Channel]:
+        """Iterate over the channels, reading their data in worker threads
+
+        Up to `concurrency` channels are read ahead while the previous ones
+        are processed. Channels are yielded in order. If the iteration is
+        stopped or cancelled, no further channels are read.
+
+        Args:
+            concurrency: Maximal number of channels read at the same time
+
+        Yields:
+            The [`Sm4Channel`s][sm4file.Sm4Channel] with their data loaded
+            into `data`
+        """
+        pending: Deque[Tuple[Sm4Channel, asyncio.Future[Any]]] = deque()
+        try:
+            for ch in self._channels:
+                pending.append((
+                    ch,
+                    asyncio.ensure_future(asyncio.to_thread(ch.load_data)),
+                ))
+                if len(pending) >= concurrency:
+                    ch, future = pending.popleft()
+                    await future
+                    yield ch
+
+            while pending:
+                ch, future = pending.popleft()
+                await future
+                yield ch
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def __aiter__(self) -> AsyncIterator[Sm4Channel]:
+        return self.iter_async()
 
     def __repr__(self) -> str:
         return repr(self._channels)
@@ -147,6 +521,16 @@ class Sm4:
     def __iter__(self) -> Iterator[Sm4Channel]:
         return iter(self._channels)
 
+    @property
+    def prm_str(self) -> str:
+        """File parameters as text, decompressed on first access"""
+        return self.prm.prm_data
+
+    @property
+    def prm_params(self) -> Dict[str, Dict[str, str]]:
+        """File parameters by section and key, parsed on first access"""
+        return self.prm.params
+
     def save_prm(self, out_file: str) -> None:
         """Save file parameters as text file
 
@@ -0,0 +1,393 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+import json
+import os
+from os import PathLike
+from pathlib import Path
+import platform
+import tempfile
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from . import Sm4
+from .cursor import Cursor
+from .sm4_file import (
+    Sm4FileAll,
+    Sm4FileHeader,
+    Sm4Page,
+    Sm4PageHeaderDefault,
+)
+from .synthetic import write_sm4
+
+# TypeAlias
+Results = Dict[str, Dict[str, float]]
+"""Type for benchmark results: the time in seconds of every phase, by input
+size"""
+
+SIZES: Dict[str, int] = {
+    "small": 1 << 20,
+    "medium": 64 << 20,
+    "huge": 1 << 30,
+}
+"""Approximate file sizes of the inputs, by name"""
+
+DEFAULT_SIZES = ("small", "medium")
+"""Input sizes benchmarked by default. The huge input, which writes and
+parses a 1 GiB file, has to be chosen explicitly"""
+
+PHASES = (
+    "file_header",
+    "prm",
+    "page_index",
+    "page_header",
+    "page_data",
+    "arrange_data",
+    "scale",
+    "sm4",
+)
+"""Timed phases of parsing, in the order they are run"""
+
+# differences below this many seconds are considered noise
+_MIN_DELTA = 1e-4
+
+
+@dataclass
+class Regression:
+    """A phase which got slower than its baseline
+
+    Attributes:
+        size: Name of the input size
+        phase: Name of the phase
+        baseline: Time of the baseline in seconds
+        time: Measured time in seconds
+    """
+
+    size: str
+    phase: str
+    baseline: float
+    time: float
+
+    @property
+    def ratio(self) -> float:
+        """Measured time relative to the baseline"""
+        return self.time / self.baseline
+
+
+def benchmark_file(
+    filepath: Union[str, PathLike[str]], repeat: int = 5
+) -> Dict[str, float]:
+    """Time every phase of parsing a SM4-file separately
+
+    Every phase is run `repeat` times and the fastest run is kept. The
+    phases are:
+
+    - `file_header`: [`Sm4FileHeader.from_buffer`][sm4file.sm4_file.Sm4FileHeader.from_buffer]
+    - `prm`: reading, decompressing and decoding the PRM
+    - `page_index`: parsing the Page Index Header and Page Index Array
+    - `page_header`: parsing the Page Headers and
+        [`Sm4PageHeaderDefault.read_data`][sm4file.sm4_file.Sm4PageHeaderDefault.read_data]
+    - `page_data`: [`PageData.from_buffer`][sm4file.sm4_object_types.PageData.from_buffer]
+        of all pages
+    - `arrange_data`: [`Sm4Page.arrange_data`][sm4file.sm4_file.Sm4Page.arrange_data]
+        of all pages
+    - `scale`: scaling the Page Data of all pages
+    - `sm4`: reading the whole file with [`Sm4`][sm4file.Sm4]
+
+    Args:
+        filepath: SM4-file to parse
+        repeat: Number of runs of every phase
+
+    Returns:
+        The time in seconds of every phase
+    """
+    # the parsed headers tell the phases where to read from
+    pages = Sm4FileAll(filepath, lazy=True).pages
+
+    with open(filepath, "rb") as f:
+        cursor = Cursor(f)
+
+        def file_header() -> Sm4FileHeader:
+            cursor.set_position(0)
+            return Sm4FileHeader.from_buffer(cursor)
+
+        header = file_header()
+        header.read_prm_header(cursor)
+
+        def prm() -> None:
+            header.read_prm(cursor)
+            header.prm.prm_data
+
+        def page_index() -> None:
+            header.read_page_index_header(cursor)
+            page_index_header = header.page_index_header
+            cursor.set_position(page_index_header.page_index_array_offset())
+            for _ in range(page_index_header.page_count):
+                Sm4Page.from_buffer(cursor)
+
+        def page_header() -> None:
+            for page in pages:
+                cursor.set_position(page.page_header_offset())
+                Sm4PageHeaderDefault.from_buffer(cursor).read_data(cursor)
+
+        def page_data() -> None:
+            for page in pages:
+                page.read_data(cursor)
+
+        def unarrange_data() -> None:
+            for page, raw_data in zip(pages, unarranged):
+                if page.data is not None and raw_data is not None:
+                    page.data.raw_data = raw_data
+
+        def arrange_data() -> None:
+            for page in pages:
+                page.arrange_data()
+
+        def scale() -> None:
+            for page in pages:
+                if page.data is not None:
+                    page.data.scale()
+
+        times = {
+            "file_header": _best_time(file_header, repeat),
+            "prm": _best_time(prm, repeat),
+            "page_index": _best_time(page_index, repeat),
+            "page_header": _best_time(page_header, repeat),
+            "page_data": _best_time(page_data, repeat),
+        }
+        # the raw data as read, restored before every run of arrange_data
+        unarranged = [
+            None if page.data is None else page.data.raw_data for page in pages
+        ]
+        times["arrange_data"] = _best_time(
+            arrange_data, repeat, setup=unarrange_data
+        )
+        times["scale"] = _best_time(scale, repeat)
+
+    # release the Page Data before the whole file is read
+    del pages
+    times["sm4"] = _best_time(lambda: Sm4(filepath), repeat)
+    return times
+
+
+def run_benchmarks(
+    sizes: Iterable[str] = DEFAULT_SIZES,
+    directory: Optional[Union[str, PathLike[str]]] = None,
+    repeat: int = 5,
+) -> Results:
+    """Benchmark the parsing of synthetic SM4-files of different sizes
+
+    The files are written with
+    [`write_sm4`][sm4file.synthetic.write_sm4] with default arguments apart
+    from their size, so they are identical between runs.
+
+    Args:
+        sizes: Names of the input sizes, see `SIZES`
+        directory: Directory for the synthetic files. Existing files are
+            reused. If None, a temporary directory is used
+        repeat: Number of runs of every phase
+
+    Returns:
+        The time in seconds of every phase, by input size
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base = Path(tmp_dir if directory is None else directory)
+        results: Results = {}
+        for name in sizes:
+            path = base / f"synthetic_{name}.SM4"
+            if not path.is_file():
+                write_sm4(path, size=SIZES[name])
+            results[name] = benchmark_file(path, repeat)
+        return results
+
+
+def find_regressions(
+    baseline: Results, results: Results, tolerance: float = 0.5
+) -> List[Regression]:
+    """Compare benchmark results with a baseline
+
+    Args:
+        baseline: Results of the baseline
+        results: Results to check
+        tolerance: Allowed slowdown relative to the baseline, e.g. 0.5 for
+            50 %
+
+    Returns:
+        The phases which are slower than allowed. Phases which are missing
+        in the baseline are not compared
+    """
+    regressions = []
+    for size, times in results.items():
+        for phase, measured in times.items():
+            expected = baseline.get(size, {}).get(phase)
+            if expected is None:
+                continue
+            if (
+                measured > expected * (1 + tolerance)
+                and measured - expected > _MIN_DELTA
+            ):
+                regressions.append(Regression(size, phase, expected, measured))
+    return regressions
+
+
+def host_info() -> Dict[str, str]:
+    """Description of the machine and software running the benchmarks.
+    Timings are only comparable between runs with equal host info
+
+    Returns:
+        The host name, machine type, processor, CPU count and the versions
+        of Python and numpy
+    """
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": str(os.cpu_count()),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def save_baseline(
+    filepath: Union[str, PathLike[str]], results: Results
+) -> None:
+    """Write benchmark results as JSON baseline, together with the
+    [`host_info`][sm4file.benchmark.host_info]
+
+    Args:
+        filepath: Path of the JSON file
+        results: Results of [`run_benchmarks`][sm4file.benchmark.run_benchmarks]
+    """
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {"host": host_info(), "results": results}
+    path.write_text(json.dumps(baseline, indent=4) + "\n")
+
+
+def load_baseline(
+    filepath: Union[str, PathLike[str]]
+) -> Tuple[Dict[str, str], Results]:
+    """Read a JSON baseline written by
+    [`save_baseline`][sm4file.benchmark.save_baseline]
+
+    Args:
+        filepath: Path of the JSON file
+
+    Returns:
+        The host info and the results of the baseline
+    """
+    baseline = json.loads(Path(filepath).read_text())
+    return baseline["host"], baseline["results"]
+
+
+def _best_time(
+    func: Callable[[], object],
+    repeat: int,
+    setup: Optional[Callable[[], object]] = None,
+) -> float:
+    """Fastest of `repeat` runs of `func` in seconds, each after an untimed
+    call of `setup`
+    """
+    best = np.inf
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return float(best)
+
+
+def _print_results(results: Results, baseline: Optional[Results]) -> None:
+    for size, times in results.items():
+        print(f"{size} ({SIZES[size] >> 20} MiB)")
+        for phase, measured in times.items():
+            line = f"  {phase:<14}{measured * 1e3:>12.3f} ms"
+            expected = None if baseline is None else baseline.get(size, {})
+            if expected is not None and phase in expected:
+                line += f"{measured / expected[phase]:>10.2f} x baseline"
+            print(line)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line interface of the benchmarks
+
+    Args:
+        argv: Command line arguments, defaults to `sys.argv[1:]`
+
+    Returns:
+        The exit status, 1 if a phase regressed compared to the baseline
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sm4file.benchmark",
+        description="Time the phases of parsing synthetic SM4-files",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(SIZES),
+        default=list(DEFAULT_SIZES),
+        help="input sizes to benchmark, huge (1 GiB) only if given",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs of every phase"
+    )
+    parser.add_argument(
+        "--directory", help="directory for the synthetic files"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="JSON baseline to compare with, if recorded on this host",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed slowdown relative to the baseline",
+    )
+    parser.add_argument(
+        "--save", type=Path, help="write the results as JSON baseline"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline is not None:
+        baseline_host, baseline = load_baseline(args.baseline)
+        if baseline_host != host_info():
+            print(
+                f"Not comparing with {args.baseline}, it was recorded on a"
+                " different host"
+            )
+            baseline = None
+
+    results = run_benchmarks(args.sizes, args.directory, args.repeat)
+    _print_results(results, baseline)
+
+    if args.save is not None:
+        save_baseline(args.save, results)
+
+    if baseline is None:
+        return 0
+    regressions = find_regressions(baseline, results, args.tolerance)
+    for regression in regressions:
+        print(
+            f"Regression: {regression.phase} ({regression.size}) took"
+            f" {regression.ratio:.2f} x the baseline"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,328 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+import numpy as np
+from numpy._typing import DTypeLike, NDArray
+
+from .sm4_file import Sm4FileAll
+from .sm4_object_types import PageData, SequentialData
+
+if TYPE_CHECKING:
+    from . import Sm4
+
+_T = TypeVar("_T")
+
+# TypeAlias
+_Key = Tuple[Any, ...]
+# TypeAlias
+_Signature = Tuple[int, int]
+
+
+@dataclass
+class CacheInfo:
+    """Statistics of a [`Sm4Cache`][sm4file.cache.Sm4Cache]
+
+    Attributes:
+        hits: Number of lookups served from the cache
+        misses: Number of lookups which read the file
+        evictions: Number of entries removed to stay within the memory budget
+        invalidations: Number of entries removed because their file changed
+        entries: Number of cached entries
+        nbytes: Total size of the cached arrays in bytes
+        max_bytes: Memory budget of the cache in bytes
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    nbytes: int
+    max_bytes: int
+
+
+@dataclass
+class _Entry:
+    signature: _Signature
+    value: Any
+    nbytes: int
+
+
+class Sm4Cache:
+    """In-memory cache of read SM4-files
+
+    Entries are identified by the path of the file together with its size
+    and modification time, so they are invalidated automatically when the
+    file changes on disk. When the total size of the cached arrays exceeds
+    `max_bytes`, the least recently used entries are evicted. Objects larger
+    than `max_bytes` are returned without being cached.
+
+    The cache is thread-safe. Returned objects are shared between all
+    callers and must not be modified.
+
+    Args:
+        max_bytes: Memory budget for the cached arrays in bytes
+    """
+
+    def __init__(self, max_bytes: int = 1 << 30):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(
+        self,
+        filepath: Union[str, PathLike[str]],
+        dtype: DTypeLike = np.float64,
+    ) -> Sm4:
+        """Get a SM4-file, reading it on a miss
+
+        Args:
+            filepath: SM4-file to read
+            dtype: Floating point type of the channels' data
+
+        Returns:
+            The [`Sm4`][sm4file.Sm4]
+        """
+        from . import Sm4
+
+        path = _resolve(filepath)
+        dtype = np.dtype(dtype)
+        return self._lookup(
+            ("sm4", path, dtype.str),
+            path,
+            lambda: Sm4(path, dtype=dtype),
+            _sm4_nbytes,
+        )
+
+    def get_file(
+        self,
+        filepath: Union[str, PathLike[str]],
+        dtype: DTypeLike = np.float64,
+    ) -> Sm4FileAll:
+        """Get the complete structure of a SM4-file, reading it on a miss
+
+        Args:
+            filepath: SM4-file to read
+            dtype: Floating point type of the pages' data
+
+        Returns:
+            The [`Sm4FileAll`][sm4file.sm4_file.Sm4FileAll]
+        """
+        path = _resolve(filepath)
+        dtype = np.dtype(dtype)
+        return self._lookup(
+            ("sm4_file", path, dtype.str),
+            path,
+            lambda: Sm4FileAll(path, dtype=dtype),
+            _sm4_file_nbytes,
+        )
+
+    def get_data(
+        self,
+        filepath: Union[str, PathLike[str]],
+        channel: int,
+        dtype: DTypeLike = np.float64,
+    ) -> NDArray[np.floating[Any]]:
+        """Get the data of a single channel, reading only this channel on a
+        miss. If the whole file is cached, its channel's data is returned.
+
+        Args:
+            filepath: SM4-file to read
+            channel: Index of the channel
+            dtype: Floating point type of the data
+
+        Returns:
+            The read-only data of the channel
+        """
+        from . import Sm4
+
+        path = _resolve(filepath)
+        dtype = np.dtype(dtype)
+        sm4 = self._peek(("sm4", path, dtype.str), path)
+        if sm4 is not None:
+            return cast(NDArray[np.floating[Any]], sm4[channel].load_data())
+
+        def load() -> NDArray[np.floating[Any]]:
+            data = Sm4(path, lazy=True, dtype=dtype)[channel].load_data()
+            data.flags.writeable = False
+            return data
+
+        return self._lookup(
+            ("data", path, dtype.str, channel),
+            path,
+            load,
+            lambda data: data.nbytes,
+        )
+
+    def invalidate(
+        self, filepath: Optional[Union[str, PathLike[str]]] = None
+    ) -> None:
+        """Remove the entries of a file, or all entries
+
+        Args:
+            filepath: SM4-file whose entries are removed. If None, the whole
+                cache is cleared
+        """
+        path = None if filepath is None else _resolve(filepath)
+        with self._lock:
+            for key in list(self._entries):
+                if path is None or key[1] == path:
+                    self._remove(key)
+
+    def info(self) -> CacheInfo:
+        """Get the statistics of the cache
+
+        Returns:
+            The current [`CacheInfo`][sm4file.cache.CacheInfo]
+        """
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+                nbytes=self._nbytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _peek(self, key: _Key, path: str) -> Any:
+        """Get a valid entry without loading it or counting a miss"""
+        signature = _signature(path)
+        with self._lock:
+            entry = self._valid_entry(key, path, signature)
+            if entry is None:
+                return None
+            self._hits += 1
+            return entry.value
+
+    def _lookup(
+        self,
+        key: _Key,
+        path: str,
+        load: Callable[[], _T],
+        nbytes: Callable[[_T], int],
+    ) -> _T:
+        """Get an entry, loading and inserting it on a miss"""
+        signature = _signature(path)
+        with self._lock:
+            entry = self._valid_entry(key, path, signature)
+            if entry is not None:
+                self._hits += 1
+                return cast(_T, entry.value)
+            self._misses += 1
+
+        # read outside the lock, so other files are served in the meantime
+        value = load()
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(signature, value, size)
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+        return value
+
+    def _valid_entry(
+        self, key: _Key, path: str, signature: _Signature
+    ) -> Optional[_Entry]:
+        """Get an entry and mark it as recently used. If the file changed,
+        all entries of the file are removed instead
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.signature != signature:
+            for stale in [k for k in self._entries if k[1] == path]:
+                self._remove(stale)
+                self._invalidations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: _Key) -> None:
+        self._nbytes -= self._entries.pop(key).nbytes
+
+
+def _resolve(filepath: Union[str, PathLike[str]]) -> str:
+    return str(Path(filepath).resolve())
+
+
+def _signature(path: str) -> _Signature:
+    stat = Path(path).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _page_data_nbytes(page_data: Optional[PageData]) -> int:
+    """Size of the raw and the scaled data, also if the data is only scaled
+    on first access after it is cached
+    """
+    if page_data is None:
+        return 0
+    nbytes = page_data.raw_data.nbytes
+    if page_data.x_values is None:
+        nbytes += page_data.raw_data.size * page_data.dtype.itemsize
+    else:
+        y_size, x_size = page_data.raw_data.shape
+        nbytes += page_data.x_values.nbytes
+        nbytes += x_size * (y_size + 1) * page_data.dtype.itemsize
+    return nbytes
+
+
+def _sm4_nbytes(sm4: Sm4) -> int:
+    return sum(
+        # scaled data of the page data is already counted with it
+        (0 if ch.data is None or ch._page_data is not None else ch.data.nbytes)
+        + _page_data_nbytes(ch._page_data)
+        for ch in sm4
+    ) + sum(
+        _sequential_data_nbytes(ch._sequential_data)
+        for ch in sm4.sequential_channels
+    )
+
+
+def _sequential_data_nbytes(sequential_data: Optional[SequentialData]) -> int:
+    """Size of the raw and the scaled data, also if the data is only scaled
+    on first access after it is cached
+    """
+    if sequential_data is None:
+        return 0
+    return sequential_data.raw_data.nbytes + (
+        sequential_data.raw_data.size * sequential_data.dtype.itemsize
+    )
+
+
+def _sm4_file_nbytes(sm4file: Sm4FileAll) -> int:
+    return sum(
+        _page_data_nbytes(page.data)
+        + _sequential_data_nbytes(page.sequential_data)
+        for page in sm4file.pages
+    )
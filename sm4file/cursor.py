@@ -1,12 +1,95 @@
-from io import BufferedReader
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+import io
+import mmap
+import os
 import struct
-from typing import cast
+import sys
+import threading
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+# TypeAlias
+Buffer = Union[BinaryIO, mmap.mmap]
+"""Type for the buffers a [`Cursor`][sm4file.cursor.Cursor] can hold"""
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_I16 = struct.Struct("<h")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_U64 = struct.Struct("<q")
+_F32 = struct.Struct("<f")
+_F64 = struct.Struct("<d")
+
+# strings up to this length, e.g. units and labels, are interned, so
+# repeated strings share memory across pages and files
+_INTERN_MAX_LENGTH = 32
+
+
+def decode_string(raw: bytes) -> str:
+    """Decode bytes of a string, dropping all null bytes
+
+    Args:
+        raw: Bytes of the string
+
+    Returns:
+        The decoded string
+    """
+    return raw.decode("latin-1").replace("\x00", "")
+
+
+def decode_sm4_strings(raw: bytes, lengths: List[int]) -> List[str]:
+    """Decode consecutive UTF-16 encoded strings with a single decode.
+    Null characters and surrounding whitespace are removed and short strings
+    are interned
+
+    Args:
+        raw: Bytes of all strings, without their lengths
+        lengths: Length of every string in UTF-16 code units
+
+    Returns:
+        The decoded strings
+    """
+    text = raw.decode("utf-16-le", errors="replace")
+    if len(text) == len(raw) // 2:
+        starts = [0]
+        for length in lengths:
+            starts.append(starts[-1] + length)
+        parts = [text[start:end] for start, end in zip(starts, starts[1:])]
+    else:
+        # characters outside of the BMP take two code units, decode each
+        # string on its own
+        parts = []
+        start = 0
+        for length in lengths:
+            end = start + length * 2
+            parts.append(raw[start:end].decode("utf-16-le", errors="replace"))
+            start = end
+
+    strings = []
+    for part in parts:
+        string = part.replace("\x00", "").strip()
+        if len(string) <= _INTERN_MAX_LENGTH:
+            string = sys.intern(string)
+        strings.append(string)
+    return strings
 
 
 class Cursor:
     """Class for handeling a buffer"""
 
-    def __init__(self, buffer: BufferedReader):
+    def __init__(self, buffer: Buffer):
         self._buffer = buffer
 
     def set_position(self, position: int) -> None:
@@ -17,13 +100,21 @@ class Cursor:
         """
         self._buffer.seek(position)
 
+    def tell(self) -> int:
+        """Get the position of the cursor
+
+        Returns:
+            The current byte-position
+        """
+        return self._buffer.tell()
+
     def skip(self, bytes_to_skip: int) -> None:
         """Skip bytes of the buffer
 
         Args:
             bytes_to_skip: Number of bytes to skip
         """
-        self.set_position(self._buffer.tell() + bytes_to_skip)
+        self.set_position(self.tell() + bytes_to_skip)
 
     def read(self, num_bytes: int) -> bytes:
         """Read bytes, while moving cursor
@@ -36,6 +127,55 @@ class Cursor:
         """
         return self._buffer.read(num_bytes)
 
+    def read_view(self, num_bytes: int) -> Union[bytes, memoryview]:
+        """Read bytes, while moving cursor. If the buffer is memory-mapped,
+        the returned bytes are a view into the mapping and no copy is made
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            The read bytes
+        """
+        if not isinstance(self._buffer, mmap.mmap):
+            return self._buffer.read(num_bytes)
+
+        position = self._buffer.tell()
+        view = memoryview(self._buffer)[position : position + num_bytes]
+        self._buffer.seek(position + len(view))
+        return view
+
+    def read_struct(self, layout: struct.Struct) -> Tuple[Any, ...]:
+        """Read a fixed-size record with a single precompiled struct
+
+        Args:
+            layout: Layout of the record
+
+        Returns:
+            The unpacked fields of the record
+        """
+        if isinstance(self._buffer, mmap.mmap):
+            position = self._buffer.tell()
+            fields = layout.unpack_from(self._buffer, position)
+            self._buffer.seek(position + layout.size)
+            return fields
+
+        return layout.unpack(self._buffer.read(layout.size))
+
+    def iter_struct(
+        self, layout: struct.Struct, count: int
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Read an array of fixed-size records with a single read
+
+        Args:
+            layout: Layout of a single record
+            count: Number of records
+
+        Returns:
+            Iterator over the unpacked fields of the records
+        """
+        return layout.iter_unpack(self.read(layout.size * count))
+
     def read_string(self, str_len: int) -> str:
         """Read bytes as string
 
@@ -45,9 +185,7 @@ class Cursor:
         Returns:
             The read string
         """
-        return "".join(
-            [chr(i).rstrip("\x00") for i in self._buffer.read(str_len)]
-        )
+        return decode_string(self.read(str_len))
 
     def read_sm4_string(self) -> str:
         """Read bytes as a UTF-16 encoded string. In SM4-files string data
@@ -58,7 +196,26 @@ class Cursor:
             The read string
         """
         length = self.read_u16_le()
-        return self.read_string(length * 2).strip()
+        return decode_sm4_strings(self.read(length * 2), [length])[0]
+
+    def read_sm4_strings(self, count: int) -> List[str]:
+        """Read consecutive UTF-16 encoded strings, see
+        [`read_sm4_string`][sm4file.cursor.Cursor.read_sm4_string]. All
+        strings are decoded at once
+
+        Args:
+            count: Number of strings
+
+        Returns:
+            The read strings
+        """
+        lengths = []
+        raw = []
+        for _ in range(count):
+            length = self.read_u16_le()
+            lengths.append(length)
+            raw.append(self.read(length * 2))
+        return decode_sm4_strings(b"".join(raw), lengths)
 
     def read_u8_le(self) -> int:
         """Read a 8-bit unsigned integer
@@ -66,7 +223,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<B", self._buffer.read(1))[0])
+        return cast(int, self.read_struct(_U8)[0])
 
     def read_u16_le(self) -> int:
         """Read a 16-bit unsigned integer
@@ -74,7 +231,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<H", self._buffer.read(2))[0])
+        return cast(int, self.read_struct(_U16)[0])
 
     def read_i16_le(self) -> int:
         """Read a 16-bit signed integer
@@ -82,7 +239,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<h", self._buffer.read(2))[0])
+        return cast(int, self.read_struct(_I16)[0])
 
     def read_u32_le(self) -> int:
         """Read a 32-bit unsigned integer
@@ -90,7 +247,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<I", self._buffer.read(4))[0])
+        return cast(int, self.read_struct(_U32)[0])
 
     def read_i32_le(self) -> int:
         """Read a 32-bit signed integer
@@ -98,7 +255,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<i", self._buffer.read(4))[0])
+        return cast(int, self.read_struct(_I32)[0])
 
     def read_u64_le(self) -> int:
         """Read a 64-bit unsigned integer
@@ -106,7 +263,7 @@ class Cursor:
         Returns:
             The read integer
         """
-        return cast(int, struct.unpack("<q", self._buffer.read(8))[0])
+        return cast(int, self.read_struct(_U64)[0])
 
     def read_f32_le(self) -> float:
         """Read a 64-bit floating point number
@@ -114,7 +271,7 @@ class Cursor:
         Returns:
             The read float
         """
-        return cast(float, struct.unpack("<f", self._buffer.read(4))[0])
+        return cast(float, self.read_struct(_F32)[0])
 
     def read_f64_le(self) -> float:
         """Read a 64-bit floating point number
@@ -122,4 +279,623 @@ class Cursor:
         Returns:
             The read float
         """
-        return cast(float, struct.unpack("<d", self._buffer.read(8))[0])
+        return cast(float, self.read_struct(_F64)[0])
+
+
+# TypeAlias
+PositionalSource = Union[Buffer, bytes, bytearray, memoryview]
+"""Type for the sources a
+[`PositionalCursor`][sm4file.cursor.PositionalCursor] can read from"""
+
+# serializes seek and read on platforms without os.pread
+_pread_lock = threading.Lock()
+
+
+def _pread(fd: int, num_bytes: int, position: int) -> bytes:
+    """Read bytes at a position without changing the state of the file"""
+    if hasattr(os, "pread"):
+        return os.pread(fd, num_bytes, position)
+
+    with _pread_lock:
+        os.lseek(fd, position, os.SEEK_SET)
+        return os.read(fd, num_bytes)
+
+
+class PositionalCursor(Cursor):
+    """Class for handeling a buffer with positional reads
+
+    The cursor keeps its own position and does not change the state of the
+    underlying file, so multiple cursors can read the same file from
+    different threads. Memory-mapped files and bytes are read by slicing,
+    files with `os.pread`.
+
+    Args:
+        source: File opened in binary mode, memory-mapped file or bytes
+        position: Initial byte-position of the cursor
+    """
+
+    def __init__(self, source: PositionalSource, position: int = 0):
+        self._position = position
+        self._view: Optional[memoryview] = None
+        self._fd: Optional[int] = None
+        if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._view = memoryview(source)
+        else:
+            self._fd = source.fileno()
+
+    def set_position(self, position: int) -> None:
+        """Set the postition of the cursor
+
+        Args:
+            position: Byte-position to set
+        """
+        self._position = position
+
+    def tell(self) -> int:
+        """Get the position of the cursor
+
+        Returns:
+            The current byte-position
+        """
+        return self._position
+
+    def read(self, num_bytes: int) -> bytes:
+        """Read bytes, while moving cursor
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            bytes: The read bytes
+        """
+        if self._view is not None:
+            data = bytes(
+                self._view[self._position : self._position + num_bytes]
+            )
+        else:
+            assert self._fd is not None
+            data = _pread(self._fd, num_bytes, self._position)
+        self._position += len(data)
+        return data
+
+    def read_view(self, num_bytes: int) -> Union[bytes, memoryview]:
+        """Read bytes, while moving cursor. If the source is memory-mapped or
+        bytes, the returned bytes are a view into it and no copy is made
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            The read bytes
+        """
+        if self._view is None:
+            return self.read(num_bytes)
+
+        view = self._view[self._position : self._position + num_bytes]
+        self._position += len(view)
+        return view
+
+    def read_struct(self, layout: struct.Struct) -> Tuple[Any, ...]:
+        """Read a fixed-size record with a single precompiled struct
+
+        Args:
+            layout: Layout of the record
+
+        Returns:
+            The unpacked fields of the record
+        """
+        if self._view is None:
+            return layout.unpack(self.read(layout.size))
+
+        fields = layout.unpack_from(self._view, self._position)
+        self._position += layout.size
+        return fields
+
+
+class StreamCursor(Cursor):
+    """Class for handeling a stream which can only be read forward, e.g. a
+    pipe or a decompressing stream
+
+    Positions ahead of the stream are reached by reading forward. The bytes
+    read from the stream are kept, so positions behind the stream can still
+    be read, except for bytes returned by
+    [`read_view`][sm4file.cursor.StreamCursor.read_view], which are handed
+    over to the caller, and bytes in ranges given to
+    [`release`][sm4file.cursor.StreamCursor.release] or
+    [`release_read`][sm4file.cursor.StreamCursor.release_read]. To keep the
+    buffered bytes small, the positions should be read in increasing order
+    and bytes which are not read anymore released.
+
+    Args:
+        stream: Stream opened in binary mode
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._position = 0
+        self._stream_position = 0
+        self._chunks: Dict[int, bytes] = {}
+        self._chunk_starts: List[int] = []
+        # merged, non-overlapping ranges of bytes which are not kept
+        self._released_starts: List[int] = []
+        self._released_ends: List[int] = []
+        # ranges read since the last release_read
+        self._read_ranges: List[Tuple[int, int]] = []
+
+    def set_position(self, position: int) -> None:
+        """Set the postition of the cursor
+
+        Args:
+            position: Byte-position to set
+        """
+        self._position = position
+
+    def tell(self) -> int:
+        """Get the position of the cursor
+
+        Returns:
+            The current byte-position
+        """
+        return self._position
+
+    def read(self, num_bytes: int) -> bytes:
+        """Read bytes, while moving cursor
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            bytes: The read bytes
+
+        Raises:
+            BufferError: If the bytes were passed in the stream and not kept
+        """
+        end = self._position + num_bytes
+        self._read_ranges.append((self._position, end))
+        parts: List[bytes] = []
+        while self._position < end:
+            if self._position >= self._stream_position:
+                self._advance(self._position)
+                data = self._read_stream(end - self._position)
+                self._keep(self._position, data)
+                parts.append(data)
+                self._position += len(data)
+                break
+
+            data = self._read_kept(end)
+            parts.append(data)
+            self._position += len(data)
+
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def read_view(self, num_bytes: int) -> Union[bytes, memoryview]:
+        """Read bytes, while moving cursor. Bytes ahead of the stream are
+        not kept by the cursor, so they can only be read once
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            The read bytes
+        """
+        if self._position < self._stream_position:
+            return self.read(num_bytes)
+
+        self._read_ranges.append((self._position, self._position + num_bytes))
+        self._advance(self._position)
+        data = self._read_stream(num_bytes)
+        self._position += len(data)
+        return data
+
+    def read_struct(self, layout: struct.Struct) -> Tuple[Any, ...]:
+        """Read a fixed-size record with a single precompiled struct
+
+        Args:
+            layout: Layout of the record
+
+        Returns:
+            The unpacked fields of the record
+        """
+        return layout.unpack(self.read(layout.size))
+
+    def _read_stream(self, num_bytes: int) -> bytes:
+        """Read bytes from the stream, until `num_bytes` or its end"""
+        data = self._stream.read(num_bytes)
+        while 0 < len(data) < num_bytes:
+            more = self._stream.read(num_bytes - len(data))
+            if not more:
+                break
+            data += more
+        self._stream_position += len(data)
+        return data
+
+    def _advance(self, position: int) -> None:
+        """Read the stream up to a position, keeping the skipped bytes"""
+        while self._stream_position < position:
+            start = self._stream_position
+            data = self._read_stream(position - start)
+            if not data:
+                break
+            self._keep(start, data)
+
+    def release(self, start: int, end: int) -> None:
+        """Drop the kept bytes of a range, because they are not read
+        anymore. Bytes of the range are not kept when they are passed in the
+        stream later
+
+        Args:
+            start: Byte-position of the start of the range
+            end: Byte-position after the end of the range
+        """
+        if start >= end:
+            return
+        first = bisect_left(self._released_ends, start)
+        last = bisect_right(self._released_starts, end)
+        if first < last:
+            start = min(start, self._released_starts[first])
+            end = max(end, self._released_ends[last - 1])
+        self._released_starts[first:last] = [start]
+        self._released_ends[first:last] = [end]
+
+        first = max(bisect_right(self._chunk_starts, start) - 1, 0)
+        last = bisect_left(self._chunk_starts, end)
+        for chunk_start in self._chunk_starts[first:last]:
+            chunk = self._chunks[chunk_start]
+            chunk_end = chunk_start + len(chunk)
+            if chunk_end <= start:
+                continue
+            del self._chunks[chunk_start]
+            if chunk_start < start:
+                self._chunks[chunk_start] = chunk[: start - chunk_start]
+            if chunk_end > end:
+                self._chunks[end] = chunk[end - chunk_start :]
+        self._chunk_starts = sorted(self._chunks)
+
+    def release_read(self) -> None:
+        """Drop the kept bytes of all ranges read since the last call, see
+        [`release`][sm4file.cursor.StreamCursor.release]. Bytes which were
+        only passed in the stream are still kept
+        """
+        read_ranges, self._read_ranges = self._read_ranges, []
+        for start, end in read_ranges:
+            self.release(start, end)
+
+    @property
+    def nbytes_kept(self) -> int:
+        """Number of bytes kept to read positions behind the stream"""
+        return sum(len(chunk) for chunk in self._chunks.values())
+
+    def _keep(self, start: int, data: bytes) -> None:
+        """Keep bytes read from the stream, except for released ranges"""
+        end = start + len(data)
+        index = bisect_right(self._released_ends, start)
+        position = start
+        while position < end:
+            if (
+                index < len(self._released_starts)
+                and self._released_starts[index] < end
+            ):
+                part_end = max(self._released_starts[index], position)
+                next_position = self._released_ends[index]
+                index += 1
+            else:
+                part_end = next_position = end
+            if part_end > position:
+                self._chunks[position] = data[
+                    position - start : part_end - start
+                ]
+                insort(self._chunk_starts, position)
+            position = next_position
+
+    def _read_kept(self, end: int) -> bytes:
+        """Read kept bytes from the current position up to `end` or the end
+        of the chunk containing the position
+        """
+        index = bisect_right(self._chunk_starts, self._position) - 1
+        if index >= 0:
+            start = self._chunk_starts[index]
+            chunk = self._chunks[start]
+            if self._position < start + len(chunk):
+                return chunk[self._position - start : end - start]
+
+        raise BufferError(
+            f"Byte-position {self._position} was already passed in the stream"
+        )
+
+
+@dataclass
+class ReadStats:
+    """Reads issued to a file
+
+    Attributes:
+        reads: Number of reads
+        nbytes: Number of bytes read
+    """
+
+    reads: int = 0
+    nbytes: int = 0
+
+
+class CoalescingCursor(Cursor):
+    """Class for handeling a file with few large reads
+
+    Byte ranges announced with
+    [`prefetch`][sm4file.cursor.CoalescingCursor.prefetch] are merged when
+    they are close together and read at once. Reads of the cursor are served
+    from these regions. Reads outside of them read at least `min_read`
+    bytes, which serve the following reads.
+
+    Files are read with positional reads. Seekable streams without a file
+    descriptor, e.g. wrapped or in-memory files, are read with a seek and a
+    read per region instead.
+
+    Args:
+        f: File or seekable stream opened in binary mode
+        max_gap: Maximal number of bytes between two ranges, which are merged
+            into a single read
+        min_read: Minimal number of bytes read on a read outside of the
+            prefetched regions
+
+    Attributes:
+        stats: The [`ReadStats`][sm4file.cursor.ReadStats] of the reads
+            issued to the file
+    """
+
+    def __init__(self, f: BinaryIO, max_gap: int = 4096, min_read: int = 4096):
+        self._f = f
+        self._fd: Optional[int]
+        try:
+            self._fd = f.fileno()
+        except (io.UnsupportedOperation, AttributeError):
+            self._fd = None
+        self._position = 0
+        self.max_gap = max_gap
+        self.min_read = min_read
+        self.stats = ReadStats()
+        # sorted, non-overlapping regions read from the file
+        self._region_starts: List[int] = []
+        self._regions: List[memoryview] = []
+
+    def set_position(self, position: int) -> None:
+        """Set the postition of the cursor
+
+        Args:
+            position: Byte-position to set
+        """
+        self._position = position
+
+    def tell(self) -> int:
+        """Get the position of the cursor
+
+        Returns:
+            The current byte-position
+        """
+        return self._position
+
+    def prefetch(self, ranges: Iterable[Tuple[int, int]]) -> None:
+        """Read byte ranges which are read by the cursor later, merging
+        ranges closer than `max_gap` into a single read. Ranges which are
+        already read are skipped, ranges smaller than `min_read` are
+        extended
+
+        Args:
+            ranges: Offsets and sizes of the byte ranges
+        """
+        merged: List[List[int]] = []
+        for start, size in sorted(ranges):
+            if size <= 0:
+                continue
+            # objects are often followed by parts not included in their size,
+            # like the object list of a header
+            end = start + max(size, self.min_read)
+            if self._find(start, start + size) is not None:
+                continue
+            if merged and start - merged[-1][1] <= self.max_gap:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        for start, end in merged:
+            self._fetch(start, end - start)
+
+    def read(self, num_bytes: int) -> bytes:
+        """Read bytes, while moving cursor
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            bytes: The read bytes
+        """
+        return bytes(self.read_view(num_bytes))
+
+    def read_view(self, num_bytes: int) -> Union[bytes, memoryview]:
+        """Read bytes, while moving cursor. The returned bytes are a view
+        into the read region and no copy is made
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            The read bytes
+        """
+        start, region = self._region(num_bytes)
+        offset = self._position - start
+        view = region[offset : offset + num_bytes]
+        self._position += len(view)
+        return view
+
+    def read_struct(self, layout: struct.Struct) -> Tuple[Any, ...]:
+        """Read a fixed-size record with a single precompiled struct
+
+        Args:
+            layout: Layout of the record
+
+        Returns:
+            The unpacked fields of the record
+        """
+        start, region = self._region(layout.size)
+        fields = layout.unpack_from(region, self._position - start)
+        self._position += layout.size
+        return fields
+
+    def _region(self, num_bytes: int) -> Tuple[int, memoryview]:
+        """Find the region containing the next bytes, reading it on a miss"""
+        found = self._find(self._position, self._position + num_bytes)
+        if found is not None:
+            return found
+        return self._fetch(self._position, max(num_bytes, self.min_read))
+
+    def _find(self, start: int, end: int) -> Optional[Tuple[int, memoryview]]:
+        """Find the region containing a byte range. As the regions do not
+        overlap, only the region starting last before the range can
+        """
+        index = bisect_right(self._region_starts, start) - 1
+        if index >= 0:
+            region_start = self._region_starts[index]
+            region = self._regions[index]
+            if end <= region_start + len(region):
+                return region_start, region
+        return None
+
+    def _fetch(self, start: int, size: int) -> Tuple[int, memoryview]:
+        """Read a region with a single read. Regions overlapping it are
+        trimmed to the bytes outside of it, without copying
+        """
+        if self._fd is None:
+            self._f.seek(start)
+            data = self._f.read(size)
+        else:
+            data = _pread(self._fd, size, start)
+        self.stats.reads += 1
+        self.stats.nbytes += len(data)
+        region = memoryview(data)
+        if not region:
+            return start, region
+
+        end = start + len(region)
+        starts = self._region_starts
+        regions = self._regions
+        first = bisect_left(starts, start)
+        if first > 0:
+            before_start = starts[first - 1]
+            before = regions[first - 1]
+            if before_start + len(before) > start:
+                regions[first - 1] = before[: start - before_start]
+                # the region before may also reach beyond the new one
+                if before_start + len(before) > end:
+                    starts.insert(first, end)
+                    regions.insert(first, before[end - before_start :])
+        last = bisect_left(starts, end, lo=first)
+        new_starts = [start]
+        new_regions = [region]
+        if last > first:
+            last_start = starts[last - 1]
+            last_region = regions[last - 1]
+            if last_start + len(last_region) > end:
+                new_starts.append(end)
+                new_regions.append(last_region[end - last_start :])
+        starts[first:last] = new_starts
+        regions[first:last] = new_regions
+        return start, region
+
+
+@dataclass
+class CursorStats:
+    """Reads and seeks of a [`Cursor`][sm4file.cursor.Cursor], counted by a
+    [`CountingCursor`][sm4file.cursor.CountingCursor]. The counts are updated
+    under a lock, so a single `CursorStats` can be shared by cursors used in
+    different threads
+
+    Attributes:
+        reads: Number of reads
+        seeks: Number of changes of the position
+        nbytes: Number of bytes read
+    """
+
+    reads: int = 0
+    seeks: int = 0
+    nbytes: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+
+class CountingCursor(Cursor):
+    """Class wrapping another [`Cursor`][sm4file.cursor.Cursor] and counting
+    its reads and seeks
+
+    Reads are counted as issued to the cursor, so reads served by a
+    [`CoalescingCursor`][sm4file.cursor.CoalescingCursor] from its regions
+    count as well.
+
+    Args:
+        cursor: The cursor to read with
+        stats: The [`CursorStats`][sm4file.cursor.CursorStats] to update
+    """
+
+    def __init__(self, cursor: Cursor, stats: CursorStats):
+        self.cursor = cursor
+        self.stats = stats
+
+    def set_position(self, position: int) -> None:
+        """Set the postition of the wrapped cursor, counting a seek
+
+        Args:
+            position: Byte-position to set
+        """
+        with self.stats._lock:
+            self.stats.seeks += 1
+        self.cursor.set_position(position)
+
+    def tell(self) -> int:
+        """Get the position of the wrapped cursor
+
+        Returns:
+            The current byte-position
+        """
+        return self.cursor.tell()
+
+    def read(self, num_bytes: int) -> bytes:
+        """Read bytes with the wrapped cursor, counting a read
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            bytes: The read bytes
+        """
+        data = self.cursor.read(num_bytes)
+        self._count(len(data))
+        return data
+
+    def read_view(self, num_bytes: int) -> Union[bytes, memoryview]:
+        """Read bytes with the wrapped cursor's `read_view`, counting a read
+
+        Args:
+            num_bytes: Number of bytes to read
+
+        Returns:
+            The read bytes
+        """
+        data = self.cursor.read_view(num_bytes)
+        self._count(len(data))
+        return data
+
+    def read_struct(self, layout: struct.Struct) -> Tuple[Any, ...]:
+        """Read a fixed-size record with the wrapped cursor, counting a read
+
+        Args:
+            layout: Layout of the record
+
+        Returns:
+            The unpacked fields of the record
+        """
+        fields = self.cursor.read_struct(layout)
+        self._count(layout.size)
+        return fields
+
+    def _count(self, nbytes: int) -> None:
+        with self.stats._lock:
+            self.stats.reads += 1
+            self.stats.nbytes += nbytes
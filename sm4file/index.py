@@ -0,0 +1,327 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from os import PathLike
+from pathlib import Path
+import sqlite3
+from types import TracebackType
+from typing import Any, Iterable, List, Optional, Tuple, Type, Union
+
+from .scan import (
+    READ_ERRORS,
+    ErrorHandler,
+    Sm4HeaderRecord,
+    find_sm4_files,
+    report_error,
+    scan_file,
+)
+from .sm4_file import RhkLineType, RhkPageDataType, RhkPageType
+
+# increased on changes of the schema, older indexes are rebuilt
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    page_count INTEGER NOT NULL,
+    object_list_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    page_index INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    page_data_type INTEGER NOT NULL,
+    page_type INTEGER NOT NULL,
+    line_type INTEGER NOT NULL,
+    datetime TEXT,
+    xres INTEGER NOT NULL,
+    yres INTEGER NOT NULL,
+    xsize REAL NOT NULL,
+    ysize REAL NOT NULL,
+    bias REAL NOT NULL,
+    current REAL NOT NULL,
+    page_header_offset INTEGER NOT NULL,
+    page_data_offset INTEGER NOT NULL,
+    page_data_size INTEGER NOT NULL,
+    PRIMARY KEY (path, page_index)
+);
+CREATE INDEX IF NOT EXISTS channels_page_type ON channels(page_type);
+CREATE INDEX IF NOT EXISTS channels_bias ON channels(bias);
+CREATE INDEX IF NOT EXISTS channels_datetime ON channels(datetime);
+"""
+
+_COLUMNS = (
+    "path",
+    "page_index",
+    "label",
+    "page_data_type",
+    "page_type",
+    "line_type",
+    "datetime",
+    "xres",
+    "yres",
+    "xsize",
+    "ysize",
+    "bias",
+    "current",
+    "page_header_offset",
+    "page_data_offset",
+    "page_data_size",
+)
+
+
+@dataclass
+class Sm4FileRecord:
+    """Class holding the metadata of an indexed SM4-file
+
+    Attributes:
+        filepath: The SM4-file
+        size: Size of the file in bytes
+        mtime_ns: Modification time of the file in nanoseconds
+        signature: Signature of the file's format and version
+        page_count: Number of pages in the file
+        object_list_count: Number of objects in the file header's object
+            list
+    """
+
+    filepath: str
+    size: int
+    mtime_ns: int
+    signature: str
+    page_count: int
+    object_list_count: int
+
+
+class Sm4Index:
+    """Persistent index of the metadata of SM4-files in a SQLite database
+
+    Files are identified by path, size and modification time, so only new
+    or changed files are read again on an
+    [`update`][sm4file.index.Sm4Index.update]. The metadata is read with
+    [`scan_header`][sm4file.scan.scan_header], without reading any data.
+
+    Args:
+        database: Path of the SQLite database, created if it does not exist
+    """
+
+    def __init__(self, database: Union[str, PathLike[str]] = ":memory:"):
+        self._connection = sqlite3.connect(database)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            # the index only caches the files' metadata, so it is rebuilt
+            self._connection.executescript(
+                "DROP TABLE IF EXISTS channels; DROP TABLE IF EXISTS files;"
+            )
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def __enter__(self) -> Sm4Index:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database"""
+        self._connection.close()
+
+    def update(
+        self,
+        paths: Iterable[Union[str, PathLike[str]]],
+        errors: Optional[ErrorHandler] = None,
+    ) -> int:
+        """Add new and changed SM4-files to the index
+
+        Files which cannot be read, e.g. because they are truncated or
+        corrupt, are skipped and removed from the index. Every file is
+        added in its own transaction.
+
+        Args:
+            paths: SM4-files or directories containing SM4-files
+            errors: Called with the path and the exception of every skipped
+                file. If None, a warning is issued instead
+
+        Returns:
+            The number of files read
+        """
+        num_read = 0
+        for filepath in find_sm4_files(paths):
+            path = str(filepath.resolve())
+            try:
+                stat = filepath.stat()
+                row = self._connection.execute(
+                    "SELECT size, mtime_ns FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if row == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                file_header, records = scan_file(path)
+            except READ_ERRORS as error:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM files WHERE path = ?", (path,)
+                    )
+                report_error(filepath, error, errors)
+                continue
+
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM files WHERE path = ?", (path,)
+                )
+                self._connection.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        file_header.signature,
+                        file_header.page_count,
+                        file_header.object_list_count,
+                    ),
+                )
+                self._connection.executemany(
+                    "INSERT INTO channels VALUES"
+                    f" ({', '.join('?' * len(_COLUMNS))})",
+                    [_record_to_row(record) for record in records],
+                )
+            num_read += 1
+
+        return num_read
+
+    def files(self) -> List[Sm4FileRecord]:
+        """Get the metadata of all indexed files
+
+        Returns:
+            A [`Sm4FileRecord`][sm4file.index.Sm4FileRecord] for every file
+        """
+        return [
+            Sm4FileRecord(*row)
+            for row in self._connection.execute(
+                "SELECT * FROM files ORDER BY path"
+            )
+        ]
+
+    def prune(self) -> int:
+        """Remove files from the index which do not exist anymore
+
+        Returns:
+            The number of removed files
+        """
+        paths = [
+            path
+            for (path,) in self._connection.execute("SELECT path FROM files")
+            if not Path(path).is_file()
+        ]
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM files WHERE path = ?", [(path,) for path in paths]
+            )
+        return len(paths)
+
+    def query(
+        self,
+        label: Optional[str] = None,
+        page_type: Optional[RhkPageType] = None,
+        bias: Optional[Tuple[float, float]] = None,
+        current: Optional[Tuple[float, float]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Sm4HeaderRecord]:
+        """Find the channels matching all of the given criteria
+
+        Args:
+            label: Label of the channel
+            page_type: Type of page/channel
+            bias: Minimal and maximal bias voltage (in V)
+            current: Minimal and maximal tunneling current (in A)
+            start: Earliest datetime of measurement
+            end: Datetime of measurement before which the channel was measured
+
+        Returns:
+            The [`Sm4HeaderRecord`s][sm4file.scan.Sm4HeaderRecord] of the
+            matching channels
+        """
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if label is not None:
+            conditions.append("label = ?")
+            parameters.append(label)
+        if page_type is not None:
+            conditions.append("page_type = ?")
+            parameters.append(page_type.value)
+        if bias is not None:
+            conditions.append("bias BETWEEN ? AND ?")
+            parameters.extend(bias)
+        if current is not None:
+            conditions.append("current BETWEEN ? AND ?")
+            parameters.extend(current)
+        if start is not None:
+            conditions.append("datetime >= ?")
+            parameters.append(start.isoformat())
+        if end is not None:
+            conditions.append("datetime < ?")
+            parameters.append(end.isoformat())
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM channels"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY path, page_index"
+
+        return [
+            _row_to_record(row)
+            for row in self._connection.execute(sql, parameters)
+        ]
+
+
+def _record_to_row(record: Sm4HeaderRecord) -> Tuple[Any, ...]:
+    """Convert a record to a row of the channels table"""
+    return (
+        record.filepath,
+        record.page_index,
+        record.label,
+        record.page_data_type.value,
+        record.page_type.value,
+        record.line_type.value,
+        None if record.datetime is None else record.datetime.isoformat(),
+        record.xres,
+        record.yres,
+        record.xsize,
+        record.ysize,
+        record.bias,
+        record.current,
+        record.page_header_offset,
+        record.page_data_offset,
+        record.page_data_size,
+    )
+
+
+def _row_to_record(row: Tuple[Any, ...]) -> Sm4HeaderRecord:
+    """Convert a row of the channels table to a record"""
+    (
+        filepath,
+        page_index,
+        label,
+        page_data_type,
+        page_type,
+        line_type,
+        datetime_str,
+        *rest,
+    ) = row
+    return Sm4HeaderRecord(
+        filepath,
+        page_index,
+        label,
+        RhkPageDataType(page_data_type),
+        RhkPageType(page_type),
+        RhkLineType(line_type),
+        None if datetime_str is None else datetime.fromisoformat(datetime_str),
+        *rest,
+    )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from os import PathLike
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+import weakref
+
+import numpy as np
+from numpy._typing import DTypeLike, NDArray
+
+if TYPE_CHECKING:
+    from . import Sm4
+
+# On Windows, shared memory is freed as soon as the worker closes it
+_USE_SHARED_MEMORY = sys.platform != "win32"
+
+
+@dataclass
+class _SharedArray:
+    """Location of an array in shared memory"""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+# TypeAlias
+_LoadResult = Tuple["Sm4", Optional[List[Optional[_SharedArray]]]]
+
+
+def load_many(
+    paths: Iterable[Union[str, PathLike[str]]],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    dtype: DTypeLike = np.float64,
+) -> Iterator[Sm4]:
+    """Read SM4-files concurrently in a pool of processes
+
+    The data of the channels and sequential channels is passed back from
+    the worker processes through shared memory instead of being pickled.
+    The arrays stay in the shared memory, which is freed when they are
+    garbage collected.
+
+    Args:
+        paths: SM4-files to read
+        workers: Number of worker processes, defaults to the number of CPUs
+        ordered: If True, the files are yielded in the order of `paths`,
+            otherwise as soon as they are read
+        dtype: Floating point type of the channels' data
+
+    Yields:
+        An [`Sm4`][sm4file.Sm4] for every file
+    """
+    if _USE_SHARED_MEMORY:
+        # workers share the tracker, so it does not free the shared memory
+        # when a worker exits before its results are attached
+        resource_tracker.ensure_running()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_load_shared, str(path), np.dtype(dtype).str)
+            for path in paths
+        ]
+        consumed: Set[Future[_LoadResult]] = set()
+        try:
+            for future in futures if ordered else as_completed(futures):
+                consumed.add(future)
+                yield _attach(*future.result())
+        finally:
+            for future in futures:
+                if future in consumed or future.cancel():
+                    continue
+                try:
+                    _, shared = future.result()
+                except Exception:
+                    continue
+                _unlink_all(shared or [])
+
+
+def _load_shared(filepath: str, dtype: str) -> _LoadResult:
+    """Read a SM4-file in a worker process and move the data of the
+    channels and sequential channels into shared memory. Returns the
+    location of every channel's data, followed by the location of every
+    sequential channel's raw data
+    """
+    from . import Sm4
+
+    sm4 = Sm4(filepath, dtype=dtype)
+    if not _USE_SHARED_MEMORY:
+        return sm4, None
+
+    shared: List[Optional[_SharedArray]] = []
+    try:
+        for ch in sm4:
+            shared.append(_share(ch.load_data()))
+            ch.data = None
+        for sequential_ch in sm4.sequential_channels:
+            sequential_data = sequential_ch._sequential_data
+            if sequential_data is None:
+                shared.append(None)
+                continue
+            raw_data = sequential_data.raw_data
+            shared.append(_share(raw_data))
+            sequential_data.raw_data = raw_data[:0]
+            sequential_data.release()
+    except BaseException:
+        _unlink_all(shared)
+        raise
+
+    return sm4, shared
+
+
+def _share(array: NDArray[Any]) -> _SharedArray:
+    """Copy an array into a new block of shared memory"""
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    view: NDArray[Any] = np.ndarray(
+        array.shape, dtype=array.dtype, buffer=shm.buf
+    )
+    view[...] = array
+    del view
+    shm.close()
+    return _SharedArray(shm.name, array.shape, array.dtype.str)
+
+
+def _attach(sm4: Sm4, shared: Optional[List[Optional[_SharedArray]]]) -> Sm4:
+    """Set the data of the channels and sequential channels to the arrays in
+    shared memory
+    """
+    if shared is None:
+        return sm4
+
+    num_channels = len(sm4)
+    for ch, shared_array in zip(sm4, shared[:num_channels]):
+        assert shared_array is not None
+        ch.data = _attach_array(shared_array)
+    for sequential_ch, shared_array in zip(
+        sm4.sequential_channels, shared[num_channels:]
+    ):
+        sequential_data = sequential_ch._sequential_data
+        if sequential_data is not None and shared_array is not None:
+            sequential_data.raw_data = _attach_array(shared_array)
+
+    return sm4
+
+
+def _attach_array(shared_array: _SharedArray) -> NDArray[Any]:
+    """Map an array in shared memory without copying it. The memory is
+    unlinked at once, so it is freed as soon as it is unmapped, which
+    happens when the array is garbage collected
+    """
+    shm = SharedMemory(name=shared_array.name)
+    array: NDArray[Any] = np.ndarray(
+        shared_array.shape,
+        dtype=np.dtype(shared_array.dtype),
+        buffer=shm.buf,
+    )
+    shm.unlink()
+    finalizer = weakref.finalize(array, shm.close)
+    # at exit the array may still be alive, the mapping is released anyway
+    finalizer.atexit = False
+    return array
+
+
+def _unlink_all(shared: Iterable[Optional[_SharedArray]]) -> None:
+    """Free the blocks of shared memory of arrays which are not attached"""
+    for shared_array in shared:
+        if shared_array is not None:
+            _unlink(shared_array.name)
+
+
+def _unlink(name: str) -> None:
+    """Free a block of shared memory"""
+    shm = SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
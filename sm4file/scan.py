@@ -0,0 +1,224 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from os import PathLike
+from pathlib import Path
+import struct
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+import warnings
+
+from .cursor import Cursor
+from .sm4_file import (
+    RhkLineType,
+    RhkObjectType,
+    RhkPageDataType,
+    RhkPageType,
+    Sm4FileHeader,
+    Sm4Page,
+    Sm4PageHeaderDefault,
+)
+from .sm4_object_types import StringData
+
+# TypeAlias
+ErrorHandler = Callable[[Path, Exception], None]
+"""Type for the function called with the path of a file which could not be
+read and the raised exception"""
+
+READ_ERRORS = (OSError, ValueError, EOFError, BufferError, struct.error)
+"""Exceptions raised when reading truncated, corrupt or inaccessible files"""
+
+
+@dataclass
+class Sm4HeaderRecord:
+    """Class holding the metadata of a page, read without its data
+
+    Attributes:
+        filepath: SM4-file the page belongs to
+        page_index: Index of the page in the file's Page Index Array
+        label: Label of the page
+        page_data_type: Type of data in the page
+        page_type: Type of page/channel
+        line_type: Type of line
+        datetime: Datetime of measurement
+        xres: Resolution in x, e.g. number of pixels for images
+        yres: Resolution in y, e.g. number of pixels for images
+        xsize: Physical size of e.g. image in x (in m)
+        ysize: Physical size of e.g. image in y (in m)
+        bias: Bias voltage (in V)
+        current: Tunneling current (in A)
+        page_header_offset: Byte-position of the Page Header in the file
+        page_data_offset: Byte-position of the Page Data in the file
+        page_data_size: Size of the Page Data in bytes
+    """
+
+    filepath: str
+    page_index: int
+    label: str
+    page_data_type: RhkPageDataType
+    page_type: RhkPageType
+    line_type: RhkLineType
+    datetime: Optional[datetime]
+    xres: int
+    yres: int
+    xsize: float
+    ysize: float
+    bias: float
+    current: float
+    page_header_offset: int
+    page_data_offset: int
+    page_data_size: int
+
+
+def scan_headers(
+    paths: Iterable[Union[str, PathLike[str]]],
+    errors: Optional[ErrorHandler] = None,
+) -> Iterator[Sm4HeaderRecord]:
+    """Read the metadata of all pages of SM4-files without reading the PRM
+    or any Page Data
+
+    Directories are searched recursively for SM4-files. Files which cannot
+    be read, e.g. because they are truncated or corrupt, are skipped.
+
+    Args:
+        paths: SM4-files or directories containing SM4-files
+        errors: Called with the path and the exception of every skipped
+            file. If None, a warning is issued instead
+
+    Yields:
+        A [`Sm4HeaderRecord`][sm4file.scan.Sm4HeaderRecord] for every page
+    """
+    for filepath in find_sm4_files(paths):
+        try:
+            records = scan_header(filepath)
+        except READ_ERRORS as error:
+            report_error(filepath, error, errors)
+            continue
+        yield from records
+
+
+def report_error(
+    filepath: Path, error: Exception, errors: Optional[ErrorHandler] = None
+) -> None:
+    """Report a file which could not be read
+
+    Args:
+        filepath: The file
+        error: The raised exception
+        errors: Called with the path and the exception. If None, a warning
+            is issued instead
+    """
+    if errors is None:
+        warnings.warn(f"Skipped {filepath}: {error!r}", RuntimeWarning)
+    else:
+        errors(filepath, error)
+
+
+def find_sm4_files(
+    paths: Iterable[Union[str, PathLike[str]]]
+) -> Iterator[Path]:
+    """Find SM4-files, searching directories recursively
+
+    Args:
+        paths: SM4-files or directories containing SM4-files
+
+    Yields:
+        The paths of the SM4-files
+    """
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for filepath in sorted(path.rglob("*")):
+                if filepath.suffix.lower() == ".sm4" and filepath.is_file():
+                    yield filepath
+        else:
+            yield path
+
+
+def scan_header(filepath: Union[str, PathLike[str]]) -> List[Sm4HeaderRecord]:
+    """Read the metadata of all pages of a SM4-file without reading the PRM
+    or any Page Data
+
+    Args:
+        filepath: SM4-file to read
+
+    Returns:
+        A [`Sm4HeaderRecord`][sm4file.scan.Sm4HeaderRecord] for every page
+    """
+    return scan_file(filepath)[1]
+
+
+def scan_file(
+    filepath: Union[str, PathLike[str]]
+) -> Tuple[Sm4FileHeader, List[Sm4HeaderRecord]]:
+    """Read the file header and the metadata of all pages of a SM4-file
+    without reading the PRM or any Page Data
+
+    Args:
+        filepath: SM4-file to read
+
+    Returns:
+        The [`Sm4FileHeader`][sm4file.sm4_file.Sm4FileHeader] and a
+        [`Sm4HeaderRecord`][sm4file.scan.Sm4HeaderRecord] for every page
+    """
+    records: List[Sm4HeaderRecord] = []
+    with open(filepath, "rb") as f:
+        cursor = Cursor(f)
+        file_header = Sm4FileHeader.from_buffer(cursor)
+        file_header.read_page_index_header(cursor)
+        page_index_header = file_header.page_index_header
+
+        cursor.set_position(page_index_header.page_index_array_offset())
+        pages = [
+            Sm4Page.from_buffer(cursor)
+            for _ in range(page_index_header.page_count)
+        ]
+
+        for page_index, page in enumerate(pages):
+            if page.page_data_type == RhkPageDataType.RHK_DATA_SEQUENTIAL:
+                continue
+
+            page_header_offset = page.page_header_offset()
+            cursor.set_position(page_header_offset)
+            header = Sm4PageHeaderDefault.from_buffer(cursor)
+
+            string_data = None
+            for obj in header.object_list:
+                if obj.obj_type == RhkObjectType.RHK_OBJECT_STRING_DATA:
+                    cursor.set_position(obj.offset)
+                    string_data = StringData.from_buffer(
+                        cursor, header.string_count
+                    )
+                    break
+
+            page_data_offset, page_data_size = 0, 0
+            for obj in page.object_list:
+                if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_DATA:
+                    page_data_offset, page_data_size = obj.offset, obj.size
+                    break
+
+            records.append(
+                Sm4HeaderRecord(
+                    filepath=str(filepath),
+                    page_index=page_index,
+                    label="" if string_data is None else string_data.label,
+                    page_data_type=page.page_data_type,
+                    page_type=header.page_type,
+                    line_type=header.line_type,
+                    datetime=(
+                        None
+                        if string_data is None
+                        else string_data.measurement_datetime()
+                    ),
+                    xres=header.x_size,
+                    yres=header.y_size,
+                    xsize=abs(header.x_scale * header.x_size),
+                    ysize=abs(header.y_scale * header.y_size),
+                    bias=header.bias,
+                    current=header.current,
+                    page_header_offset=page_header_offset,
+                    page_data_offset=page_data_offset,
+                    page_data_size=page_data_size,
+                )
+            )
+
+    return file_header, records
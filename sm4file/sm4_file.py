@@ -1,12 +1,46 @@
 from __future__ import annotations
-from typing import List, Union, Optional
-from io import BufferedReader
+from typing import (
+    Any,
+    BinaryIO,
+    AbstractSet,
+    Callable,
+    ClassVar,
+    Collection,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Tuple,
+    Union,
+    Optional,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import partial
+import heapq
+import io
+import itertools
+import mmap
+from os import PathLike, fspath
+import struct
 
 import numpy as np
-
-from .cursor import Cursor
+from numpy._typing import DTypeLike, NDArray
+
+from .cursor import (
+    Buffer,
+    CoalescingCursor,
+    CountingCursor,
+    Cursor,
+    PositionalCursor,
+    PositionalSource,
+    ReadStats,
+    StreamCursor,
+    decode_string,
+)
 from .sm4_object_types import (
     ApiInfo,
     ImageDriftHeader,
@@ -15,7 +49,10 @@ from .sm4_object_types import (
     Prm,
     SpecDriftData,
     SpecDriftHeader,
+    SequentialData,
     StringData,
+    Thumbnail,
+    ThumbnailHeader,
     TipTrackHeader,
     TipTrackData,
     PrmHeader,
@@ -28,6 +65,15 @@ from .sm4_object_types import (
     PiControllerInfo,
     LowpassFilterInfo,
 )
+from .stats import LoadStats
+
+# TypeAlias
+Source = Union[str, PathLike[str], bytes, bytearray, memoryview, BinaryIO]
+"""Type for the sources a SM4-file can be read from: a path, the file's
+content or a seekable binary stream"""
+
+# TypeAlias
+_Mapping = Union[mmap.mmap, memoryview]
 
 # TypeAlias
 FileHeaderObject = Union[Prm, PrmHeader]
@@ -227,6 +273,47 @@ class RhkScanType(Enum):
             return "unknown"
 
 
+# TypeAlias
+ObjectSelection = Union[str, Collection[RhkObjectType]]
+"""Type for the selection of Page Header objects to read: the types of the
+objects, or the name of a preset in `OBJECT_PRESETS`"""
+
+OBJECT_PRESETS: Dict[str, FrozenSet[RhkObjectType]] = {
+    "minimal": frozenset({RhkObjectType.RHK_OBJECT_STRING_DATA}),
+    "all": frozenset(RhkObjectType),
+}
+"""Presets of Page Header objects to read, by name"""
+
+
+def select_objects(
+    objects: Optional[ObjectSelection],
+) -> Optional[FrozenSet[RhkObjectType]]:
+    """Resolve a selection of Page Header objects to read
+
+    Args:
+        objects: The types of the objects, the name of a preset in
+            `OBJECT_PRESETS`, or None for all objects
+
+    Returns:
+        The types of the objects to read, or None for all objects. The Tip
+        Track Header is added if the Tip Track Data is selected, as it is
+        needed to read the data
+
+    Raises:
+        ValueError: If the preset does not exist
+    """
+    if objects is None:
+        return None
+    if isinstance(objects, str):
+        if objects not in OBJECT_PRESETS:
+            raise ValueError(f"Unknown preset of objects: {objects}")
+        return OBJECT_PRESETS[objects]
+    selected = frozenset(objects)
+    if RhkObjectType.RHK_OBJECT_TIP_TRACK_DATA in selected:
+        selected |= {RhkObjectType.RHK_OBJECT_TIP_TRACK_HEADER}
+    return selected
+
+
 @dataclass
 class Sm4Object:
     """Class for indentifying an Object"""
@@ -235,6 +322,9 @@ class Sm4Object:
     offset: int
     size: int
 
+    # obj_type, offset, size
+    _layout: ClassVar[struct.Struct] = struct.Struct("<3I")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> Sm4Object:
         """Creates a [`Sm4Object`][sm4file.sm4_file.Sm4Object] from a buffer
@@ -245,10 +335,27 @@ class Sm4Object:
         Returns:
             The parsed [`Sm4Object`][sm4file.sm4_file.Sm4Object]
         """
-        object_type_id = RhkObjectType(cursor.read_u32_le())
-        offset = cursor.read_u32_le()
-        size = cursor.read_u32_le()
-        return cls(object_type_id, offset, size)
+        object_type_id, offset, size = cursor.read_struct(cls._layout)
+        return cls(RhkObjectType(object_type_id), offset, size)
+
+    @classmethod
+    def list_from_buffer(cls, cursor: Cursor, count: int) -> List[Sm4Object]:
+        """Creates an object list of [`Sm4Object`s][sm4file.sm4_file.Sm4Object]
+        from a buffer with a single read
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            count: Number of objects in the list
+
+        Returns:
+            The parsed [`Sm4Object`s][sm4file.sm4_file.Sm4Object]
+        """
+        return [
+            cls(RhkObjectType(object_type_id), offset, size)
+            for object_type_id, offset, size in cursor.iter_struct(
+                cls._layout, count
+            )
+        ]
 
 
 @dataclass
@@ -268,6 +375,10 @@ class Sm4FileHeader:
     prm_header: PrmHeader = field(init=False)
     prm: Prm = field(init=False)
 
+    # size, signature, page_count, object_list_count, object_field_size,
+    # 2 x reserved
+    _layout: ClassVar[struct.Struct] = struct.Struct("<H36s3I8x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> Sm4FileHeader:
         """Creates a [`Sm4Object`][sm4file.sm4_file.Sm4Object] from a buffer
@@ -277,21 +388,22 @@ class Sm4FileHeader:
 
         Returns:
             The parsed [`Sm4FileHeader`][sm4file.sm4_file.Sm4FileHeader]
-        """
-        size = cursor.read_u16_le()
-        signature = cursor.read_string(36)
-        page_count = cursor.read_u32_le()
-        object_list_count = cursor.read_u32_le()
-        object_field_size = cursor.read_u32_le()
 
-        _ = cursor.read_u32_le()
-        _ = cursor.read_u32_le()
+        Raises:
+            ValueError: If the signature is not the one of SM4-files
+        """
+        (
+            size,
+            signature_raw,
+            page_count,
+            object_list_count,
+            object_field_size,
+        ) = cursor.read_struct(cls._layout)
+        signature = decode_string(signature_raw)
+        if not signature.startswith("STiMage"):
+            raise ValueError(f"Not a SM4-file, signature: {signature!r}")
 
-        object_list: List[Sm4Object] = []
-        for _ in range(object_list_count):
-            obj = Sm4Object.from_buffer(cursor)
-            """ print(obj) """
-            object_list.append(obj)
+        object_list = Sm4Object.list_from_buffer(cursor, object_list_count)
 
         return cls(
             size,
@@ -314,14 +426,19 @@ class Sm4FileHeader:
         if self.prm_header is None:
             raise BufferError("No PRM header in file header")
 
-        for obj in self.object_list:
-            cursor.set_position(obj.offset)
-            if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_INDEX_HEADER:
-                self.page_index_header = Sm4PageIndexHeader.from_buffer(
-                    cursor, obj.offset
-                )
+        self.read_page_index_header(cursor)
+        self.read_prm(cursor)
+
+    def read_prm(self, cursor: Cursor) -> None:
+        """Read the PRM into the `prm` field. The PRM Header has to be read
+        before
 
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+        """
+        for obj in self.object_list:
             if obj.obj_type == RhkObjectType.RHK_OBJECT_PRM:
+                cursor.set_position(obj.offset)
                 self.prm = Prm.from_buffer(
                     cursor,
                     self.prm_header.prm_compression_flag,
@@ -329,6 +446,19 @@ class Sm4FileHeader:
                     self.prm_header.prm_compression_size,
                 )
 
+    def read_page_index_header(self, cursor: Cursor) -> None:
+        """Read the Page Index Header into the `page_index_header` field
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+        """
+        for obj in self.object_list:
+            if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_INDEX_HEADER:
+                cursor.set_position(obj.offset)
+                self.page_index_header = Sm4PageIndexHeader.from_buffer(
+                    cursor, obj.offset
+                )
+
     def read_prm_header(self, cursor: Cursor) -> None:
         """Read the PRM Header into the `prm_header` field
 
@@ -350,6 +480,9 @@ class Sm4PageIndexHeader:
     object_list_count: int
     object_list: List[Sm4Object]
 
+    # page_count, object_list_count, 2 x reserved
+    _layout: ClassVar[struct.Struct] = struct.Struct("<2I8x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor, offset: int) -> Sm4PageIndexHeader:
         """Read the Page Index Header from a buffer
@@ -361,20 +494,14 @@ class Sm4PageIndexHeader:
         Returns:
             The parsed [`Sm4PageIndexHeader`][sm4file.sm4_file.Sm4PageIndexHeader]
         """
-        page_count = cursor.read_u32_le()
-        object_list_count = cursor.read_u32_le()
-        _reserved_1 = cursor.read_u32_le()  # pyright: ignore
-        _reserved_2 = cursor.read_u32_le()  # pyright: ignore
-
-        object_list = []
-        for _ in range(object_list_count):
-            object_list.append(Sm4Object.from_buffer(cursor))
+        page_count, object_list_count = cursor.read_struct(cls._layout)
+        object_list = Sm4Object.list_from_buffer(cursor, object_list_count)
 
         return Sm4PageIndexHeader(
             offset, page_count, object_list_count, object_list
         )
 
-    def page_index_array_offset(self) -> Optional[int]:
+    def page_index_array_offset(self) -> int:
         """Finds the offset of the Page Index Header in the object list
 
         Returns:
@@ -401,6 +528,13 @@ class Sm4PageHeaderSequential:
     data_info_size: int
     data_info_string_count: int
     object_list: List[Sm4Object]
+    sequential_param_gain: List[float] = field(default_factory=list)
+    sequential_param_label: List[str] = field(default_factory=list)
+    sequential_param_unit: List[str] = field(default_factory=list)
+
+    # data_type, data_length, param_count, object_list_count, data_info_size,
+    # data_info_string_count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<6I")
 
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> Sm4PageHeaderSequential:
@@ -412,16 +546,16 @@ class Sm4PageHeaderSequential:
         Returns:
             The parsed [`Sm4PageHeaderSequential`][sm4file.sm4_file.Sm4PageHeaderSequential]
         """
-        data_type = cursor.read_u32_le()
-        data_length = cursor.read_u32_le()
-        param_count = cursor.read_u32_le()
-        object_list_count = cursor.read_u32_le()
-        data_info_size = cursor.read_u32_le()
-        data_info_string_count = cursor.read_u32_le()
+        (
+            data_type,
+            data_length,
+            param_count,
+            object_list_count,
+            data_info_size,
+            data_info_string_count,
+        ) = cursor.read_struct(cls._layout)
 
-        object_list: List[Sm4Object] = []
-        for _ in range(object_list_count):
-            object_list.append(Sm4Object.from_buffer(cursor))
+        object_list = Sm4Object.list_from_buffer(cursor, object_list_count)
 
         sequential_param_gain: List[float] = []
         sequential_param_label: List[str] = []
@@ -439,12 +573,23 @@ class Sm4PageHeaderSequential:
             data_info_size,
             data_info_string_count,
             object_list,
+            sequential_param_gain,
+            sequential_param_label,
+            sequential_param_unit,
         )
 
 
 @dataclass
 class Sm4PageHeaderDefault:
-    """Class representing a default Page Header"""
+    """Class representing a default Page Header
+
+    Attributes:
+        page_header_objects: The read objects of the object_list, in the
+            order they were read. Objects of the built-in decoders are of a
+            type in `PageHeaderObject`, others of the type their
+            [`ObjectDecoder`][sm4file.sm4_file.ObjectDecoder] returns
+        objects_by_type: The read objects of the object_list, by type
+    """
 
     string_count: int
     page_type: RhkPageType
@@ -477,7 +622,18 @@ class Sm4PageHeaderDefault:
     object_list_count: int
     _32_bit_data_flag: int
     object_list: List[Sm4Object]
-    page_header_objects: List[PageHeaderObject] = field(default_factory=list)
+    page_header_objects: List[Any] = field(default_factory=list)
+    objects_by_type: Dict[RhkObjectType, Any] = field(
+        default_factory=dict, repr=False
+    )
+
+    # reserved, string_count, page_type, data_sub_source, line_type,
+    # x_corner, y_corner, x_size, y_size, image_type, scan_type, group_id,
+    # page_data_size, min_z_value, max_z_value, x_scale, y_scale, z_scale,
+    # xy_scale, x_offset, y_offset, z_offset, period, bias, current, angle,
+    # color_info_count, grid_x_size, grid_y_size, object_list_count,
+    # _32_bit_data_flag, 63 x reserved
+    _layout: ClassVar[struct.Struct] = struct.Struct("<2xH13I11f4IB63x")
 
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> Sm4PageHeaderDefault:
@@ -489,57 +645,7 @@ class Sm4PageHeaderDefault:
         Returns:
             The parsed [`Sm4PageHeaderDefault`][sm4file.sm4_file.Sm4PageHeaderSequential]
         """
-        _ = cursor.read_u16_le()
-        string_count = cursor.read_u16_le()
-        page_type = RhkPageType(cursor.read_u32_le())
-        data_sub_source = cursor.read_u32_le()
-
-        line_type = RhkLineType(cursor.read_u32_le())
-
-        x_corner = cursor.read_u32_le()
-        y_corner = cursor.read_u32_le()
-        x_size = cursor.read_u32_le()
-        y_size = cursor.read_u32_le()
-
-        image_type = RhkImageType(cursor.read_u32_le())
-
-        scan_type = RhkScanType(cursor.read_u32_le())
-
-        group_id = cursor.read_u32_le()
-        page_data_size = cursor.read_u32_le()
-
-        min_z_value = cursor.read_u32_le()
-        max_z_value = cursor.read_u32_le()
-
-        x_scale = cursor.read_f32_le()
-        y_scale = cursor.read_f32_le()
-        z_scale = cursor.read_f32_le()
-        xy_scale = cursor.read_f32_le()
-        x_offset = cursor.read_f32_le()
-        y_offset = cursor.read_f32_le()
-        z_offset = cursor.read_f32_le()
-        period = cursor.read_f32_le()
-        bias = cursor.read_f32_le()
-        current = cursor.read_f32_le()
-        angle = cursor.read_f32_le()
-
-        color_info_count = cursor.read_u32_le()
-        grid_x_size = cursor.read_u32_le()
-        grid_y_size = cursor.read_u32_le()
-
-        object_list_count = cursor.read_u32_le()
-        _32_bit_data_flag = cursor.read_u8_le()
-
-        # reserved
-        cursor.skip(63)
-
-        object_list: List[Sm4Object] = []
-        for _ in range(object_list_count):
-            obj = Sm4Object.from_buffer(cursor)
-            """ print("PageHeaderDefault : ", obj) """
-            object_list.append(obj)
-
-        return Sm4PageHeaderDefault(
+        (
             string_count,
             page_type,
             data_sub_source,
@@ -570,157 +676,318 @@ class Sm4PageHeaderDefault:
             grid_y_size,
             object_list_count,
             _32_bit_data_flag,
+        ) = cursor.read_struct(cls._layout)
+
+        object_list = Sm4Object.list_from_buffer(cursor, object_list_count)
+
+        return Sm4PageHeaderDefault(
+            string_count,
+            RhkPageType(page_type),
+            data_sub_source,
+            RhkLineType(line_type),
+            x_corner,
+            y_corner,
+            x_size,
+            y_size,
+            RhkImageType(image_type),
+            RhkScanType(scan_type),
+            group_id,
+            page_data_size,
+            min_z_value,
+            max_z_value,
+            x_scale,
+            y_scale,
+            z_scale,
+            xy_scale,
+            x_offset,
+            y_offset,
+            z_offset,
+            period,
+            bias,
+            current,
+            angle,
+            color_info_count,
+            grid_x_size,
+            grid_y_size,
+            object_list_count,
+            _32_bit_data_flag,
             object_list,
         )
 
-    def read_data(self, cursor: Cursor) -> None:
+    def read_data(
+        self,
+        cursor: Cursor,
+        stats: Optional[LoadStats] = None,
+        objects: Optional[AbstractSet[RhkObjectType]] = None,
+        decoders: Optional[ObjectDecoders] = None,
+    ) -> None:
         """Read the objects of the object_list into page_header_objects
 
         Args:
             cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            stats: If set, the time of reading each object is recorded
+            objects: If set, only objects of these types are read, see
+                [`select_objects`][sm4file.sm4_file.select_objects]. The
+                others are skipped without reading and can be read later
+                with [`load_object`][sm4file.sm4_file.Sm4PageHeaderDefault.load_object]
+            decoders: Decoders overriding the ones in `OBJECT_DECODERS`
         """
-        tiptrack_info_count = None
-        for obj in self.object_list:
-            if obj.offset != 0 and obj.size != 0:
-                cursor.set_position(obj.offset)
-
-                if obj.obj_type == RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER:
-                    self.page_header_objects.append(
-                        ImageDriftHeader.from_buffer(cursor)
-                    )
-
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_IMAGE_DRIFT:
-                    self.page_header_objects.append(
-                        ImageDriftData.from_buffer(cursor)
-                    )
-
-                elif (
-                    obj.obj_type == RhkObjectType.RHK_OBJECT_SPEC_DRIFT_HEADER
-                ):
-                    self.page_header_objects.append(
-                        SpecDriftHeader.from_buffer(cursor)
-                    )
-
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_SPEC_DRIFT_DATA:
-                    self.page_header_objects.append(
-                        SpecDriftData.from_buffer(cursor, self.y_size)
-                    )
-
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_COLOR_INFO:
-                    pass
+        for obj in self.selected_objects(objects, decoders):
+            if stats is None:
+                read_obj = self.read_object(cursor, obj, decoders)
+            else:
+                with stats.object(obj.obj_type):
+                    read_obj = self.read_object(cursor, obj, decoders)
+            if read_obj is not None:
+                self.add_object(obj.obj_type, read_obj)
+
+    def selected_objects(
+        self,
+        objects: Optional[AbstractSet[RhkObjectType]] = None,
+        decoders: Optional[ObjectDecoders] = None,
+    ) -> List[Sm4Object]:
+        """Get the objects of the object_list which are read: non-empty
+        objects with a decoder in `decoders` or `OBJECT_DECODERS`
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_STRING_DATA:
-                    self.page_header_objects.append(
-                        StringData.from_buffer(cursor, self.string_count)
-                    )
+        Args:
+            objects: If set, only objects of these types are read
+            decoders: Decoders overriding the ones in `OBJECT_DECODERS`
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_TIP_TRACK_HEADER:
-                    read_obj = TipTrackHeader.from_buffer(cursor)
-                    tiptrack_info_count = read_obj.tiptrack_tiptrack_info_count
-                    self.page_header_objects.append(read_obj)
-
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_TIP_TRACK_DATA:
-                    if tiptrack_info_count is not None:
-                        self.page_header_objects.append(
-                            TipTrackData.from_buffer(
-                                cursor, tiptrack_info_count
-                            )
-                        )
-                    else:
-                        raise ValueError("tiptrack_info_count not found")
+        Returns:
+            The selected [`Sm4Object`s][sm4file.sm4_file.Sm4Object]
+        """
+        return [
+            obj for obj in self.object_list if _is_read(obj, objects, decoders)
+        ]
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL:
-                    pass
+    def add_object(self, obj_type: RhkObjectType, read_obj: Any) -> None:
+        """Add a read object to page_header_objects and objects_by_type
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL_HEADER:
-                    pass
+        Args:
+            obj_type: Type of the object
+            read_obj: The read object
+        """
+        self.page_header_objects.append(read_obj)
+        self.objects_by_type[obj_type] = read_obj
+
+    def load_object(
+        self,
+        cursor: Cursor,
+        obj_type: RhkObjectType,
+        decoders: Optional[ObjectDecoders] = None,
+    ) -> Any:
+        """Get the object of a type, reading it from its offset in the
+        object_list if it is not read yet, e.g. because it was skipped by
+        [`read_data`][sm4file.sm4_file.Sm4PageHeaderDefault.read_data]
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_API_INFO:
-                    self.page_header_objects.append(
-                        ApiInfo.from_buffer(cursor)
-                    )
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            obj_type: Type of the object
+            decoders: Decoders overriding the ones in `OBJECT_DECODERS`
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_HISTORY_INFO:
-                    pass
+        Returns:
+            The object, or None if the page has no such object or its type
+            is not supported
+        """
+        if obj_type in self.objects_by_type:
+            return self.objects_by_type[obj_type]
 
-                elif (
-                    obj.obj_type == RhkObjectType.RHK_OBJECT_PIEZO_SENSITIVITY
-                ):
-                    self.page_header_objects.append(
-                        PiezoSensitivity.from_buffer(cursor)
-                    )
+        for obj in self.object_list:
+            if obj.obj_type != obj_type:
+                continue
+            if obj_type == RhkObjectType.RHK_OBJECT_TIP_TRACK_DATA:
+                # the Tip Track Data is read with its header's count
+                self.load_object(
+                    cursor, RhkObjectType.RHK_OBJECT_TIP_TRACK_HEADER, decoders
+                )
+            read_obj = self.read_object(cursor, obj, decoders)
+            if read_obj is not None:
+                self.add_object(obj_type, read_obj)
+            return read_obj
+        return None
+
+    def read_object(
+        self,
+        cursor: Cursor,
+        obj: Sm4Object,
+        decoders: Optional[ObjectDecoders] = None,
+    ) -> Any:
+        """Read a single object of the object_list with the decoder for its
+        type in `decoders`, or else the one registered in `OBJECT_DECODERS`
 
-                elif (
-                    obj.obj_type
-                    == RhkObjectType.RHK_OBJECT_FREQUENCY_SWEEP_DATA
-                ):
-                    self.page_header_objects.append(
-                        FrequencySweepData.from_buffer(cursor)
-                    )
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            obj: The [`Sm4Object`][sm4file.sm4_file.Sm4Object] to read
+            decoders: Decoders overriding the ones in `OBJECT_DECODERS`
 
-                elif (
-                    obj.obj_type
-                    == RhkObjectType.RHK_OBJECT_SCAN_PROCESSOR_INFO
-                ):
-                    self.page_header_objects.append(
-                        ScanProcessorInfo.from_buffer(cursor)
-                    )
+        Returns:
+            The read object, or None if the object is empty or no decoder
+            is registered for its type
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_PLL_INFO:
-                    self.page_header_objects.append(
-                        PllInfo.from_buffer(cursor)
-                    )
+        Raises:
+            ValueError: If Tip Track Data is read before its
+                [`TipTrackHeader`][sm4file.sm4_object_types.TipTrackHeader]
+        """
+        decoder = _find_decoder(obj.obj_type, decoders)
+        if decoder is None or obj.offset == 0 or obj.size == 0:
+            return None
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_CH1_DRIVE_INFO:
-                    self.page_header_objects.append(
-                        ChannelDriveInfo.from_buffer(cursor)
-                    )
+        cursor.set_position(obj.offset)
+        return decoder(cursor, self)
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_CH2_DRIVE_INFO:
-                    self.page_header_objects.append(
-                        ChannelDriveInfo.from_buffer(cursor)
-                    )
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_LOCKIN0_INFO:
-                    self.page_header_objects.append(
-                        LockinInfo.from_buffer(cursor)
-                    )
+# TypeAlias
+ObjectDecoder = Callable[[Cursor, Sm4PageHeaderDefault], Any]
+"""Type for the decoder of a Page Header object: reads the object from the
+cursor, which is positioned at the object's offset, and returns it, or None
+to skip it. The returned object can be of any type, e.g. a class decoding an
+object type without a built-in decoder. The Page Header gives the object's
+context, e.g. its `string_count` or the objects read before"""
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_LOCKIN1_INFO:
-                    self.page_header_objects.append(
-                        LockinInfo.from_buffer(cursor)
-                    )
+# TypeAlias
+ObjectDecoders = Mapping[RhkObjectType, Optional[ObjectDecoder]]
+"""Type for decoders overriding the ones in `OBJECT_DECODERS` for a single
+file, by type. A decoder of None skips the objects of its type"""
+
+
+def _decode_with(read: Callable[[Cursor], PageHeaderObject]) -> ObjectDecoder:
+    """Decoder of an object which is read without any context"""
+    return lambda cursor, page_header: read(cursor)
+
+
+def _decode_spec_drift_data(
+    cursor: Cursor, page_header: Sm4PageHeaderDefault
+) -> SpecDriftData:
+    return SpecDriftData.from_buffer(cursor, page_header.y_size)
+
+
+def _decode_string_data(
+    cursor: Cursor, page_header: Sm4PageHeaderDefault
+) -> StringData:
+    return StringData.from_buffer(cursor, page_header.string_count)
+
+
+def _decode_tip_track_data(
+    cursor: Cursor, page_header: Sm4PageHeaderDefault
+) -> TipTrackData:
+    tiptrack_header = page_header.objects_by_type.get(
+        RhkObjectType.RHK_OBJECT_TIP_TRACK_HEADER
+    )
+    if not isinstance(tiptrack_header, TipTrackHeader):
+        raise ValueError("tiptrack_info_count not found")
+    return TipTrackData.from_buffer(
+        cursor, tiptrack_header.tiptrack_tiptrack_info_count
+    )
+
+
+OBJECT_DECODERS: Dict[RhkObjectType, ObjectDecoder] = {
+    RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER: _decode_with(
+        ImageDriftHeader.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_IMAGE_DRIFT: _decode_with(
+        ImageDriftData.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_SPEC_DRIFT_HEADER: _decode_with(
+        SpecDriftHeader.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_SPEC_DRIFT_DATA: _decode_spec_drift_data,
+    RhkObjectType.RHK_OBJECT_STRING_DATA: _decode_string_data,
+    RhkObjectType.RHK_OBJECT_TIP_TRACK_HEADER: _decode_with(
+        TipTrackHeader.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_TIP_TRACK_DATA: _decode_tip_track_data,
+    RhkObjectType.RHK_OBJECT_API_INFO: _decode_with(ApiInfo.from_buffer),
+    RhkObjectType.RHK_OBJECT_PIEZO_SENSITIVITY: _decode_with(
+        PiezoSensitivity.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_FREQUENCY_SWEEP_DATA: _decode_with(
+        FrequencySweepData.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_SCAN_PROCESSOR_INFO: _decode_with(
+        ScanProcessorInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_PLL_INFO: _decode_with(PllInfo.from_buffer),
+    RhkObjectType.RHK_OBJECT_CH1_DRIVE_INFO: _decode_with(
+        ChannelDriveInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_CH2_DRIVE_INFO: _decode_with(
+        ChannelDriveInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_LOCKIN0_INFO: _decode_with(
+        LockinInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_LOCKIN1_INFO: _decode_with(
+        LockinInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_ZPI_INFO: _decode_with(
+        PiControllerInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_KPI_INFO: _decode_with(
+        PiControllerInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_AUX_PI_INFO: _decode_with(
+        PiControllerInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_LOWPASS_FILTER0_INFO: _decode_with(
+        LowpassFilterInfo.from_buffer
+    ),
+    RhkObjectType.RHK_OBJECT_LOWPASS_FILTER1_INFO: _decode_with(
+        LowpassFilterInfo.from_buffer
+    ),
+}
+"""Decoders of the Page Header objects, by type. Objects of other types, e.g.
+Color Info and History Info, are skipped, see
+[`register_object_decoder`][sm4file.sm4_file.register_object_decoder]"""
+
+
+def _find_decoder(
+    obj_type: RhkObjectType, decoders: Optional[ObjectDecoders]
+) -> Optional[ObjectDecoder]:
+    """Decoder of a type of Page Header objects, from `decoders` if it
+    overrides the type, else from `OBJECT_DECODERS`
+    """
+    if decoders is not None and obj_type in decoders:
+        return decoders[obj_type]
+    return OBJECT_DECODERS.get(obj_type)
+
+
+def _is_read(
+    obj: Sm4Object,
+    objects: Optional[AbstractSet[RhkObjectType]],
+    decoders: Optional[ObjectDecoders] = None,
+) -> bool:
+    """Whether a Page Header object is read: it is not empty, has a decoder
+    and is selected
+    """
+    return (
+        obj.offset != 0
+        and obj.size != 0
+        and _find_decoder(obj.obj_type, decoders) is not None
+        and (objects is None or obj.obj_type in objects)
+    )
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_ZPI_INFO:
-                    self.page_header_objects.append(
-                        PiControllerInfo.from_buffer(cursor)
-                    )
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_KPI_INFO:
-                    self.page_header_objects.append(
-                        PiControllerInfo.from_buffer(cursor)
-                    )
+def register_object_decoder(
+    obj_type: RhkObjectType, decoder: Optional[ObjectDecoder]
+) -> Optional[ObjectDecoder]:
+    """Register the decoder of a type of Page Header objects, replacing a
+    decoder registered before. Affects all files read afterwards
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_AUX_PI_INFO:
-                    self.page_header_objects.append(
-                        PiControllerInfo.from_buffer(cursor)
-                    )
+    Decoders for a single file are given to
+    [`Sm4FileAll`][sm4file.sm4_file.Sm4FileAll] with `decoders` instead.
 
-                elif (
-                    obj.obj_type
-                    == RhkObjectType.RHK_OBJECT_LOWPASS_FILTER0_INFO
-                ):
-                    self.page_header_objects.append(
-                        LowpassFilterInfo.from_buffer(cursor)
-                    )
+    Args:
+        obj_type: Type of the objects
+        decoder: The [`ObjectDecoder`][sm4file.sm4_file.ObjectDecoder], or
+            None to skip the objects of this type
 
-                elif (
-                    obj.obj_type
-                    == RhkObjectType.RHK_OBJECT_LOWPASS_FILTER1_INFO
-                ):
-                    self.page_header_objects.append(
-                        LowpassFilterInfo.from_buffer(cursor)
-                    )
+    Returns:
+        The decoder registered before, or None
+    """
+    previous = OBJECT_DECODERS.pop(obj_type, None)
+    if decoder is not None:
+        OBJECT_DECODERS[obj_type] = decoder
+    return previous
 
 
 # TypeAlias
@@ -736,8 +1003,10 @@ class Sm4Page:
     """
 
     header: Sm4PageHeader = field(init=False)
-    data: PageData = field(init=False)
-    label: str = field(init=False)
+    data: Optional[PageData] = field(default=None, init=False)
+    sequential_data: Optional[SequentialData] = field(default=None, init=False)
+    thumbnail: Optional[Thumbnail] = field(default=None, init=False)
+    label: str = field(default="", init=False)
     page_id: int
     page_data_type: RhkPageDataType
     page_source_type: RhkPageSourceType
@@ -746,6 +1015,10 @@ class Sm4Page:
     object_list: List[Sm4Object]
     page_objects: List[PageHeaderObject] = field(default_factory=list)
 
+    # page_id, 14 x reserved, page_data_type, page_source_type,
+    # object_list_count, minor_version
+    _layout: ClassVar[struct.Struct] = struct.Struct("<H14x4I")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> Sm4Page:
         """Read a Page from a buffer
@@ -756,26 +1029,40 @@ class Sm4Page:
         Returns:
             The parsed [`Sm4Page`][sm4file.sm4_file.Sm4Page]
         """
-        page_id = cursor.read_u16_le()
-        cursor.skip(14)
-        page_data_type = RhkPageDataType(cursor.read_u32_le())
-        page_source_type = RhkPageSourceType(cursor.read_u32_le())
-        object_list_count = cursor.read_u32_le()
-        minor_version = cursor.read_u32_le()
+        (
+            page_id,
+            page_data_type,
+            page_source_type,
+            object_list_count,
+            minor_version,
+        ) = cursor.read_struct(cls._layout)
 
-        object_list = []
-        for _ in range(object_list_count):
-            object_list.append(Sm4Object.from_buffer(cursor))
+        object_list = Sm4Object.list_from_buffer(cursor, object_list_count)
 
         return cls(
             page_id,
-            page_data_type,
-            page_source_type,
+            RhkPageDataType(page_data_type),
+            RhkPageSourceType(page_source_type),
             minor_version,
             object_list_count,
             object_list,
         )
 
+    def page_header_offset(self) -> int:
+        """Finds the offset of the Page Header in the object list
+
+        Returns:
+            The offset of the Page Header
+
+        Raises:
+            BufferError: If no Page Header can be found in the page
+        """
+        for obj in self.object_list:
+            if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_HEADER:
+                return obj.offset
+        else:
+            raise BufferError("No page header in page")
+
     def add_header(self, header: Sm4PageHeader) -> None:
         """Adds a [`Sm4PageHeader`][sm4file.sm4_file.Sm4PageHeader] to the page
 
@@ -785,132 +1072,810 @@ class Sm4Page:
         """
         self.header = header
 
-    def read_data(self, cursor: Cursor) -> None:
-        """Read the Page's Page Data of the `objects_list` into `data`
+    def read_data(self, cursor: Cursor, dtype: DTypeLike = np.float64) -> None:
+        """Read the Page's Page Data of the `objects_list` into `data`, or
+        into `sequential_data` for sequential pages
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            dtype: Floating point type of the scaled data
+        """
+        for obj in self.object_list:
+            if (
+                obj.offset == 0
+                or obj.size == 0
+                or obj.obj_type != RhkObjectType.RHK_OBJECT_PAGE_DATA
+            ):
+                continue
+
+            cursor.set_position(obj.offset)
+            if isinstance(self.header, Sm4PageHeaderDefault):
+                self.data = PageData.from_buffer(
+                    cursor,
+                    obj.size,
+                    self.header.z_scale,
+                    self.header.z_offset,
+                    dtype,
+                )
+            else:
+                self.sequential_data = SequentialData.from_buffer(
+                    cursor,
+                    obj.size,
+                    self.header.data_type,
+                    self.header.sequential_param_gain,
+                    dtype,
+                )
 
-        Todo:
-            Parsing of the Thumbnail data is not supported
+    def read_region(
+        self,
+        cursor: Cursor,
+        rows: slice = slice(None),
+        cols: slice = slice(None),
+        dtype: DTypeLike = np.float64,
+    ) -> NDArray[np.floating[Any]]:
+        """Read a rectangular region of an image's Page Data, reading only
+        the rows containing it. Rows skipped by the step of `rows` are not
+        read
+
+        The region is selected in the orientation given by
+        [`arrange_data`][sm4file.sm4_file.Sm4Page.arrange_data], so it is
+        equal to `data[rows, cols]` of the fully read Page Data.
 
         Args:
             cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            rows: Rows of the region
+            cols: Columns of the region
+            dtype: Floating point type of the scaled data
+
+        Returns:
+            The scaled data of the region
+
+        Raises:
+            ValueError: If the page is not an image
+            BufferError: If the page does not contain any Page Data
         """
+        if (
+            not isinstance(self.header, Sm4PageHeaderDefault)
+            or self.page_data_type != RhkPageDataType.RHK_DATA_IMAGE
+        ):
+            raise ValueError("Regions can only be read from image pages")
+
         for obj in self.object_list:
             if (
-                obj.offset != 0
+                obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_DATA
+                and obj.offset != 0
                 and obj.size != 0
-                and isinstance(self.header, Sm4PageHeaderDefault)
             ):
-                cursor.set_position(obj.offset)
-
-                if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_DATA:
-                    self.data = PageData.from_buffer(
-                        cursor,
-                        obj.size,
-                        self.header.z_scale,
-                        self.header.z_offset,
-                    )
+                break
+        else:
+            raise BufferError("No page data in page")
+
+        x_size, y_size = self.header.x_size, self.header.y_size
+        row_indices = np.arange(y_size)[rows]
+        col_indices = np.arange(x_size)[cols]
+        # same flips as in arrange_data
+        if self.header.y_scale > 0:
+            row_indices = y_size - 1 - row_indices
+        if self.header.x_scale < 0:
+            col_indices = x_size - 1 - col_indices
+
+        raw_data = np.empty((len(row_indices), len(col_indices)), "<i4")
+        if raw_data.size != 0:
+            # read each run of consecutive rows with a single read, so rows
+            # skipped by a step are not read
+            order = np.argsort(row_indices, kind="stable")
+            sorted_rows = row_indices[order]
+            run_starts = np.flatnonzero(np.diff(sorted_rows) > 1) + 1
+            for run in np.split(np.arange(len(sorted_rows)), run_starts):
+                first_row = int(sorted_rows[run[0]])
+                num_rows = int(sorted_rows[run[-1]]) - first_row + 1
+                cursor.set_position(obj.offset + first_row * x_size * 4)
+                block = np.frombuffer(
+                    cursor.read_view(num_rows * x_size * 4), dtype="<i4"
+                ).reshape(num_rows, x_size)
+                raw_data[order[run]] = block[
+                    np.ix_(sorted_rows[run] - first_row, col_indices)
+                ]
+
+        return PageData(
+            raw_data,
+            self.header.z_scale,
+            self.header.z_offset,
+            dtype=np.dtype(dtype),
+        ).data
+
+    def read_thumbnail(self, cursor: Cursor) -> None:
+        """Read the Page's Thumbnail of the `objects_list` into `thumbnail`
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL:
-                    pass
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+        """
+        thumbnail_obj = None
+        thumbnail_header = None
+        for obj in self.object_list:
+            if obj.offset == 0 or obj.size == 0:
+                continue
+            if obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL:
+                thumbnail_obj = obj
+            elif obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL_HEADER:
+                cursor.set_position(obj.offset)
+                thumbnail_header = ThumbnailHeader.from_buffer(cursor)
 
-                elif obj.obj_type == RhkObjectType.RHK_OBJECT_THUMBNAIL_HEADER:
-                    pass
+        if thumbnail_obj is not None and thumbnail_header is not None:
+            cursor.set_position(thumbnail_obj.offset)
+            self.thumbnail = Thumbnail.from_buffer(cursor, thumbnail_header)
 
     def read_label(self) -> None:
         """Reads the Page's label from the Header's
-        [`StringData`][sm4file.sm4_object_types.StringData] into `label`
+        [`StringData`][sm4file.sm4_object_types.StringData] into `label`.
+        It stays empty if the StringData is not read
         """
         if type(self.header) == Sm4PageHeaderDefault:
             for obj in self.header.page_header_objects:
                 if type(obj) == StringData:
                     self.label = obj.label
 
+    def arrange_data(self) -> None:
+        """Arrange the raw data array depending on type of the Page
+
+        - if Image: arrange that 2D array starts with upper left pixel
+        - if Line: arrange array with first column for x-values and following
+            columns y-values
+
+        Reshaping and flipping only create views of the raw data, the values
+        are scaled when the Page Data's `data` is accessed.
+        """
+        if type(self.header) != Sm4PageHeaderDefault or self.data is None:
+            return
+
+        raw_data = self.data.raw_data.reshape(
+            self.header.y_size, self.header.x_size
+        )
+
+        if self.page_data_type == RhkPageDataType.RHK_DATA_IMAGE:
+            if self.header.x_scale < 0:
+                raw_data = np.flip(raw_data, axis=1)
+            if self.header.y_scale > 0:
+                raw_data = np.flip(raw_data, axis=0)
+
+        elif self.page_data_type == RhkPageDataType.RHK_DATA_LINE:
+            self.data.x_values = (
+                np.arange(self.header.x_size, dtype=np.float64)
+                * self.header.x_scale
+                + self.header.x_offset
+            )
+
+        self.data.raw_data = raw_data
+
+
+def _prefetch(cursor: Cursor, objects: List[Sm4Object]) -> None:
+    """Announce the objects which are read next to a
+    [`CoalescingCursor`][sm4file.cursor.CoalescingCursor]
+    """
+    if isinstance(cursor, CountingCursor):
+        cursor = cursor.cursor
+    if isinstance(cursor, CoalescingCursor):
+        cursor.prefetch(
+            (obj.offset, obj.size) for obj in objects if obj.offset != 0
+        )
+
+
+class _ReadPlan:
+    """Steps of a streaming parse, run in the order of the offsets they read
+    from. Steps can add further steps while the plan runs. After every step,
+    the bytes it read are released
+    """
+
+    def __init__(self, release: Callable[[], None]) -> None:
+        self._steps: List[Tuple[int, int, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._release = release
+
+    def add(self, offset: int, step: Callable[[], None]) -> None:
+        heapq.heappush(self._steps, (offset, next(self._counter), step))
+
+    def run(self) -> None:
+        while self._steps:
+            _, _, step = heapq.heappop(self._steps)
+            step()
+            self._release()
+
 
 class Sm4FileAll:
     """Class representing an entire SM4-file
 
     Args:
-        filepath: The SM4-file to be parsed
+        filepath: The SM4-file to be parsed. Instead of a path, the file's
+            content as bytes, `bytearray` or `memoryview`, an `io.BytesIO`
+            or any binary stream can be given. Bytes and `io.BytesIO` are
+            read without copying, like a memory-mapped file, and the
+            `io.BytesIO` can still be changed or closed. Non-seekable
+            streams, e.g. pipes, are parsed in a single forward pass, see
+            [`read_sm4_stream`][sm4file.sm4_file.Sm4FileAll.read_sm4_stream].
+        mmap: If True, the file is memory-mapped and the raw Page Data are
+            views into the mapping instead of copies. Only the parts of the
+            file which are accessed are loaded into memory. Has no effect if
+            the file is not read from a path.
+        lazy: If True, only the headers are parsed. The Page Data of a page
+            is read with [`load_page_data`][sm4file.sm4_file.Sm4FileAll.load_page_data]
+        dtype: Floating point type of the scaled Page Data, e.g. `np.float32`
+            to halve the memory of the data arrays
+        threads: If set, the pages are read, arranged and scaled concurrently
+            by this number of threads, using positional reads
+        coalesce: If set, the objects are read with few large reads, merging
+            objects which are at most this number of bytes apart, see
+            [`CoalescingCursor`][sm4file.cursor.CoalescingCursor]. Only used
+            for files which are neither memory-mapped, in memory nor read by
+            multiple threads
+        stats: If set, the phases of reading, the reads and seeks and the
+            allocated arrays are recorded in this
+            [`LoadStats`][sm4file.stats.LoadStats]
+        objects: If set, only the Page Header objects of these types are
+            read, or of a preset like `"minimal"`, see
+            [`select_objects`][sm4file.sm4_file.select_objects]. The others
+            are read on demand with
+            [`load_page_header_object`][sm4file.sm4_file.Sm4FileAll.load_page_header_object]
+        decoders: Decoders of Page Header objects for this file, overriding
+            the ones registered in `OBJECT_DECODERS`, by type. A decoder of
+            None skips the objects of its type, see
+            [`ObjectDecoders`][sm4file.sm4_file.ObjectDecoders]
 
     Attributes:
-        filepath: The SM4-file to be parsed
+        filepath: The SM4-file to be parsed, None if it is not read from a
+            path
         file_header: The file's header
         pages: The files pages. A page is measurement channel
+        read_stats: The [`ReadStats`][sm4file.cursor.ReadStats] of the reads
+            issued to the file, if the reads were coalesced
+        stats: The [`LoadStats`][sm4file.stats.LoadStats] recording the
+            reading, if instrumented
     """
 
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-        with open(filepath, "rb") as f:
-            self.read_sm4_file(f)
+    def __init__(
+        self,
+        filepath: Source,
+        mmap: bool = False,
+        lazy: bool = False,
+        dtype: DTypeLike = np.float64,
+        threads: Optional[int] = None,
+        coalesce: Optional[int] = None,
+        stats: Optional[LoadStats] = None,
+        objects: Optional[ObjectSelection] = None,
+        decoders: Optional[ObjectDecoders] = None,
+    ):
+        self.filepath: Optional[str] = None
+        self.lazy = lazy
+        self.dtype = np.dtype(dtype)
+        self.threads = threads
+        self.coalesce = coalesce
+        self.read_stats: Optional[ReadStats] = None
+        self.stats = stats
+        self.objects = select_objects(objects)
+        self.decoders = None if decoders is None else dict(decoders)
+        self._mmap: Optional[_Mapping] = None
+        self._stream: Optional[BinaryIO] = None
+
+        if isinstance(filepath, (str, PathLike)):
+            self.filepath = fspath(filepath)
+            if mmap:
+                self._mmap = self._map_file()
+        elif isinstance(filepath, (bytes, bytearray, memoryview)):
+            self._mmap = memoryview(filepath)
+        elif isinstance(filepath, io.BytesIO):
+            # getvalue shares the content without copying, unlike a view of
+            # getbuffer it does not keep the BytesIO from being changed
+            self._mmap = memoryview(filepath.getvalue())
+        elif lazy or threads is not None:
+            # pages are read later or from several threads, which a stream
+            # does not support
+            if filepath.seekable():
+                filepath.seek(0)
+            self._mmap = memoryview(filepath.read())
+        elif filepath.seekable():
+            self._stream = filepath
+        else:
+            self.read_sm4_stream(filepath)
+            return
 
-    def read_sm4_file(self, f: BufferedReader) -> None:
-        """Main function for parsing a SM4-file
+        if self._mmap is not None:
+            self.read_sm4_file(self._mmap)
+        elif self._stream is not None:
+            self.read_sm4_file(self._stream)
+        else:
+            assert self.filepath is not None
+            with open(self.filepath, "rb") as f:
+                self.read_sm4_file(f)
+
+    def _map_file(self) -> mmap.mmap:
+        """Memory-map the file read-only. The mapping stays valid after the
+        file is closed and is released when no Page Data refers to it anymore
+        """
+        assert self.filepath is not None
+        with open(self.filepath, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _phase(self, name: str) -> ContextManager[None]:
+        """Time a phase, if instrumented"""
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.phase(name)
+
+    def _object(self, obj_type: RhkObjectType) -> ContextManager[None]:
+        """Time reading an object, if instrumented"""
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.object(obj_type)
+
+    def _counting(self, cursor: Cursor) -> Cursor:
+        """Count the reads and seeks of a cursor, if instrumented"""
+        if self.stats is None:
+            return cursor
+        return CountingCursor(cursor, self.stats.cursor)
+
+    def _count_read(self, *arrays: Optional[NDArray[Any]]) -> None:
+        """Count the bytes of arrays read from the file, if instrumented.
+        Arrays which are views into the file's mapping or content are not
+        counted
+        """
+        if self.stats is not None and self._mmap is None:
+            self.stats.add_allocated(
+                sum(array.nbytes for array in arrays if array is not None)
+            )
+
+    def _read_page_data(self, cursor: Cursor, page: Sm4Page) -> None:
+        """Read the Page Data of a page, see
+        [`Sm4Page.read_data`][sm4file.sm4_file.Sm4Page.read_data]
+        """
+        if self.stats is None:
+            page.read_data(cursor, self.dtype)
+            return
+
+        with self._object(RhkObjectType.RHK_OBJECT_PAGE_DATA):
+            page.read_data(cursor, self.dtype)
+        self._count_read(
+            None if page.data is None else page.data.raw_data,
+            (
+                None
+                if page.sequential_data is None
+                else page.sequential_data.raw_data
+            ),
+        )
+
+    def load_page_data(self, page: Sm4Page) -> PageData:
+        """Read and arrange the Page Data of a single page. Used to read the
+        data on demand if the file was parsed with `lazy=True`
 
         Args:
-            f: File buffer of the file to parse
+            page: The [`Sm4Page`][sm4file.sm4_file.Sm4Page] to read the data of
+
+        Returns:
+            The page's [`PageData`][sm4file.sm4_object_types.PageData]
+
+        Raises:
+            BufferError: If the page does not contain any Page Data, or the
+                file was read from a non-seekable stream
         """
-        cursor = Cursor(f)
-        self.file_header = Sm4FileHeader.from_buffer(cursor)
-        self.file_header.read_objects(cursor)
-        page_index_header = self.file_header.page_index_header
+        with self._phase("load_page_data"):
+            if self._mmap is not None:
+                self._read_page_data(
+                    self._counting(PositionalCursor(self._mmap)), page
+                )
+            elif self._stream is not None:
+                self._read_page_data(
+                    self._counting(Cursor(self._stream)), page
+                )
+            elif self.filepath is None:
+                raise BufferError("Non-seekable stream cannot be read again")
+            else:
+                with open(self.filepath, "rb") as f:
+                    self._read_page_data(self._counting(Cursor(f)), page)
 
-        page_index_array_offset = page_index_header.page_index_array_offset()
-        assert page_index_array_offset
-        cursor.set_position(page_index_array_offset)
+            if page.data is None:
+                raise BufferError("No page data in page")
+            page.arrange_data()
+        return page.data
 
-        self.pages: List[Sm4Page] = []
-        for _ in range(page_index_header.page_count):
-            page = Sm4Page.from_buffer(cursor)
-            self.pages.append(page)
+    def load_sequential_data(self, page: Sm4Page) -> SequentialData:
+        """Read the data of a single sequential page. Used to read the data on
+        demand if the file was parsed with `lazy=True`
 
-        offset = None
-        for page in self.pages:
-            for obj in page.object_list:
-                if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_HEADER:
-                    offset = obj.offset
-                    break
-            if offset is None:
-                raise BufferError(f"No page header in page")
-            cursor.set_position(offset)
+        Args:
+            page: The sequential [`Sm4Page`][sm4file.sm4_file.Sm4Page] to
+                read the data of
 
-            if page.page_data_type == RhkPageDataType.RHK_DATA_SEQUENTIAL:
-                page_header: Sm4PageHeader = (
-                    Sm4PageHeaderSequential.from_buffer(cursor)
+        Returns:
+            The page's
+            [`SequentialData`][sm4file.sm4_object_types.SequentialData]
+
+        Raises:
+            BufferError: If the page does not contain any data, or the file
+                was read from a non-seekable stream
+        """
+        with self._phase("load_page_data"):
+            if self._mmap is not None:
+                self._read_page_data(
+                    self._counting(PositionalCursor(self._mmap)), page
                 )
+            elif self._stream is not None:
+                self._read_page_data(
+                    self._counting(Cursor(self._stream)), page
+                )
+            elif self.filepath is None:
+                raise BufferError("Non-seekable stream cannot be read again")
+            else:
+                with open(self.filepath, "rb") as f:
+                    self._read_page_data(self._counting(Cursor(f)), page)
 
+        if page.sequential_data is None:
+            raise BufferError("No sequential data in page")
+        return page.sequential_data
+
+    def load_page_header_object(
+        self, page: Sm4Page, obj_type: RhkObjectType
+    ) -> Any:
+        """Read a single object of a page's Page Header on demand, e.g. one
+        which was skipped because it was not selected with `objects`, see
+        [`Sm4PageHeaderDefault.load_object`][sm4file.sm4_file.Sm4PageHeaderDefault.load_object]
+
+        Args:
+            page: The [`Sm4Page`][sm4file.sm4_file.Sm4Page] to read from
+            obj_type: Type of the object
+
+        Returns:
+            The object, or None if the page has no such object or its type
+            is not supported
+
+        Raises:
+            BufferError: If the object is not read yet and the file was read
+                from a non-seekable stream
+        """
+        if not isinstance(page.header, Sm4PageHeaderDefault):
+            return None
+        if obj_type in page.header.objects_by_type:
+            return page.header.objects_by_type[obj_type]
+
+        with self._object(obj_type):
+            if self._mmap is not None:
+                return page.header.load_object(
+                    self._counting(PositionalCursor(self._mmap)),
+                    obj_type,
+                    self.decoders,
+                )
+            elif self._stream is not None:
+                return page.header.load_object(
+                    self._counting(Cursor(self._stream)),
+                    obj_type,
+                    self.decoders,
+                )
+            elif self.filepath is None:
+                raise BufferError("Non-seekable stream cannot be read again")
             else:
-                page_header = Sm4PageHeaderDefault.from_buffer(cursor)
-                page_header.read_data(cursor)
+                with open(self.filepath, "rb") as f:
+                    return page.header.load_object(
+                        self._counting(Cursor(f)), obj_type, self.decoders
+                    )
 
-            page.add_header(page_header)
-            page.read_label()
-            page.read_data(cursor)
+    def load_page_region(
+        self,
+        page: Sm4Page,
+        rows: slice = slice(None),
+        cols: slice = slice(None),
+    ) -> NDArray[np.floating[Any]]:
+        """Read a rectangular region of an image page's Page Data, see
+        [`Sm4Page.read_region`][sm4file.sm4_file.Sm4Page.read_region]
 
-        self.arrange_data()
+        Args:
+            page: The [`Sm4Page`][sm4file.sm4_file.Sm4Page] to read from
+            rows: Rows of the region
+            cols: Columns of the region
 
-    def arrange_data(self) -> None:
-        """Arrange the data array depending on type of the Page
+        Returns:
+            The scaled data of the region
 
-        - if Image: arrange that 2D array starts with upper left pixel
-        - if Line: arrange array with first column for x-values and following
-            columns y-values
+        Raises:
+            ValueError: If the page is not an image
+            BufferError: If the page does not contain any Page Data, or the
+                file was read from a non-seekable stream
         """
-        for page in self.pages:
-            if type(page.header) == Sm4PageHeaderDefault:
-                page.data.data = page.data.data.reshape(
-                    page.header.y_size, page.header.x_size
+        with self._phase("load_page_region"):
+            if self._mmap is not None:
+                region = page.read_region(
+                    self._counting(PositionalCursor(self._mmap)),
+                    rows,
+                    cols,
+                    self.dtype,
+                )
+            elif self._stream is not None:
+                region = page.read_region(
+                    self._counting(Cursor(self._stream)),
+                    rows,
+                    cols,
+                    self.dtype,
+                )
+            elif self.filepath is None:
+                raise BufferError("Non-seekable stream cannot be read again")
+            else:
+                with open(self.filepath, "rb") as f:
+                    region = page.read_region(
+                        self._counting(PositionalCursor(f)),
+                        rows,
+                        cols,
+                        self.dtype,
+                    )
+
+        if self.stats is not None:
+            self.stats.add_allocated(region.nbytes)
+        return region
+
+    def read_sm4_file(self, f: Union[Buffer, memoryview]) -> None:
+        """Main function for parsing a SM4-file
+
+        Args:
+            f: File buffer or content of the file to parse
+        """
+        cursor: Cursor
+        if isinstance(f, memoryview):
+            cursor = PositionalCursor(f)
+        elif (
+            self.coalesce is not None
+            and self.threads is None
+            and not isinstance(f, mmap.mmap)
+        ):
+            cursor = CoalescingCursor(f, self.coalesce)
+            self.read_stats = cursor.stats
+        else:
+            cursor = Cursor(f)
+        cursor = self._counting(cursor)
+
+        with self._phase("file_header"):
+            self.file_header = Sm4FileHeader.from_buffer(cursor)
+            _prefetch(cursor, self.file_header.object_list)
+            self.file_header.read_objects(cursor)
+        page_index_header = self.file_header.page_index_header
+        _prefetch(cursor, page_index_header.object_list)
+
+        with self._phase("page_index"):
+            page_index_array_offset = (
+                page_index_header.page_index_array_offset()
+            )
+            assert page_index_array_offset
+            cursor.set_position(page_index_array_offset)
+
+            self.pages: List[Sm4Page] = []
+            for _ in range(page_index_header.page_count):
+                page = Sm4Page.from_buffer(cursor)
+                self.pages.append(page)
+
+        _prefetch(
+            cursor,
+            [
+                obj
+                for page in self.pages
+                for obj in page.object_list
+                if obj.obj_type
+                in (
+                    RhkObjectType.RHK_OBJECT_PAGE_HEADER,
+                    RhkObjectType.RHK_OBJECT_THUMBNAIL,
+                    RhkObjectType.RHK_OBJECT_THUMBNAIL_HEADER,
+                )
+                or (
+                    obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_DATA
+                    and not self.lazy
                 )
+            ],
+        )
+
+        if self.threads is None:
+            with self._phase("pages"):
+                for page in self.pages:
+                    self.read_page(cursor, page)
+
+            if not self.lazy:
+                with self._phase("arrange_data"):
+                    self.arrange_data()
+
+        else:
+            with self._phase("pages"), ThreadPoolExecutor(
+                max_workers=self.threads
+            ) as executor:
+                # consume the results to raise exceptions of the threads
+                for _ in executor.map(
+                    lambda page: self.read_page_concurrently(f, page),
+                    self.pages,
+                ):
+                    pass
+
+    def read_sm4_stream(self, f: BinaryIO) -> None:
+        """Parse a SM4-file in a single forward pass over a stream, which
+        does not need to be seekable
 
-                if page.page_data_type == RhkPageDataType.RHK_DATA_IMAGE:
-                    if page.header.x_scale < 0:
-                        page.data.data = np.flip(page.data.data, axis=1)
-                    if page.header.y_scale > 0:
-                        page.data.data = np.flip(page.data.data, axis=0)
+        The objects are read in the order of their offsets as soon as they
+        are found in an object list. Bytes which are passed before the
+        object containing them is found are buffered, so objects may be
+        stored before the object listing them, e.g. the PRM before the PRM
+        Header. The buffered bytes are released once they are read, or once
+        they are known to belong to an object which is not read.
 
-                elif page.page_data_type == RhkPageDataType.RHK_DATA_LINE:
-                    x_values = (
-                        np.arange(page.header.x_size) * page.header.x_scale
-                        + page.header.x_offset
+        Args:
+            f: Stream of the file to parse, positioned at its start
+        """
+        stream_cursor = StreamCursor(f)
+        cursor = self._counting(stream_cursor)
+        file_header = Sm4FileHeader.from_buffer(cursor)
+        self.file_header = file_header
+        self.pages = []
+        plan = _ReadPlan(stream_cursor.release_read)
+
+        def skip(obj: Sm4Object) -> None:
+            """Release the bytes of an object which is not read"""
+            if obj.offset != 0:
+                stream_cursor.release(obj.offset, obj.offset + obj.size)
+
+        read_page_header_objects: List[
+            Tuple[Sm4PageHeaderDefault, List[Any]]
+        ] = []
+
+        def read_prm_header() -> None:
+            file_header.read_prm_header(cursor)
+            for obj in file_header.object_list:
+                if obj.obj_type == RhkObjectType.RHK_OBJECT_PRM:
+                    plan.add(obj.offset, partial(file_header.read_prm, cursor))
+
+        def read_page_index_header() -> None:
+            file_header.read_page_index_header(cursor)
+            page_index_header = file_header.page_index_header
+            plan.add(
+                page_index_header.page_index_array_offset(),
+                partial(read_page_index_array, page_index_header),
+            )
+
+        def read_page_index_array(
+            page_index_header: Sm4PageIndexHeader,
+        ) -> None:
+            cursor.set_position(page_index_header.page_index_array_offset())
+            for _ in range(page_index_header.page_count):
+                page = Sm4Page.from_buffer(cursor)
+                self.pages.append(page)
+                plan.add(page.page_header_offset(), partial(read_page, page))
+
+        def read_page(page: Sm4Page) -> None:
+            cursor.set_position(page.page_header_offset())
+            if page.page_data_type == RhkPageDataType.RHK_DATA_SEQUENTIAL:
+                page.add_header(Sm4PageHeaderSequential.from_buffer(cursor))
+            else:
+                page_header = Sm4PageHeaderDefault.from_buffer(cursor)
+                page.add_header(page_header)
+                # kept in the order of the object list
+                read_objs: List[Any] = [None] * len(page_header.object_list)
+                for index, obj in enumerate(page_header.object_list):
+                    if not _is_read(obj, self.objects, self.decoders):
+                        skip(obj)
+                    else:
+                        plan.add(
+                            obj.offset,
+                            partial(
+                                read_page_header_object,
+                                page_header,
+                                read_objs,
+                                index,
+                            ),
+                        )
+                read_page_header_objects.append((page_header, read_objs))
+
+            thumbnail_offsets = []
+            for obj in page.object_list:
+                if obj.offset == 0 or obj.size == 0:
+                    continue
+                if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_DATA:
+                    plan.add(
+                        obj.offset, partial(self._read_page_data, cursor, page)
                     )
-                    y_values_arr = page.data.data.transpose()
-                    page.data.data = np.column_stack((x_values, y_values_arr))
+                elif obj.obj_type in (
+                    RhkObjectType.RHK_OBJECT_THUMBNAIL,
+                    RhkObjectType.RHK_OBJECT_THUMBNAIL_HEADER,
+                ):
+                    thumbnail_offsets.append(obj.offset)
+                elif obj.obj_type != RhkObjectType.RHK_OBJECT_PAGE_HEADER:
+                    skip(obj)
+            if thumbnail_offsets:
+                plan.add(
+                    min(thumbnail_offsets),
+                    partial(page.read_thumbnail, cursor),
+                )
+
+        def read_page_header_object(
+            page_header: Sm4PageHeaderDefault,
+            read_objs: List[Any],
+            index: int,
+        ) -> None:
+            obj = page_header.object_list[index]
+            with self._object(obj.obj_type):
+                read_obj = page_header.read_object(cursor, obj, self.decoders)
+            read_objs[index] = read_obj
+            if read_obj is not None:
+                # available to the decoders of the following objects
+                page_header.objects_by_type[obj.obj_type] = read_obj
+
+        for obj in file_header.object_list:
+            if obj.obj_type == RhkObjectType.RHK_OBJECT_PRM_HEADER:
+                plan.add(obj.offset, read_prm_header)
+            elif obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_INDEX_HEADER:
+                plan.add(obj.offset, read_page_index_header)
+        with self._phase("stream"):
+            plan.run()
+
+        for page_header, read_objs in read_page_header_objects:
+            page_header.page_header_objects.extend(
+                read_obj for read_obj in read_objs if read_obj is not None
+            )
+        for page in self.pages:
+            page.read_label()
+            if page.thumbnail is not None:
+                self._count_read(page.thumbnail.thumbnail_data)
+        with self._phase("arrange_data"):
+            self.arrange_data()
+
+    def read_page(self, cursor: Cursor, page: Sm4Page) -> None:
+        """Read the Page Header, its objects, the Thumbnail and the Page Data
+        of a page
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            page: The [`Sm4Page`][sm4file.sm4_file.Sm4Page] to read
+        """
+        cursor.set_position(page.page_header_offset())
+
+        page_header: Sm4PageHeader
+        with self._object(RhkObjectType.RHK_OBJECT_PAGE_HEADER):
+            if page.page_data_type == RhkPageDataType.RHK_DATA_SEQUENTIAL:
+                page_header = Sm4PageHeaderSequential.from_buffer(cursor)
+            else:
+                page_header = Sm4PageHeaderDefault.from_buffer(cursor)
+        if isinstance(page_header, Sm4PageHeaderDefault):
+            _prefetch(
+                cursor,
+                page_header.selected_objects(self.objects, self.decoders),
+            )
+            page_header.read_data(
+                cursor, self.stats, self.objects, self.decoders
+            )
+
+        page.add_header(page_header)
+        page.read_label()
+        with self._object(RhkObjectType.RHK_OBJECT_THUMBNAIL):
+            page.read_thumbnail(cursor)
+        if page.thumbnail is not None:
+            self._count_read(page.thumbnail.thumbnail_data)
+        if not self.lazy:
+            self._read_page_data(cursor, page)
+
+    def read_page_concurrently(
+        self, f: PositionalSource, page: Sm4Page
+    ) -> None:
+        """Read a page with its own
+        [`PositionalCursor`][sm4file.cursor.PositionalCursor], then arrange
+        and scale its data. Safe to call from multiple threads for the same
+        file
+
+        Args:
+            f: File buffer or content of the file to parse
+            page: The [`Sm4Page`][sm4file.sm4_file.Sm4Page] to read
+        """
+        self.read_page(self._counting(PositionalCursor(f)), page)
+        if page.data is not None:
+            page.arrange_data()
+            # scaling releases the GIL, so it runs in parallel
+            data = page.data.data
+            if self.stats is not None:
+                self.stats.add_allocated(data.nbytes)
+        if page.sequential_data is not None:
+            sequential_data = page.sequential_data.data
+            if self.stats is not None:
+                self.stats.add_allocated(sequential_data.nbytes)
+
+    def arrange_data(self) -> None:
+        """Arrange the data arrays of all Pages, see
+        [`Sm4Page.arrange_data`][sm4file.sm4_file.Sm4Page.arrange_data]
+        """
+        for page in self.pages:
+            page.arrange_data()
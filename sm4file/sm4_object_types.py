@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import List
+from typing import Any, ClassVar, Dict, List, Optional
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+import re
+import struct
 import zlib
 
 import numpy as np
-from numpy._typing import NDArray
+from numpy._typing import DTypeLike, NDArray
 
 from .cursor import Cursor
 
@@ -20,31 +23,269 @@ class RhkDriftOptionType(Enum):
 
 @dataclass
 class PageData:
-    """Class for the measured data points"""
-
-    data: NDArray[np.float32]
+    """Class for the measured data points
+
+    The raw data is kept as read from the buffer. Scaling with `z_scale` and
+    `z_offset` is only applied when `data` is accessed for the first time.
+
+    Attributes:
+        raw_data: Unscaled data points as stored in the file
+        z_scale: Scaling factor of data
+        z_offset: Offset of data
+        x_values: x-values of line data, stacked as first column of `data`
+        dtype: Floating point type of `data`
+    """
+
+    raw_data: NDArray[np.int32]
+    z_scale: float = 1.0
+    z_offset: float = 0.0
+    x_values: Optional[NDArray[np.float64]] = None
+    dtype: np.dtype[Any] = np.dtype(np.float64)
+    _data: Optional[NDArray[np.floating[Any]]] = field(
+        default=None, init=False, repr=False
+    )
 
     @classmethod
     def from_buffer(
-        cls, cursor: Cursor, size: int, z_scale: float, z_offset: float
+        cls,
+        cursor: Cursor,
+        size: int,
+        z_scale: float,
+        z_offset: float,
+        dtype: DTypeLike = np.float64,
     ) -> PageData:
         """Read the buffer's bytes into a
         [`PageData`][sm4file.sm4_object_types.PageData]
 
+        For memory-mapped buffers, `raw_data` is a view into the mapping.
+
         Args:
             cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
             size: Number of bytes to read
             z_scale: Scaling factor of data
             z_offset: Offset of data
+            dtype: Floating point type of the scaled data
 
         Returns:
             The parsed [`PageData`][sm4file.sm4_object_types.PageData]
         """
-        # cursor.set_position(offset)
+        raw_data = np.frombuffer(cursor.read_view(size), dtype="<i4")
+        return cls(raw_data, z_scale, z_offset, dtype=np.dtype(dtype))
+
+    @property
+    def data(self) -> NDArray[np.floating[Any]]:
+        """Measured data, scaled with `z_scale` and `z_offset`"""
+        if self._data is None:
+            self._data = self.scale()
+        return self._data
+
+    @data.setter
+    def data(self, data: NDArray[np.floating[Any]]) -> None:
+        self._data = data
+
+    def scale(
+        self, dtype: Optional[DTypeLike] = None
+    ) -> NDArray[np.floating[Any]]:
+        """Scale the raw data with `z_scale` and `z_offset`
+
+        The result is allocated once and computed in place, without
+        intermediate arrays.
+
+        Args:
+            dtype: Floating point type of the result, defaults to `dtype`
+
+        Returns:
+            The scaled data
+        """
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        if self.x_values is None:
+            data = np.empty(self.raw_data.shape, dtype=dtype)
+            values, raw_data = data, self.raw_data
+        else:
+            y_size, x_size = self.raw_data.shape
+            data = np.empty((x_size, y_size + 1), dtype=dtype)
+            data[:, 0] = self.x_values
+            values, raw_data = data[:, 1:], self.raw_data.transpose()
+
+        np.multiply(raw_data, self.z_scale, out=values, casting="unsafe")
+        values += self.z_offset
+        return data
+
+    def release(self) -> None:
+        """Release the scaled data, it is computed again on the next access
+        of `data`
+        """
+        self._data = None
+
 
-        raw_data = np.frombuffer(cursor.read(size), dtype=np.int32)
-        data: NDArray[np.float32] = raw_data * z_scale + z_offset
-        return cls(data)
+@dataclass
+class SequentialData:
+    """Class for the data points of a sequential page
+
+    The raw data is kept as read from the buffer. The gains of the parameters
+    are only applied when `data` is accessed for the first time.
+
+    Attributes:
+        raw_data: Unscaled data points as stored in the file, with a row for
+            every sample and a column for every parameter
+        gains: Gain of every parameter
+        dtype: Floating point type of `data`
+    """
+
+    raw_data: NDArray[Any]
+    gains: NDArray[np.float32]
+    dtype: np.dtype[Any] = np.dtype(np.float64)
+    _data: Optional[NDArray[np.floating[Any]]] = field(
+        default=None, init=False, repr=False
+    )
+
+    # raw data type of the values, by the page header's data_type
+    _raw_dtypes: ClassVar[Dict[int, str]] = {0: "<f4", 1: "<i4"}
+
+    @classmethod
+    def from_buffer(
+        cls,
+        cursor: Cursor,
+        size: int,
+        data_type: int,
+        gains: List[float],
+        dtype: DTypeLike = np.float64,
+    ) -> SequentialData:
+        """Read the buffer's bytes into a
+        [`SequentialData`][sm4file.sm4_object_types.SequentialData]
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            size: Number of bytes to read
+            data_type: Type of the values, 0 for 32-bit floats and 1 for
+                32-bit integers
+            gains: Gain of every parameter
+            dtype: Floating point type of the scaled data
+
+        Returns:
+            The parsed [`SequentialData`][sm4file.sm4_object_types.SequentialData]
+
+        Raises:
+            ValueError: If the data type is not known, or the size is not a
+                multiple of the size of a sample of all parameters
+        """
+        if data_type not in cls._raw_dtypes:
+            raise ValueError(f"Unknown sequential data type {data_type}")
+
+        raw_dtype = np.dtype(cls._raw_dtypes[data_type])
+        param_count = len(gains)
+        sample_size = raw_dtype.itemsize * param_count
+        if param_count == 0:
+            if size != 0:
+                raise ValueError(
+                    f"Sequential data of {size} bytes without parameters"
+                )
+        elif size % sample_size != 0:
+            raise ValueError(
+                f"Sequential data of {size} bytes is no multiple of the"
+                f" {sample_size} bytes of a sample"
+            )
+        raw_data = np.frombuffer(cursor.read_view(size), dtype=raw_dtype)
+        return cls(
+            raw_data.reshape(size // max(sample_size, 1), param_count),
+            np.array(gains, dtype=np.float32),
+            dtype=np.dtype(dtype),
+        )
+
+    @property
+    def data(self) -> NDArray[np.floating[Any]]:
+        """Measured data, scaled with the gains of the parameters"""
+        if self._data is None:
+            self._data = self.scale()
+        return self._data
+
+    @data.setter
+    def data(self, data: NDArray[np.floating[Any]]) -> None:
+        self._data = data
+
+    def scale(
+        self, dtype: Optional[DTypeLike] = None
+    ) -> NDArray[np.floating[Any]]:
+        """Scale the raw data with the gains in a single vectorized pass
+
+        Args:
+            dtype: Floating point type of the result, defaults to `dtype`
+
+        Returns:
+            The scaled data
+        """
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        data = np.empty(self.raw_data.shape, dtype=dtype)
+        np.multiply(self.raw_data, self.gains, out=data, casting="unsafe")
+        return data
+
+    def release(self) -> None:
+        """Release the scaled data, it is computed again on the next access
+        of `data`
+        """
+        self._data = None
+
+
+@dataclass
+class ThumbnailHeader:
+    """Class for Thumbnail Header"""
+
+    thumbnail_width: int
+    thumbnail_height: int
+    thumbnail_format: int
+
+    # thumbnail_width, thumbnail_height, thumbnail_format
+    _layout: ClassVar[struct.Struct] = struct.Struct("<3I")
+
+    @classmethod
+    def from_buffer(cls, cursor: Cursor) -> ThumbnailHeader:
+        """Read the buffer's bytes into a
+        [`ThumbnailHeader`][sm4file.sm4_object_types.ThumbnailHeader]
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+
+        Returns:
+            The parsed [`ThumbnailHeader`][sm4file.sm4_object_types.ThumbnailHeader]
+        """
+        return cls(*cursor.read_struct(cls._layout))
+
+
+@dataclass
+class Thumbnail:
+    """Class for Thumbnail, a small preview of the Page Data
+
+    Attributes:
+        thumbnail_data: Unscaled data points of the preview as stored in the
+            file, with shape (height, width)
+    """
+
+    thumbnail_data: NDArray[np.int32]
+
+    @classmethod
+    def from_buffer(
+        cls, cursor: Cursor, header: ThumbnailHeader
+    ) -> Optional[Thumbnail]:
+        """Read the buffer's bytes into a
+        [`Thumbnail`][sm4file.sm4_object_types.Thumbnail]
+
+        Args:
+            cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            header: The Thumbnail's
+                [`ThumbnailHeader`][sm4file.sm4_object_types.ThumbnailHeader]
+
+        Returns:
+            The parsed [`Thumbnail`][sm4file.sm4_object_types.Thumbnail], or
+            None if the format of the Thumbnail is not supported
+        """
+        # only raw 32-bit integers are known
+        if header.thumbnail_format != 0:
+            return None
+
+        shape = (header.thumbnail_height, header.thumbnail_width)
+        size = shape[0] * shape[1] * 4
+        thumbnail_data = np.frombuffer(cursor.read_view(size), dtype="<i4")
+        return cls(thumbnail_data.reshape(shape))
 
 
 @dataclass
@@ -54,6 +295,9 @@ class ImageDriftHeader:
     imagedrift_filetime: int
     imagedrift_drift_option_type: RhkDriftOptionType
 
+    # imagedrift_filetime, imagedrift_drift_option_type
+    _layout: ClassVar[struct.Struct] = struct.Struct("<qI")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> ImageDriftHeader:
         """Read the buffer's bytes into a
@@ -65,10 +309,14 @@ class ImageDriftHeader:
         Returns:
             The parsed [`ImageDriftHeader`][sm4file.sm4_object_types.ImageDriftHeader]
         """
-        imagedrift_filetime = cursor.read_u64_le()
-        imagedrift_drift_option_type = RhkDriftOptionType(cursor.read_u32_le())
+        imagedrift_filetime, imagedrift_drift_option_type = cursor.read_struct(
+            cls._layout
+        )
 
-        return cls(imagedrift_filetime, imagedrift_drift_option_type)
+        return cls(
+            imagedrift_filetime,
+            RhkDriftOptionType(imagedrift_drift_option_type),
+        )
 
 
 @dataclass
@@ -83,6 +331,10 @@ class ImageDriftData:
     imagedrift_vector_x: int
     imagedrift_vector_y: int
 
+    # imagedrift_time, imagedrift_dx, imagedrift_dy, imagedrift_cumulative_x,
+    # imagedrift_cumulative_y, imagedrift_vector_x, imagedrift_vector_y
+    _layout: ClassVar[struct.Struct] = struct.Struct("<7I")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> ImageDriftData:
         """Read the buffer's bytes into a
@@ -94,23 +346,7 @@ class ImageDriftData:
         Returns:
             The parsed [`ImageDriftData`][sm4file.sm4_object_types.ImageDriftData]
         """
-        imagedrift_time = cursor.read_u32_le()
-        imagedrift_dx = cursor.read_u32_le()
-        imagedrift_dy = cursor.read_u32_le()
-        imagedrift_cumulative_x = cursor.read_u32_le()
-        imagedrift_cumulative_y = cursor.read_u32_le()
-        imagedrift_vector_x = cursor.read_u32_le()
-        imagedrift_vector_y = cursor.read_u32_le()
-
-        return cls(
-            imagedrift_time,
-            imagedrift_dx,
-            imagedrift_dy,
-            imagedrift_cumulative_x,
-            imagedrift_cumulative_y,
-            imagedrift_vector_x,
-            imagedrift_vector_y,
-        )
+        return cls(*cursor.read_struct(cls._layout))
 
 
 @dataclass
@@ -122,6 +358,9 @@ class SpecDriftHeader:
     specdrift_drift_option_type_name: str
     specdrift_channel: str
 
+    # specdrift_filetime, specdrift_drift_option_type, reserved
+    _layout: ClassVar[struct.Struct] = struct.Struct("<qI4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> SpecDriftHeader:
         """Read the buffer's bytes into a
@@ -134,8 +373,9 @@ class SpecDriftHeader:
             The parsed [`SpecDriftHeader`][sm4file.sm4_object_types.SpecDriftHeader]
         """
         # unix epoch
-        specdrift_filetime = cursor.read_u64_le()
-        specdrift_drift_option_type = cursor.read_u32_le()
+        specdrift_filetime, specdrift_drift_option_type = cursor.read_struct(
+            cls._layout
+        )
         if specdrift_drift_option_type == 0:
             specdrift_drift_option_type_name = "RHK_DRIFT_DISABLED"
         elif specdrift_drift_option_type == 1:
@@ -145,7 +385,6 @@ class SpecDriftHeader:
         else:
             specdrift_drift_option_type_name = "RHK_DRIFT_UNKNOWN"
 
-        _ = cursor.read_u32_le()
         specdrift_channel = cursor.read_sm4_string()
 
         return cls(
@@ -158,15 +397,25 @@ class SpecDriftHeader:
 
 @dataclass
 class SpecDriftData:
-    """Class for Spec Drift Data"""
-
-    specdrift_time: List[float]
-    specdrift_x_coord: List[float]
-    specdrift_y_coord: List[float]
-    specdrift_dx: List[float]
-    specdrift_dy: List[float]
-    specdrift_cumulative_x: List[float]
-    specdrift_cumulative_y: List[float]
+    """Class for Spec Drift Data. Each field holds one value per spectrum"""
+
+    specdrift_time: NDArray[np.float32]
+    specdrift_x_coord: NDArray[np.float32]
+    specdrift_y_coord: NDArray[np.float32]
+    specdrift_dx: NDArray[np.float32]
+    specdrift_dy: NDArray[np.float32]
+    specdrift_cumulative_x: NDArray[np.float32]
+    specdrift_cumulative_y: NDArray[np.float32]
+
+    _dtype: ClassVar[np.dtype[np.void]] = np.dtype([
+        ("time", "<f4"),
+        ("x_coord", "<f4"),
+        ("y_coord", "<f4"),
+        ("dx", "<f4"),
+        ("dy", "<f4"),
+        ("cumulative_x", "<f4"),
+        ("cumulative_y", "<f4"),
+    ])
 
     @classmethod
     def from_buffer(cls, cursor: Cursor, y_size: int) -> SpecDriftData:
@@ -175,35 +424,23 @@ class SpecDriftData:
 
         Args:
             cursor: [`Cursor`][sm4file.cursor.Cursor] holding the buffer
+            y_size: Number of spectra
 
         Returns:
             The parsed [`SpecDriftData`][sm4file.sm4_object_types.SpecDriftData]
         """
-        specdrift_time: List[float] = []
-        specdrift_x_coord: List[float] = []
-        specdrift_y_coord: List[float] = []
-        specdrift_dx: List[float] = []
-        specdrift_dy: List[float] = []
-        specdrift_cumulative_x: List[float] = []
-        specdrift_cumulative_y: List[float] = []
-
-        for _ in range(y_size):
-            specdrift_time.append(cursor.read_f32_le())
-            specdrift_x_coord.append(cursor.read_f32_le())
-            specdrift_y_coord.append(cursor.read_f32_le())
-            specdrift_dx.append(cursor.read_f32_le())
-            specdrift_dy.append(cursor.read_f32_le())
-            specdrift_cumulative_x.append(cursor.read_f32_le())
-            specdrift_cumulative_y.append(cursor.read_f32_le())
+        records = np.frombuffer(
+            cursor.read(cls._dtype.itemsize * y_size), dtype=cls._dtype
+        )
 
         return cls(
-            specdrift_time,
-            specdrift_x_coord,
-            specdrift_y_coord,
-            specdrift_dx,
-            specdrift_dy,
-            specdrift_cumulative_x,
-            specdrift_cumulative_y,
+            records["time"],
+            records["x_coord"],
+            records["y_coord"],
+            records["dx"],
+            records["dy"],
+            records["cumulative_x"],
+            records["cumulative_y"],
         )
 
 
@@ -242,7 +479,7 @@ class StringData:
         Returns:
             The parsed [`StringData`][sm4file.sm4_object_types.StringData]
         """
-        strings = [cursor.read_sm4_string() for _ in range(count)]
+        strings = cursor.read_sm4_strings(count)
 
         label = strings[0]
         system_text = strings[1]
@@ -293,6 +530,20 @@ class StringData:
             channel_list,
         )
 
+    def measurement_datetime(self) -> Optional[datetime]:
+        """Get the datetime of the measurement from `date` and `time`
+
+        Returns:
+            The datetime or None if `date` or `time` is missing
+        """
+        if not self.date or not self.time:
+            return None
+        month_str, day_str, year_str = self.date.split("/")
+        year_str = "20" + year_str
+        month, day, year = int(month_str), int(day_str), int(year_str)
+        hour, min, sec = [int(x) for x in self.time.split(":")]
+        return datetime(year, month, day, hour, min, sec)
+
 
 @dataclass
 class TipTrackHeader:
@@ -307,6 +558,11 @@ class TipTrackHeader:
     tiptrack_tiptrack_info_count: int
     tiptrack_channel: str
 
+    # tiptrack_filetime, tiptrack_feature_height, tiptrack_feature_width,
+    # tiptrack_time_constant, tiptrack_cycle_rate, tiptrack_phase_lag,
+    # reserved, tiptrack_tiptrack_info_count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<q5f4xI")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> TipTrackHeader:
         """Read the buffer's bytes into a
@@ -319,14 +575,15 @@ class TipTrackHeader:
             The parsed [`TipTrackHeader`][sm4file.sm4_object_types.TipTrackHeader]
         """
         # unix epoch
-        tiptrack_filetime = cursor.read_u64_le()
-        tiptrack_feature_height = cursor.read_f32_le()
-        tiptrack_feature_width = cursor.read_f32_le()
-        tiptrack_time_constant = cursor.read_f32_le()
-        tiptrack_cycle_rate = cursor.read_f32_le()
-        tiptrack_phase_lag = cursor.read_f32_le()
-        _ = cursor.read_u32_le()
-        tiptrack_tiptrack_info_count = cursor.read_u32_le()
+        (
+            tiptrack_filetime,
+            tiptrack_feature_height,
+            tiptrack_feature_width,
+            tiptrack_time_constant,
+            tiptrack_cycle_rate,
+            tiptrack_phase_lag,
+            tiptrack_tiptrack_info_count,
+        ) = cursor.read_struct(cls._layout)
         tiptrack_channel = cursor.read_sm4_string()
 
         return cls(
@@ -343,12 +600,19 @@ class TipTrackHeader:
 
 @dataclass
 class TipTrackData:
-    """Class for Tip Track Data"""
+    """Class for Tip Track Data. Each field holds one value per info entry"""
 
-    tiptrack_cumulative_time: List[float]
-    tiptrack_time: List[float]
-    tiptrack_dx: List[float]
-    tiptrack_dy: List[float]
+    tiptrack_cumulative_time: NDArray[np.float32]
+    tiptrack_time: NDArray[np.float32]
+    tiptrack_dx: NDArray[np.float32]
+    tiptrack_dy: NDArray[np.float32]
+
+    _dtype: ClassVar[np.dtype[np.void]] = np.dtype([
+        ("cumulative_time", "<f4"),
+        ("time", "<f4"),
+        ("dx", "<f4"),
+        ("dy", "<f4"),
+    ])
 
     @classmethod
     def from_buffer(
@@ -364,30 +628,48 @@ class TipTrackData:
         Returns:
             The parsed [`TipTrackData`][sm4file.sm4_object_types.TipTrackData]
         """
-        tiptrack_cumulative_time: List[float] = []
-        tiptrack_time: List[float] = []
-        tiptrack_dx: List[float] = []
-        tiptrack_dy: List[float] = []
-
-        for _ in range(tiptrack_info_count):
-            tiptrack_cumulative_time.append(cursor.read_f32_le())
-            tiptrack_time.append(cursor.read_f32_le())
-            tiptrack_dx.append(cursor.read_f32_le())
-            tiptrack_dy.append(cursor.read_f32_le())
+        records = np.frombuffer(
+            cursor.read(cls._dtype.itemsize * tiptrack_info_count),
+            dtype=cls._dtype,
+        )
 
         return cls(
-            tiptrack_cumulative_time,
-            tiptrack_time,
-            tiptrack_dx,
-            tiptrack_dy,
+            records["cumulative_time"],
+            records["time"],
+            records["dx"],
+            records["dy"],
         )
 
 
 @dataclass
 class Prm:
-    """Class for PRM (Parameter) Data"""
+    """Class for PRM (Parameter) Data
 
-    prm_data: str
+    The PRM data is kept as stored in the file. It is only decompressed and
+    decoded when `prm_data` is accessed for the first time, and only parsed
+    into sections and parameters when `params` is accessed for the first
+    time.
+
+    Attributes:
+        prm_raw: PRM data as stored in the file, possibly compressed
+        prm_compression_flag: Indicates if PRM is compressed
+        prm_data_size: Size of the uncompressed PRM data in bytes
+    """
+
+    prm_raw: bytes
+    prm_compression_flag: int
+    prm_data_size: int
+    _prm_data: Optional[str] = field(default=None, init=False, repr=False)
+    _params: Optional[Dict[str, Dict[str, str]]] = field(
+        default=None, init=False, repr=False
+    )
+
+    # "[Section]" or "<id>\tKey ::Value" at the start of a line
+    _line_pattern: ClassVar[re.Pattern[str]] = re.compile(
+        r"^(?:\[(?P<section>[^\]]*)\]\**"
+        r"|<[\d ]+>\t(?P<key>.*?)::(?P<value>.*?))\s*$",
+        re.MULTILINE,
+    )
 
     @classmethod
     def from_buffer(
@@ -409,17 +691,56 @@ class Prm:
         Returns:
             The parsed [`Prm`][sm4file.sm4_object_types.Prm]
         """
-        if prm_compression_flag == 0:
-            prm_data_raw = cursor.read(prm_data_size)
-        else:
-            prm_data_raw = zlib.decompress(
-                cursor.read(prm_compression_size),
-                wbits=0,
-                bufsize=prm_data_size,
-            )
+        size = (
+            prm_data_size
+            if prm_compression_flag == 0
+            else prm_compression_size
+        )
+        return cls(cursor.read(size), prm_compression_flag, prm_data_size)
+
+    @property
+    def prm_data(self) -> str:
+        """PRM data as text"""
+        if self._prm_data is None:
+            if self.prm_compression_flag == 0:
+                prm_data_raw = self.prm_raw
+            else:
+                prm_data_raw = zlib.decompress(
+                    self.prm_raw, wbits=0, bufsize=self.prm_data_size
+                )
+            self._prm_data = prm_data_raw.decode("CP437")
+        return self._prm_data
+
+    @property
+    def params(self) -> Dict[str, Dict[str, str]]:
+        """Parameters of the PRM data as text, by section and key. If a key
+        occurs more than once in a section, its first value is kept
+        """
+        if self._params is None:
+            params: Dict[str, Dict[str, str]] = {}
+            section: Dict[str, str] = {}
+            for match in self._line_pattern.finditer(self.prm_data):
+                if match["section"] is not None:
+                    section = params.setdefault(match["section"], {})
+                else:
+                    section.setdefault(match["key"].strip(), match["value"])
+            self._params = params
+        return self._params
+
+    def get(
+        self, section: str, key: str, default: Optional[str] = None
+    ) -> Optional[str]:
+        """Get the value of a parameter
 
-        prm_data = prm_data_raw.decode("CP437")
-        return cls(prm_data)
+        Args:
+            section: Name of the section, without brackets
+            key: Name of the parameter
+            default: Returned if the parameter does not exist
+
+        Returns:
+            The value of the parameter as text
+        """
+        return self.params.get(section, {}).get(key, default)
 
 
 @dataclass
@@ -430,6 +751,9 @@ class PrmHeader:
     prm_data_size: int
     prm_compression_size: int
 
+    # prm_compression_flag, prm_data_size, prm_compression_size
+    _layout: ClassVar[struct.Struct] = struct.Struct("<3I")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> PrmHeader:
         """Read the buffer's bytes into a
@@ -441,17 +765,7 @@ class PrmHeader:
         Returns:
             The parsed [`PrmHeader`][sm4file.sm4_object_types.PrmHeader]
         """
-        prm_compression_flag = cursor.read_u32_le()
-        prm_data_size = cursor.read_u32_le()
-        prm_compression_size = cursor.read_u32_le()
-
-        # read the actual PRM data
-
-        return cls(
-            prm_compression_flag,
-            prm_data_size,
-            prm_compression_size,
-        )
+        return cls(*cursor.read_struct(cls._layout))
 
 
 @dataclass
@@ -471,6 +785,10 @@ class ApiInfo:
     bias: int
     units: str
 
+    # voltage_high, voltage_low, gain, api_offset, ramp_mode, ramp_type, step,
+    # image_count, dac, mux, bias, string count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<4f7I4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> ApiInfo:
         """Read the buffer's bytes into a
@@ -482,20 +800,20 @@ class ApiInfo:
         Returns:
             The parsed [`ApiInfo`][sm4file.sm4_object_types.ApiInfo]
         """
-        voltage_high = cursor.read_f32_le()
-        voltage_low = cursor.read_f32_le()
-        gain = cursor.read_f32_le()
-        api_offset = cursor.read_f32_le()
-
-        ramp_mode = cursor.read_u32_le()
-        ramp_type = cursor.read_u32_le()
-        step = cursor.read_u32_le()
-        image_count = cursor.read_u32_le()
-        dac = cursor.read_u32_le()
-        mux = cursor.read_u32_le()
-        bias = cursor.read_u32_le()
+        (
+            voltage_high,
+            voltage_low,
+            gain,
+            api_offset,
+            ramp_mode,
+            ramp_type,
+            step,
+            image_count,
+            dac,
+            mux,
+            bias,
+        ) = cursor.read_struct(cls._layout)
 
-        _ = cursor.read_u32_le()
         units = cursor.read_sm4_string()
 
         return cls(
@@ -538,6 +856,10 @@ class PiezoSensitivity:
     scan_calibration: str
     actuator_calibration: str
 
+    # tube_x, tube_y, tube_z, tube_z_offset, scan_x, scan_y, scan_z, actuator,
+    # string count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<8d4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> PiezoSensitivity:
         """Read the buffer's bytes into a
@@ -549,28 +871,30 @@ class PiezoSensitivity:
         Returns:
             The parsed [`PiezoSensitivity`][sm4file.sm4_object_types.PiezoSensitivity]
         """
-        tube_x = cursor.read_f64_le()
-        tube_y = cursor.read_f64_le()
-        tube_z = cursor.read_f64_le()
-        tube_z_offset = cursor.read_f64_le()
-        scan_x = cursor.read_f64_le()
-        scan_y = cursor.read_f64_le()
-        scan_z = cursor.read_f64_le()
-        actuator = cursor.read_f64_le()
-
-        _ = cursor.read_u32_le()
+        (
+            tube_x,
+            tube_y,
+            tube_z,
+            tube_z_offset,
+            scan_x,
+            scan_y,
+            scan_z,
+            actuator,
+        ) = cursor.read_struct(cls._layout)
 
-        tube_x_unit = cursor.read_sm4_string()
-        tube_y_unit = cursor.read_sm4_string()
-        tube_z_unit = cursor.read_sm4_string()
-        tube_z_unit_offset = cursor.read_sm4_string()
-        scan_x_unit = cursor.read_sm4_string()
-        scan_y_unit = cursor.read_sm4_string()
-        scan_z_unit = cursor.read_sm4_string()
-        actuator_unit = cursor.read_sm4_string()
-        tube_calibration = cursor.read_sm4_string()
-        scan_calibration = cursor.read_sm4_string()
-        actuator_calibration = cursor.read_sm4_string()
+        (
+            tube_x_unit,
+            tube_y_unit,
+            tube_z_unit,
+            tube_z_unit_offset,
+            scan_x_unit,
+            scan_y_unit,
+            scan_z_unit,
+            actuator_unit,
+            tube_calibration,
+            scan_calibration,
+            actuator_calibration,
+        ) = cursor.read_sm4_strings(11)
 
         return cls(
             tube_x,
@@ -612,6 +936,10 @@ class FrequencySweepData:
     signal_to_drive_ratio_unit: str
     q_factor_unit: str
 
+    # psd_total_signal, peak_frequency, peak_amplitude, drive_aplitude,
+    # signal_to_drive_ratio, q_factor, string count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<6d4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> FrequencySweepData:
         """Read the buffer's bytes into a
@@ -623,21 +951,23 @@ class FrequencySweepData:
         Returns:
             The parsed [`FrequencySweepData`][sm4file.sm4_object_types.FrequencySweepData]
         """
-        psd_total_signal = cursor.read_f64_le()
-        peak_frequency = cursor.read_f64_le()
-        peak_amplitude = cursor.read_f64_le()
-        drive_aplitude = cursor.read_f64_le()
-        signal_to_drive_ratio = cursor.read_f64_le()
-        q_factor = cursor.read_f64_le()
-
-        _ = cursor.read_u32_le()
+        (
+            psd_total_signal,
+            peak_frequency,
+            peak_amplitude,
+            drive_aplitude,
+            signal_to_drive_ratio,
+            q_factor,
+        ) = cursor.read_struct(cls._layout)
 
-        total_signal_unit = cursor.read_sm4_string()
-        peak_frequency_unit = cursor.read_sm4_string()
-        peak_amplitude_unit = cursor.read_sm4_string()
-        drive_amplitude_unit = cursor.read_sm4_string()
-        signal_to_drive_ratio_unit = cursor.read_sm4_string()
-        q_factor_unit = cursor.read_sm4_string()
+        (
+            total_signal_unit,
+            peak_frequency_unit,
+            peak_amplitude_unit,
+            drive_amplitude_unit,
+            signal_to_drive_ratio_unit,
+            q_factor_unit,
+        ) = cursor.read_sm4_strings(6)
 
         return cls(
             psd_total_signal,
@@ -664,6 +994,9 @@ class ScanProcessorInfo:
     x_slope_compensation_unit: str
     y_slope_compensation_unit: str
 
+    # x_slope_compensation, y_slope_compensation, string count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<2d4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> ScanProcessorInfo:
         """Read the buffer's bytes into a
@@ -675,11 +1008,13 @@ class ScanProcessorInfo:
         Returns:
             The parsed [`ScanProcessorInfo`][sm4file.sm4_object_types.ScanProcessorInfo]
         """
-        x_slope_compensation = cursor.read_f64_le()
-        y_slope_compensation = cursor.read_f64_le()
-        _ = cursor.read_u32_le()
-        x_slope_compensation_unit = cursor.read_sm4_string()
-        y_slope_compensation_unit = cursor.read_sm4_string()
+        x_slope_compensation, y_slope_compensation = cursor.read_struct(
+            cls._layout
+        )
+        (
+            x_slope_compensation_unit,
+            y_slope_compensation_unit,
+        ) = cursor.read_sm4_strings(2)
 
         return cls(
             x_slope_compensation,
@@ -722,6 +1057,13 @@ class PllInfo:
     diss_pi_lower_bound_unit: str
     diss_pi_upper_bound_unit: str
 
+    # amplitude_control, drive_amplitude, drive_ref_frequency,
+    # lockin_freq_offset, lockin_harmonic_factor, lockin_phase_offset,
+    # pi_gain, pi_int_cutoff_frequency, pi_lower_bound, pi_upper_bound,
+    # diss_pi_gain, diss_pi_int_cutoff_frequency, diss_pi_lower_bound,
+    # diss_pi_upper_bound
+    _layout: ClassVar[struct.Struct] = struct.Struct("<I13d")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> PllInfo:
         """Read the buffer's bytes into a
@@ -733,36 +1075,39 @@ class PllInfo:
         Returns:
             The parsed [`PllInfo`][sm4file.sm4_object_types.PllInfo]
         """
-        amplitude_control = cursor.read_u32_le()
-        drive_amplitude = cursor.read_f64_le()
-        drive_ref_frequency = cursor.read_f64_le()
-        lockin_freq_offset = cursor.read_f64_le()
-        lockin_harmonic_factor = cursor.read_f64_le()
-        lockin_phase_offset = cursor.read_f64_le()
-        pi_gain = cursor.read_f64_le()
-        pi_int_cutoff_frequency = cursor.read_f64_le()
-        pi_lower_bound = cursor.read_f64_le()
-        pi_upper_bound = cursor.read_f64_le()
-        diss_pi_gain = cursor.read_f64_le()
-        diss_pi_int_cutoff_frequency = cursor.read_f64_le()
-        diss_pi_lower_bound = cursor.read_f64_le()
-        diss_pi_upper_bound = cursor.read_f64_le()
-
-        lockin_filter_cutoff_frequency = cursor.read_sm4_string()
-
-        drive_amplitude_unit = cursor.read_sm4_string()
-        drive_ref_frequency_unit = cursor.read_sm4_string()
-        lockin_freq_offset_unit = cursor.read_sm4_string()
-        lockin_harmonic_factor_unit = cursor.read_sm4_string()
-        lockin_phase_offset_unit = cursor.read_sm4_string()
-        pi_gain_unit = cursor.read_sm4_string()
-        pi_int_cutoff_frequency_unit = cursor.read_sm4_string()
-        pi_lower_bound_unit = cursor.read_sm4_string()
-        pi_upper_bound_unit = cursor.read_sm4_string()
-        diss_pi_gain_unit = cursor.read_sm4_string()
-        diss_pi_int_cutoff_frequency_unit = cursor.read_sm4_string()
-        diss_pi_lower_bound_unit = cursor.read_sm4_string()
-        diss_pi_upper_bound_unit = cursor.read_sm4_string()
+        (
+            amplitude_control,
+            drive_amplitude,
+            drive_ref_frequency,
+            lockin_freq_offset,
+            lockin_harmonic_factor,
+            lockin_phase_offset,
+            pi_gain,
+            pi_int_cutoff_frequency,
+            pi_lower_bound,
+            pi_upper_bound,
+            diss_pi_gain,
+            diss_pi_int_cutoff_frequency,
+            diss_pi_lower_bound,
+            diss_pi_upper_bound,
+        ) = cursor.read_struct(cls._layout)
+
+        (
+            lockin_filter_cutoff_frequency,
+            drive_amplitude_unit,
+            drive_ref_frequency_unit,
+            lockin_freq_offset_unit,
+            lockin_harmonic_factor_unit,
+            lockin_phase_offset_unit,
+            pi_gain_unit,
+            pi_int_cutoff_frequency_unit,
+            pi_lower_bound_unit,
+            pi_upper_bound_unit,
+            diss_pi_gain_unit,
+            diss_pi_int_cutoff_frequency_unit,
+            diss_pi_lower_bound_unit,
+            diss_pi_upper_bound_unit,
+        ) = cursor.read_sm4_strings(14)
 
         return cls(
             amplitude_control,
@@ -810,6 +1155,10 @@ class ChannelDriveInfo:
     phase_offset_unit: str
     harmonic_factor_unit: str
 
+    # string count, master_osciallator, amplitude, frequency, phase_offset,
+    # harmonic_factor
+    _layout: ClassVar[struct.Struct] = struct.Struct("<4xI4d")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> ChannelDriveInfo:
         """Read the buffer's bytes into a
@@ -821,16 +1170,19 @@ class ChannelDriveInfo:
         Returns:
             The parsed [`ChannelDriveInfo`][sm4file.sm4_object_types.ChannelDriveInfo]
         """
-        _ = cursor.read_u32_le()
-        master_osciallator = cursor.read_u32_le()
-        amplitude = cursor.read_f64_le()
-        frequency = cursor.read_f64_le()
-        phase_offset = cursor.read_f64_le()
-        harmonic_factor = cursor.read_f64_le()
-        amplitude_unit = cursor.read_sm4_string()
-        frequency_unit = cursor.read_sm4_string()
-        phase_offset_unit = cursor.read_sm4_string()
-        harmonic_factor_unit = cursor.read_sm4_string()
+        (
+            master_osciallator,
+            amplitude,
+            frequency,
+            phase_offset,
+            harmonic_factor,
+        ) = cursor.read_struct(cls._layout)
+        (
+            amplitude_unit,
+            frequency_unit,
+            phase_offset_unit,
+            harmonic_factor_unit,
+        ) = cursor.read_sm4_strings(4)
 
         return cls(
             master_osciallator,
@@ -859,6 +1211,10 @@ class LockinInfo:
     frequency_unit: str
     phase_unit: str
 
+    # num_strings, non_master_oscillator, frequency, harmonic_factor,
+    # phase_offset
+    _layout: ClassVar[struct.Struct] = struct.Struct("<2I3d")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> LockinInfo:
         """Read the buffer's bytes into a
@@ -870,16 +1226,19 @@ class LockinInfo:
         Returns:
             The parsed [`LockinInfo`][sm4file.sm4_object_types.LockinInfo]
         """
-        num_strings = cursor.read_u32_le()
-
-        non_master_oscillator = cursor.read_u32_le()
-        frequency = cursor.read_f64_le()
-        harmonic_factor = cursor.read_f64_le()
-        phase_offset = cursor.read_f64_le()
+        (
+            num_strings,
+            non_master_oscillator,
+            frequency,
+            harmonic_factor,
+            phase_offset,
+        ) = cursor.read_struct(cls._layout)
         # these might be not included
-        filter_cutoff_frequency = cursor.read_sm4_string()
-        frequency_unit = cursor.read_sm4_string()
-        phase_unit = cursor.read_sm4_string()
+        (
+            filter_cutoff_frequency,
+            frequency_unit,
+            phase_unit,
+        ) = cursor.read_sm4_strings(3)
 
         return cls(
             num_strings,
@@ -908,6 +1267,10 @@ class PiControllerInfo:
     integral_gain_unit: str
     output_unit: str
 
+    # setpoint, proportional_gain, integral_gain, lower_bound, upper_bound,
+    # string count
+    _layout: ClassVar[struct.Struct] = struct.Struct("<5d4x")
+
     @classmethod
     def from_buffer(cls, cursor: Cursor) -> PiControllerInfo:
         """Read the buffer's bytes into a
@@ -919,17 +1282,20 @@ class PiControllerInfo:
         Returns:
             The parsed [`PiControllerInfo`][sm4file.sm4_object_types.PiControllerInfo]
         """
-        setpoint = cursor.read_f64_le()
-        proportional_gain = cursor.read_f64_le()
-        integral_gain = cursor.read_f64_le()
-        lower_bound = cursor.read_f64_le()
-        upper_bound = cursor.read_f64_le()
-        _ = cursor.read_u32_le()
-        feedback_unit = cursor.read_sm4_string()
-        setpoint_unit = cursor.read_sm4_string()
-        proportional_gain_unit = cursor.read_sm4_string()
-        integral_gain_unit = cursor.read_sm4_string()
-        output_unit = cursor.read_sm4_string()
+        (
+            setpoint,
+            proportional_gain,
+            integral_gain,
+            lower_bound,
+            upper_bound,
+        ) = cursor.read_struct(cls._layout)
+        (
+            feedback_unit,
+            setpoint_unit,
+            proportional_gain_unit,
+            integral_gain_unit,
+            output_unit,
+        ) = cursor.read_sm4_strings(5)
 
         return cls(
             setpoint,
@@ -0,0 +1,89 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
+
+from .cursor import CursorStats
+
+if TYPE_CHECKING:
+    from .sm4_file import RhkObjectType
+
+
+@dataclass
+class LoadStats:
+    """Instrumentation of reading SM4-files
+
+    Passed as `stats` to [`Sm4`][sm4file.Sm4] or
+    [`Sm4FileAll`][sm4file.sm4_file.Sm4FileAll], it records the wall time
+    of every phase of reading and of every type of object, the reads and
+    seeks of the cursors and the bytes allocated for arrays. Times and counts
+    are summed over all files and pages read with the same `LoadStats`,
+    including data read later for lazily loaded channels. The updates are
+    thread-safe. Without a `LoadStats`, nothing is timed or counted.
+
+    Attributes:
+        hook: Called with the name and wall time in seconds of every phase
+            when it ends, e.g. to forward the timings to a monitoring system
+        phase_times: Wall time in seconds of every phase
+        object_times: Wall time in seconds of reading every type of object
+        cursor: Reads, seeks and bytes read by the cursors
+        nbytes_allocated: Bytes allocated for the arrays of raw and scaled
+            data and thumbnails. Arrays which are views into a memory-mapped
+            file or into the file's content in memory are not counted
+    """
+
+    hook: Optional[Callable[[str, float], None]] = None
+    phase_times: Dict[str, float] = field(default_factory=dict)
+    object_times: Dict[RhkObjectType, float] = field(default_factory=dict)
+    cursor: CursorStats = field(default_factory=CursorStats)
+    nbytes_allocated: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of reading, then call the `hook`
+
+        Args:
+            name: Name of the phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.phase_times[name] = (
+                    self.phase_times.get(name, 0.0) + seconds
+                )
+            if self.hook is not None:
+                self.hook(name, seconds)
+
+    @contextmanager
+    def object(self, obj_type: RhkObjectType) -> Iterator[None]:
+        """Time reading an object
+
+        Args:
+            obj_type: Type of the object
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.object_times[obj_type] = (
+                    self.object_times.get(obj_type, 0.0) + seconds
+                )
+
+    def add_allocated(self, nbytes: int) -> None:
+        """Count bytes allocated for arrays
+
+        Args:
+            nbytes: Number of bytes
+        """
+        with self._lock:
+            self.nbytes_allocated += nbytes
@@ -0,0 +1,546 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import math
+from os import PathLike
+from pathlib import Path
+import struct
+from typing import BinaryIO, List, Optional, Sequence, Tuple, Union
+import zlib
+
+import numpy as np
+
+from .sm4_file import (
+    RhkLineType,
+    RhkObjectType,
+    RhkPageDataType,
+    RhkPageSourceType,
+    RhkPageType,
+    Sm4FileHeader,
+    Sm4Object,
+    Sm4Page,
+    Sm4PageHeaderDefault,
+    Sm4PageIndexHeader,
+)
+from .sm4_object_types import (
+    ImageDriftData,
+    ImageDriftHeader,
+    PrmHeader,
+    SpecDriftData,
+    SpecDriftHeader,
+)
+
+_SIGNATURE = "STiMage 005.004 1"
+# fixed datetime of measurement, so equal arguments give identical files
+_DATETIME = datetime(2023, 6, 17, 11, 12, 42)
+# number of values of Page Data generated and written at once
+_CHUNK_SIZE = 1 << 20
+_Z_RANGE = 1 << 20
+
+# TypeAlias
+_HeaderObject = Tuple[RhkObjectType, bytes]
+
+
+@dataclass
+class _PageSpec:
+    """Content of a page to be written"""
+
+    page_data_type: RhkPageDataType
+    page_type: RhkPageType
+    line_type: RhkLineType
+    label: str
+    x_size: int
+    y_size: int
+    x_scale: float
+    y_scale: float
+    z_scale: float
+    x_units: str
+    z_units: str
+    grid_x_size: int = 0
+    grid_y_size: int = 0
+    header_objects: List[_HeaderObject] = field(default_factory=list)
+
+    @property
+    def page_data_size(self) -> int:
+        return self.x_size * self.y_size * 4
+
+
+def write_sm4(
+    filepath: Union[str, PathLike[str]],
+    channels: int = 4,
+    xres: int = 256,
+    yres: int = 256,
+    size: Optional[int] = None,
+    spectra: int = 0,
+    spectrum_size: Tuple[int, int] = (512, 4),
+    grid: Optional[Tuple[int, int]] = None,
+    compress_prm: bool = True,
+    prm_size: int = 1 << 16,
+    drift: bool = False,
+    flip_x: bool = False,
+    flip_y: bool = False,
+    seed: int = 0,
+) -> int:
+    """Write a synthetic SM4-file with random data
+
+    The headers and metadata of all pages are written first, followed by the
+    Page Data and the PRM.
+    Equal arguments give byte-identical files. The Page Data is generated
+    and written in chunks, so files larger than the available memory can be
+    written.
+
+    Args:
+        filepath: Path of the file to write
+        channels: Number of image channels
+        xres: Number of pixels of the images in x
+        yres: Number of pixels of the images in y
+        size: If set, `xres` and `yres` are chosen such that the file has
+            about this size in bytes, with square images
+        spectra: Number of spectroscopy (IV) channels
+        spectrum_size: Number of points of a spectrum and number of spectra
+            of every spectroscopy channel
+        grid: If set, the spectra are taken on a grid of this number of
+            points in x and y, which is written to the Page Headers of the
+            spectroscopy channels. Every spectroscopy channel has a spectrum
+            for every grid point, instead of the number of spectra of
+            `spectrum_size`
+        compress_prm: If True, the PRM is zlib-compressed
+        prm_size: Size of the uncompressed PRM in bytes
+        drift: If True, the pages contain drift objects, i.e. Image Drift
+            Header and Data for images and Spec Drift Header and Data for
+            spectra
+        flip_x: If True, the x_scale of the images is negative, i.e. the
+            data is stored from right to left
+        flip_y: If True, the y_scale of the images is positive, i.e. the
+            data is stored from bottom to top
+        seed: Seed of the random data
+
+    Returns:
+        The size of the written file in bytes
+    """
+    if size is not None:
+        xres = yres = resolution_for_size(
+            size, channels, prm_size if not compress_prm else 0
+        )
+
+    pages = [
+        _image_page(i, xres, yres, drift, flip_x, flip_y)
+        for i in range(channels)
+    ]
+    points, count = spectrum_size
+    grid_x_size, grid_y_size = (0, 0) if grid is None else grid
+    if grid is not None:
+        count = grid_x_size * grid_y_size
+    pages += [
+        _spectrum_page(points, count, drift, grid_x_size, grid_y_size)
+        for _ in range(spectra)
+    ]
+
+    prm_data = _prm_text(prm_size, xres, yres).encode("CP437")
+    prm = zlib.compress(prm_data) if compress_prm else prm_data
+    prm_header = PrmHeader._layout.pack(
+        int(compress_prm), len(prm_data), len(prm)
+    )
+
+    with open(filepath, "wb") as f:
+        return _write(f, pages, prm_header, prm, np.random.default_rng(seed))
+
+
+def resolution_for_size(size: int, channels: int, prm_size: int = 0) -> int:
+    """Number of pixels per side of square images, such that a file written
+    by [`write_sm4`][sm4file.synthetic.write_sm4] has about `size` bytes
+
+    Args:
+        size: Size of the file in bytes
+        channels: Number of image channels
+        prm_size: Size of the stored PRM in bytes
+
+    Returns:
+        The number of pixels in x and y
+    """
+    page_data_size = max(size - prm_size, 0) // max(channels, 1)
+    return max(math.isqrt(page_data_size // 4), 1)
+
+
+def _image_page(
+    index: int, xres: int, yres: int, drift: bool, flip_x: bool, flip_y: bool
+) -> _PageSpec:
+    """Topography and current images, alternating. Unflipped images have a
+    positive x_scale and a negative y_scale
+    """
+    if index % 2 == 0:
+        page_type, label, z_units = (
+            RhkPageType.RHK_PAGE_TOPOGRAPHIC,
+            "Topography",
+            "m",
+        )
+    else:
+        page_type, label, z_units = (
+            RhkPageType.RHK_PAGE_CURRENT,
+            "Current",
+            "A",
+        )
+
+    page = _PageSpec(
+        RhkPageDataType.RHK_DATA_IMAGE,
+        page_type,
+        RhkLineType.RHK_LINE_NOT_A_LINE,
+        label,
+        xres,
+        yres,
+        x_scale=-1e-10 if flip_x else 1e-10,
+        y_scale=1e-10 if flip_y else -1e-10,
+        z_scale=1e-9 / _Z_RANGE,
+        x_units="m",
+        z_units=z_units,
+    )
+    if drift:
+        page.header_objects = [
+            (
+                RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER,
+                ImageDriftHeader._layout.pack(_filetime(), 0),
+            ),
+            (
+                RhkObjectType.RHK_OBJECT_IMAGE_DRIFT,
+                ImageDriftData._layout.pack(0, 0, 0, 0, 0, 0, 0),
+            ),
+        ]
+    return page
+
+
+def _spectrum_page(
+    points: int, count: int, drift: bool, grid_x_size: int, grid_y_size: int
+) -> _PageSpec:
+    """IV spectra, with a row of `points` values for each of `count`
+    spectra, taken on a grid of `grid_x_size` x `grid_y_size` points if set
+    """
+    page = _PageSpec(
+        RhkPageDataType.RHK_DATA_LINE,
+        RhkPageType.RHK_PAGE_IV_SPECTRA,
+        RhkLineType.RHK_LINE_IV_SPECTRUM,
+        "Current",
+        points,
+        count,
+        x_scale=2.0 / points,
+        y_scale=1.0,
+        z_scale=1e-9 / _Z_RANGE,
+        x_units="V",
+        z_units="A",
+        grid_x_size=grid_x_size,
+        grid_y_size=grid_y_size,
+    )
+    if drift:
+        drift_data = np.zeros(count, dtype=SpecDriftData._dtype)
+        drift_data["time"] = np.arange(count, dtype=np.float32)
+        page.header_objects = [
+            (
+                RhkObjectType.RHK_OBJECT_SPEC_DRIFT_HEADER,
+                SpecDriftHeader._layout.pack(_filetime(), 0)
+                + _sm4_string("Topography"),
+            ),
+            (RhkObjectType.RHK_OBJECT_SPEC_DRIFT_DATA, drift_data.tobytes()),
+        ]
+    return page
+
+
+def _write(
+    f: BinaryIO,
+    pages: Sequence[_PageSpec],
+    prm_header: bytes,
+    prm: bytes,
+    rng: np.random.Generator,
+) -> int:
+    """Compute the offsets of all objects and write them to `f`"""
+    object_size = Sm4Object._layout.size
+    page_index_header_offset = Sm4FileHeader._layout.size + 3 * object_size
+    page_index_array_offset = (
+        page_index_header_offset
+        + Sm4PageIndexHeader._layout.size
+        + object_size
+    )
+    page_entry_size = Sm4Page._layout.size + 2 * object_size
+
+    # metadata of all pages, with its offset
+    offset = page_index_array_offset + len(pages) * page_entry_size
+    page_headers: List[Tuple[int, bytes]] = []
+    for page in pages:
+        objects = [
+            (RhkObjectType.RHK_OBJECT_STRING_DATA, _string_data(page))
+        ] + page.header_objects
+        object_offset = (
+            offset
+            + Sm4PageHeaderDefault._layout.size
+            + len(objects) * object_size
+        )
+        object_list = b""
+        for obj_type, content in objects:
+            object_list += _object(obj_type, object_offset, len(content))
+            object_offset += len(content)
+        page_headers.append((
+            offset,
+            _page_header(page, len(objects))
+            + object_list
+            + b"".join(content for _, content in objects),
+        ))
+        offset = object_offset
+
+    page_data_offsets: List[int] = []
+    for page in pages:
+        page_data_offsets.append(offset)
+        offset += page.page_data_size
+    prm_header_offset = offset
+    prm_offset = prm_header_offset + len(prm_header)
+
+    f.write(
+        Sm4FileHeader._layout.pack(
+            Sm4FileHeader._layout.size - 2,
+            _SIGNATURE.encode("utf-16-le"),
+            len(pages),
+            3,
+            object_size,
+        )
+    )
+    f.write(
+        _object(
+            RhkObjectType.RHK_OBJECT_PAGE_INDEX_HEADER,
+            page_index_header_offset,
+            Sm4PageIndexHeader._layout.size,
+        )
+    )
+    f.write(_object(RhkObjectType.RHK_OBJECT_PRM, prm_offset, len(prm)))
+    f.write(
+        _object(
+            RhkObjectType.RHK_OBJECT_PRM_HEADER,
+            prm_header_offset,
+            len(prm_header),
+        )
+    )
+
+    f.write(Sm4PageIndexHeader._layout.pack(len(pages), 1))
+    f.write(
+        _object(
+            RhkObjectType.RHK_OBJECT_PAGE_INDEX_ARRAY,
+            page_index_array_offset,
+            len(pages) * page_entry_size,
+        )
+    )
+
+    for page_id, (page, (header_offset, header), data_offset) in enumerate(
+        zip(pages, page_headers, page_data_offsets), start=1
+    ):
+        f.write(
+            Sm4Page._layout.pack(
+                page_id,
+                page.page_data_type.value,
+                RhkPageSourceType.RHK_SOURCE_RAW.value,
+                2,
+                4,
+            )
+        )
+        f.write(
+            _object(
+                RhkObjectType.RHK_OBJECT_PAGE_HEADER,
+                header_offset,
+                Sm4PageHeaderDefault._layout.size,
+            )
+        )
+        f.write(
+            _object(
+                RhkObjectType.RHK_OBJECT_PAGE_DATA,
+                data_offset,
+                page.page_data_size,
+            )
+        )
+
+    for _, header in page_headers:
+        f.write(header)
+
+    for page in pages:
+        remaining = page.x_size * page.y_size
+        while remaining > 0:
+            chunk = rng.integers(
+                -_Z_RANGE, _Z_RANGE, min(remaining, _CHUNK_SIZE), np.int32
+            ).astype("<i4", copy=False)
+            f.write(chunk.data)
+            remaining -= len(chunk)
+
+    f.write(prm_header)
+    f.write(prm)
+    return f.tell()
+
+
+def _object(obj_type: RhkObjectType, offset: int, size: int) -> bytes:
+    return Sm4Object._layout.pack(obj_type.value, offset, size)
+
+
+def _page_header(page: _PageSpec, object_list_count: int) -> bytes:
+    return Sm4PageHeaderDefault._layout.pack(
+        len(_strings(page)),
+        page.page_type.value,
+        0,
+        page.line_type.value,
+        0,
+        0,
+        page.x_size,
+        page.y_size,
+        0,
+        0,
+        0,
+        page.page_data_size,
+        -_Z_RANGE & 0xFFFFFFFF,
+        _Z_RANGE - 1,
+        page.x_scale,
+        page.y_scale,
+        page.z_scale,
+        0.0,
+        0.0,
+        0.0,
+        0.0,
+        0.0025,
+        1.0,
+        1e-10,
+        0.0,
+        0,
+        page.grid_x_size,
+        page.grid_y_size,
+        object_list_count,
+        0,
+    )
+
+
+def _strings(page: _PageSpec) -> List[str]:
+    """Strings of the String Data, in the order of
+    [`StringData`][sm4file.sm4_object_types.StringData]
+    """
+    return [
+        page.label,
+        "",
+        "Synthetic data",
+        "",
+        "synthetic.SM4",
+        _DATETIME.strftime("%m/%d/%y"),
+        _DATETIME.strftime("%H:%M:%S"),
+        page.x_units,
+        page.x_units,
+        page.z_units,
+        "",
+        "",
+        "",
+        f"{page.y_size:04d}",
+    ]
+
+
+def _string_data(page: _PageSpec) -> bytes:
+    return b"".join(_sm4_string(string) for string in _strings(page))
+
+
+def _sm4_string(string: str) -> bytes:
+    return struct.pack("<H", len(string)) + string.encode("utf-16-le")
+
+
+def _filetime() -> int:
+    """Windows FILETIME of `_DATETIME`, i.e. 100 ns since 1601-01-01"""
+    epoch = datetime(1601, 1, 1, tzinfo=timezone.utc)
+    delta = _DATETIME.replace(tzinfo=timezone.utc) - epoch
+    return (delta.days * 86400 + delta.seconds) * 10**7
+
+
+def _prm_text(size: int, xres: int, yres: int) -> str:
+    """PRM text of about `size` characters, padded with synthetic
+    parameters
+    """
+    lines = [
+        "   WinSpm 2003.00 Program Configuration File",
+        "",
+        "[CONFIGURE SYSTEM]" + "*" * 57,
+        "",
+        "[Head:Scanner]",
+        "<1>\tScan head description ::Synthetic",
+        "[Scan:Size]",
+        f"<2>\tScan X Size ::{xres}",
+        f"<3>\tScan Y Size ::{yres}",
+    ]
+    length = sum(len(line) + 2 for line in lines)
+    param_id = 4
+    while length < size:
+        if param_id % 16 == 0:
+            line = f"[Synthetic:{param_id // 16}]"
+        else:
+            line = f"<{param_id}>\tParameter {param_id} ::{param_id * 1e-3:e}"
+        lines.append(line)
+        length += len(line) + 2
+        param_id += 1
+    return "\r\n".join(lines) + "\r\n"
+
+
+def _parse_size(size: str) -> int:
+    """Parse a size in bytes with an optional K, M or G suffix"""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    suffix = size[-1:].upper()
+    if suffix in units:
+        return int(float(size[:-1]) * units[suffix])
+    return int(size)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Path:
+    """Command line interface of [`write_sm4`][sm4file.synthetic.write_sm4]
+
+    Args:
+        argv: Command line arguments, defaults to `sys.argv[1:]`
+
+    Returns:
+        The path of the written file
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sm4file.synthetic",
+        description="Write a synthetic SM4-file with random data",
+    )
+    parser.add_argument("filepath", help="path of the file to write")
+    parser.add_argument(
+        "--size",
+        type=_parse_size,
+        help="approximate size of the file, e.g. 1M or 2G",
+    )
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--xres", type=int, default=256)
+    parser.add_argument("--yres", type=int, default=256)
+    parser.add_argument("--spectra", type=int, default=0)
+    parser.add_argument(
+        "--grid",
+        type=int,
+        nargs=2,
+        metavar=("X", "Y"),
+        help="grid of the spectra, e.g. 16 16",
+    )
+    parser.add_argument(
+        "--uncompressed-prm", dest="compress_prm", action="store_false"
+    )
+    parser.add_argument("--prm-size", type=_parse_size, default=1 << 16)
+    parser.add_argument("--drift", action="store_true")
+    parser.add_argument("--flip-x", action="store_true")
+    parser.add_argument("--flip-y", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_sm4(
+        args.filepath,
+        channels=args.channels,
+        xres=args.xres,
+        yres=args.yres,
+        size=args.size,
+        spectra=args.spectra,
+        grid=None if args.grid is None else tuple(args.grid),
+        compress_prm=args.compress_prm,
+        prm_size=args.prm_size,
+        drift=args.drift,
+        flip_x=args.flip_x,
+        flip_y=args.flip_y,
+        seed=args.seed,
+    )
+    return Path(args.filepath)
+
+
+if __name__ == "__main__":
+    path = main()
+    print(f"Wrote {path.stat().st_size} bytes to {path}")
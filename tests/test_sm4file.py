@@ -1,9 +1,59 @@
+import asyncio
+import inspect
+import io
+import json
+import mmap
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import threading
 import pytest
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
+from typing import List
 
-from sm4file import Sm4, RhkPageType, RhkLineType
-from sm4file.sm4_file import RhkImageType, RhkScanType
+import numpy as np
+
+from sm4file import (
+    LoadStats,
+    Sm4,
+    Sm4Cache,
+    Sm4Channel,
+    Sm4Index,
+    RhkPageType,
+    RhkLineType,
+    load_many,
+    scan_headers,
+)
+from sm4file.benchmark import (
+    PHASES,
+    benchmark_file,
+    find_regressions,
+    host_info,
+    load_baseline,
+    main as benchmark_main,
+    save_baseline,
+)
+from sm4file.cursor import CoalescingCursor, Cursor, StreamCursor
+from sm4file.sm4_file import (
+    RhkImageType,
+    RhkObjectType,
+    RhkScanType,
+    Sm4FileAll,
+    Sm4Page,
+    Sm4PageHeaderDefault,
+    register_object_decoder,
+)
+from sm4file.sm4_object_types import (
+    ImageDriftHeader,
+    SequentialData,
+    SpecDriftData,
+    StringData,
+)
+from sm4file.synthetic import main as synthetic_main, write_sm4
 
 
 testfiles_path = Path(__file__).parent / "test_files"
@@ -77,3 +127,831 @@ def test_stm_4ch() -> None:
         assert round(ch.bias, 5) == 0.50808
         assert round(ch.current * 1e10, 5) == 9.96017
         assert ch.angle == 42.0
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    base = array
+    while isinstance(base, np.ndarray) and base.base is not None:
+        base = base.base
+    if isinstance(base, memoryview):
+        base = base.obj
+    return isinstance(base, mmap.mmap)
+
+
+def test_mmap() -> None:
+    s = Sm4FileAll(str(TEST_IV))
+    s_mmap = Sm4FileAll(str(TEST_IV), mmap=True)
+    for page, page_mmap in zip(s.pages, s_mmap.pages):
+        assert page_mmap.data is not None
+        assert _is_mapped(page_mmap.data.raw_data)
+        assert np.array_equal(page.data.data, page_mmap.data.data)
+
+    # the channels are scaled by load_data only
+    for ch, ch_mmap in zip(Sm4(str(TEST_IV)), Sm4(str(TEST_IV), mmap=True)):
+        assert ch_mmap.data is None
+        assert _is_mapped(ch_mmap.raw_data)
+        assert np.array_equal(ch.data, ch_mmap.load_data())
+        assert ch_mmap.data is not None
+
+
+def test_lazy() -> None:
+    s = Sm4(str(TEST_IV))
+    s_lazy = Sm4(str(TEST_IV), lazy=True)
+    assert len(s_lazy) == len(s)
+    for ch, ch_lazy in zip(s, s_lazy):
+        assert ch_lazy._page_data is None
+        assert ch_lazy.data is None
+        assert ch_lazy.label == ch.label
+        assert np.array_equal(ch.data, ch_lazy.load_data())
+        ch_lazy.release()
+        assert ch_lazy._page_data is None
+        assert ch_lazy.data is None
+        assert np.array_equal(ch.data, ch_lazy.load_data())
+
+
+def test_scan_headers() -> None:
+    s = Sm4(str(TEST_IV))
+    records = list(scan_headers([testfiles_path]))
+    assert len(records) == len(s)
+    for record, ch in zip(records, s):
+        assert record.filepath == str(TEST_IV)
+        assert record.label == ch.label
+        assert record.page_type == ch.page_type
+        assert record.datetime == ch.datetime
+        assert record.xres == ch.xres
+        assert record.bias == ch.bias
+        assert record.current == ch.current
+
+
+def test_scan_headers_errors(tmp_path: Path) -> None:
+    shutil.copy(TEST_IV, tmp_path / "a.SM4")
+    (tmp_path / "b.SM4").write_bytes(TEST_IV.read_bytes()[:2000])
+    (tmp_path / "c.SM4").write_bytes(b"\xff" * 2000)
+    skipped: List[Path] = []
+    records = list(
+        scan_headers(
+            [tmp_path], errors=lambda path, error: skipped.append(path)
+        )
+    )
+    assert {record.filepath for record in records} == {str(tmp_path / "a.SM4")}
+    assert skipped == [tmp_path / "b.SM4", tmp_path / "c.SM4"]
+    with pytest.warns(RuntimeWarning):
+        assert len(list(scan_headers([tmp_path / "b.SM4"]))) == 0
+
+
+def test_spec_drift_data() -> None:
+    s = Sm4FileAll(str(TEST_IV))
+    for page in s.pages:
+        assert isinstance(page.header, Sm4PageHeaderDefault)
+        drift = [
+            obj
+            for obj in page.header.page_header_objects
+            if isinstance(obj, SpecDriftData)
+        ]
+        assert len(drift) == 1
+        assert drift[0].specdrift_time.shape == (page.header.y_size,)
+        assert np.all(np.diff(drift[0].specdrift_time) > 0)
+
+
+def test_channel_init() -> None:
+    ch = Sm4(str(TEST_IV), lazy=True)[0]
+    data = np.zeros((ch.yres, ch.xres))
+    fields = {
+        name: getattr(ch, name)
+        for name in inspect.signature(Sm4Channel).parameters
+        if name != "data"
+    }
+    assert not any(name.startswith("_") for name in fields)
+    ch_init = Sm4Channel(**fields, data=data)
+    assert ch_init.data is data
+    assert ch_init.load_data() is data
+    assert "data=" in repr(ch_init)
+    assert asdict(ch_init)["data"] is not None
+    assert Sm4Channel(**fields).data is None
+    with pytest.raises(ValueError):
+        Sm4Channel(**fields).load_data()
+
+
+def test_keep_raw_dtype() -> None:
+    s = Sm4(str(TEST_IV))
+    s_raw = Sm4(str(TEST_IV), dtype=np.float32, keep_raw=True)
+    for ch, ch_raw in zip(s, s_raw):
+        assert ch_raw.raw_data.dtype == np.int32
+        assert ch_raw.load_data().dtype == np.float32
+        assert np.allclose(ch.data, ch_raw.load_data(), rtol=1e-6)
+        ch_raw.release()
+        assert ch_raw.data is None
+        assert ch_raw.raw_data is not None
+        assert ch_raw.load_data().dtype == np.float32
+
+
+def test_load_many(tmp_path: Path) -> None:
+    s = Sm4(str(TEST_IV))
+    loaded = list(load_many([TEST_IV, TEST_IV], workers=2))
+    assert len(loaded) == 2
+    for sm4 in loaded:
+        assert sm4.filepath == str(TEST_IV)
+        assert len(sm4) == len(s)
+        for ch, ch_loaded in zip(s, sm4):
+            assert ch_loaded.label == ch.label
+            assert np.array_equal(ch.data, ch_loaded.data)
+            if sys.platform != "win32":
+                # kept in shared memory instead of copied
+                assert not ch_loaded.data.flags.owndata
+
+    path = tmp_path / "sequential.SM4"
+    path.write_bytes(sequential_content())
+    (sm4,) = load_many([path], workers=1)
+    (sequential_ch,) = sm4.sequential_channels
+    assert np.array_equal(sequential_ch.data, [[2, 1], [6, 2], [10, 3]])
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_threads(mmap: bool) -> None:
+    s = Sm4(str(TEST_IV))
+    s_threads = Sm4(str(TEST_IV), mmap=mmap, threads=4)
+    assert len(s_threads) == len(s)
+    for ch, ch_threads in zip(s, s_threads):
+        assert ch_threads.label == ch.label
+        assert np.array_equal(ch.data, ch_threads.load_data())
+
+
+def test_open_async() -> None:
+    s = Sm4(str(TEST_IV))
+
+    async def read_all() -> List[Sm4Channel]:
+        sm4 = await Sm4.open_async(str(TEST_IV))
+        return [ch async for ch in sm4]
+
+    channels = asyncio.run(read_all())
+    assert len(channels) == len(s)
+    for ch, ch_async in zip(s, channels):
+        assert ch_async._page_data is not None
+        assert np.array_equal(ch.data, ch_async.load_data())
+
+
+def test_open_async_cancel() -> None:
+    async def read_first() -> Sm4:
+        sm4 = await Sm4.open_async(str(TEST_IV))
+        async for _ in sm4.iter_async(concurrency=1):
+            break
+        return sm4
+
+    sm4 = asyncio.run(read_first())
+    assert sm4[0]._page_data is not None
+    assert all(ch._page_data is None for ch in sm4[1:])
+
+
+def test_index(tmp_path: Path) -> None:
+    s = Sm4(str(TEST_IV))
+    with Sm4Index(tmp_path / "index.db") as index:
+        assert index.update([testfiles_path]) == 1
+        assert index.update([testfiles_path]) == 0
+        records = index.query(
+            page_type=RhkPageType.RHK_PAGE_RAMP_SPECTROSCOPY_RP,
+            bias=(0.9, 1.1),
+            start=datetime(2023, 6, 1),
+            end=datetime(2023, 7, 1),
+        )
+        assert [record.label for record in records] == [ch.label for ch in s]
+        assert records[0].datetime == s[0].datetime
+        assert index.query(bias=(0.4, 0.6)) == []
+        assert index.query(page_type=RhkPageType.RHK_PAGE_TOPOGRAPHIC) == []
+        (files,) = index.files()
+        assert files.signature == "STiMage 005.004 1"
+        assert files.page_count == len(s)
+
+        # corrupt files are skipped, the others are indexed
+        corrupt = tmp_path / "corrupt.SM4"
+        corrupt.write_bytes(TEST_IV.read_bytes()[:2000])
+        skipped: List[Path] = []
+        assert (
+            index.update(
+                [testfiles_path, corrupt],
+                errors=lambda path, error: skipped.append(path),
+            )
+            == 0
+        )
+        assert skipped == [corrupt]
+        assert len(index.files()) == 1
+
+
+def test_cache(tmp_path: Path) -> None:
+    filepath = tmp_path / TEST_IV.name
+    shutil.copy(TEST_IV, filepath)
+    cache = Sm4Cache()
+
+    sm4 = cache.get(filepath)
+    assert cache.get(filepath) is sm4
+    assert cache.get_data(filepath, 1) is sm4[1].data
+    info = cache.info()
+    assert (info.hits, info.misses, info.entries) == (2, 1, 1)
+    assert info.nbytes == sum(ch.data.nbytes for ch in sm4)
+
+    cache.max_bytes = info.nbytes
+    data = cache.get_data(filepath, 0, dtype=np.float32)
+    assert not data.flags.writeable
+    assert cache.info().evictions == 1
+    assert cache.get_data(filepath, 0, dtype=np.float32) is data
+
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get_data(filepath, 0, dtype=np.float32) is not data
+    assert cache.info().invalidations == 1
+
+
+def test_cache_file(tmp_path: Path) -> None:
+    filepath = tmp_path / TEST_IV.name
+    shutil.copy(TEST_IV, filepath)
+    cache = Sm4Cache()
+    nbytes = 0
+    for page in cache.get_file(filepath).pages:
+        assert page.data is not None and page.data.x_values is not None
+        # scaled after being cached
+        nbytes += page.data.data.nbytes + page.data.raw_data.nbytes
+        nbytes += page.data.x_values.nbytes
+    assert cache.info().nbytes == nbytes
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_in_memory(lazy: bool) -> None:
+    s = Sm4(str(TEST_IV))
+    content = TEST_IV.read_bytes()
+    with open(TEST_IV, "rb") as f:
+        sources = [content, io.BytesIO(content), f]
+        for source in sources:
+            s_memory = Sm4(source, lazy=lazy)
+            assert s_memory.filepath is None
+            for ch, ch_memory in zip(s, s_memory):
+                assert ch_memory.datetime == ch.datetime
+                assert np.array_equal(ch_memory.load_data(), ch.data)
+
+    # the BytesIO is not kept from being changed
+    bio = io.BytesIO(content)
+    s_memory = Sm4(bio, lazy=lazy)
+    bio.write(b"\0" * 16)
+    bio.close()
+    for ch, ch_memory in zip(s, s_memory):
+        assert np.array_equal(ch_memory.load_data(), ch.data)
+
+
+def read_pipe(content: bytes) -> Sm4:
+    """Read `content` from a pipe, which is not seekable"""
+    read_fd, write_fd = os.pipe()
+
+    def write() -> None:
+        with open(write_fd, "wb") as f:
+            f.write(content)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with open(read_fd, "rb") as f:
+        assert not f.seekable()
+        s = Sm4(f)
+    writer.join()
+    return s
+
+
+def test_stream() -> None:
+    s = Sm4(str(TEST_IV))
+    s_stream = read_pipe(TEST_IV.read_bytes())
+
+    assert s_stream.prm_str == s.prm_str
+    for ch, ch_stream in zip(s, s_stream):
+        assert ch_stream.label == ch.label
+        assert np.array_equal(ch_stream.data, ch.data)
+
+
+def headers_last_content() -> bytes:
+    """Content of TEST_IV with the Page Headers moved to the end, after the
+    objects they list
+    """
+    content = bytearray(TEST_IV.read_bytes())
+    cursor = Cursor(io.BytesIO(TEST_IV.read_bytes()))
+    file_header = Sm4FileAll(str(TEST_IV)).file_header
+    position = file_header.page_index_header.page_index_array_offset()
+    for _ in range(file_header.page_count):
+        cursor.set_position(position)
+        page = Sm4Page.from_buffer(cursor)
+        for index, obj in enumerate(page.object_list):
+            if obj.obj_type == RhkObjectType.RHK_OBJECT_PAGE_HEADER:
+                cursor.set_position(obj.offset)
+                header = Sm4PageHeaderDefault.from_buffer(cursor)
+                size = obj.size + 12 * header.object_list_count
+                # the object list of the header keeps its absolute offsets
+                moved = content[obj.offset : obj.offset + size]
+                content[obj.offset : obj.offset + size] = bytes(size)
+                struct.pack_into(
+                    "<I", content, position + 32 + 12 * index + 4, len(content)
+                )
+                content += moved
+        position += 32 + 12 * page.object_list_count
+    return bytes(content)
+
+
+def test_stream_out_of_order() -> None:
+    content = headers_last_content()
+    s = Sm4(content)
+    s_stream = read_pipe(content)
+    assert len(s_stream) == len(s) == 5
+    for ch, ch_stream in zip(s, s_stream):
+        assert ch_stream.label == ch.label
+        assert ch_stream.datetime == ch.datetime
+        assert np.array_equal(ch_stream.data, ch.data)
+
+
+def test_stream_release() -> None:
+    cursor = StreamCursor(io.BytesIO(bytes(range(100))))
+    cursor.set_position(10)
+    assert cursor.read(10) == bytes(range(10, 20))
+    # skipped and read bytes are kept until released
+    assert cursor.nbytes_kept == 20
+    cursor.release(0, 15)
+    assert cursor.nbytes_kept == 5
+    cursor.set_position(15)
+    assert cursor.read(5) == bytes(range(15, 20))
+    cursor.release_read()
+    assert cursor.nbytes_kept == 0
+    cursor.set_position(30)
+    cursor.read(1)
+    # bytes of released ranges are not kept
+    cursor.release(22, 25)
+    assert cursor.nbytes_kept == 8
+    cursor.set_position(21)
+    assert cursor.read(1) == bytes([21])
+    for position in (12, 23):
+        cursor.set_position(position)
+        with pytest.raises(BufferError):
+            cursor.read(1)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_coalesce(lazy: bool) -> None:
+    s = Sm4(str(TEST_IV))
+    s_coalesced = Sm4(str(TEST_IV), lazy=lazy, coalesce=4096)
+    assert s.read_stats is None
+    assert s_coalesced.read_stats is not None
+    assert s_coalesced.read_stats.reads == 5
+    for ch, ch_coalesced in zip(s, s_coalesced):
+        assert ch_coalesced.label == ch.label
+        assert np.array_equal(ch_coalesced.load_data(), ch.data)
+
+
+def test_coalesce_without_fileno() -> None:
+    s = Sm4(str(TEST_IV))
+    # a seekable stream without file descriptor
+    stream = io.BufferedReader(io.BytesIO(TEST_IV.read_bytes()))
+    s_coalesced = Sm4(stream, coalesce=4096)
+    assert s_coalesced.read_stats is not None
+    assert s_coalesced.read_stats.reads == 5
+    for ch, ch_coalesced in zip(s, s_coalesced):
+        assert np.array_equal(ch_coalesced.data, ch.data)
+
+
+def test_coalesce_overlapping() -> None:
+    content = bytes(range(256)) * 64
+    cursor = CoalescingCursor(io.BytesIO(content), max_gap=0, min_read=16)
+    cursor.prefetch([(100, 50), (400, 8)])
+    # reads overlapping the prefetched regions and each other
+    for position, size in [(140, 30), (90, 20), (395, 40), (60, 400), (0, 8)]:
+        cursor.set_position(position)
+        assert cursor.read(size) == content[position : position + size]
+
+    starts = cursor._region_starts
+    ends = [start + len(r) for start, r in zip(starts, cursor._regions)]
+    assert all(end <= start for end, start in zip(ends, starts[1:]))
+    for start, region in zip(starts, cursor._regions):
+        assert bytes(region) == content[start : start + len(region)]
+
+
+def test_thumbnail() -> None:
+    s = Sm4(str(TEST_IV), lazy=True)
+    for ch in s:
+        assert ch.thumbnail is not None
+        assert ch.thumbnail.shape == (1, 299)
+        assert ch.thumbnail.dtype == np.int32
+        assert ch._page_data is None
+    assert s[0].thumbnail is not None
+    assert s[0].thumbnail[0, :3].tolist() == [-1689, -1618, -1550]
+
+
+def image_content(x_scale: float = -0.01, y_scale: float = -0.01) -> bytes:
+    """Content of TEST_IV, with the first page turned into a 299 x 5 image.
+    The x-axis is flipped for negative `x_scale`, the y-axis for positive
+    `y_scale`
+    """
+    content = bytearray(TEST_IV.read_bytes())
+    struct.pack_into("<I", content, 138, 0)  # page data type
+    struct.pack_into("<I", content, 5254, 0)  # line type
+    struct.pack_into("<2f", content, 5298, x_scale, y_scale)
+    return bytes(content)
+
+
+@pytest.mark.parametrize(
+    "x_scale, y_scale",
+    [(-0.01, -0.01), (0.01, -0.01), (0.01, 0.01), (-0.01, 0.01)],
+)
+def test_read_region(x_scale: float, y_scale: float) -> None:
+    content = image_content(x_scale, y_scale)
+    s = Sm4(content)
+    s_lazy = Sm4(content, lazy=True)
+    image = s[0].data
+    assert image.shape == (5, 299)
+    # oriented by arrange_data, starting with the upper left pixel
+    unflipped = Sm4(image_content(0.01, -0.01))[0].data
+    flips = tuple(
+        axis
+        for axis, flipped in [(0, y_scale > 0), (1, x_scale < 0)]
+        if flipped
+    )
+    assert np.array_equal(image, np.flip(unflipped, flips))
+
+    for rows, cols in [
+        (slice(None), slice(None)),
+        (slice(1, 3), slice(10, 20)),
+        (slice(None, None, -2), slice(250, None, 7)),
+        (slice(4, 4), slice(None)),
+    ]:
+        region = s_lazy[0].read_region(rows, cols)
+        assert np.array_equal(region, image[rows, cols])
+        assert np.array_equal(s[0].read_region(rows, cols), image[rows, cols])
+    assert s_lazy[0]._page_data is None
+
+    with pytest.raises(ValueError):
+        s_lazy[1].read_region(slice(0, 1))
+
+
+@pytest.mark.parametrize("y_scale", [-0.01, 0.01])
+def test_preview(y_scale: float) -> None:
+    s = Sm4(image_content(y_scale=y_scale))
+    s_lazy = Sm4(image_content(y_scale=y_scale), lazy=True)
+    image = s[0].data
+    preview = s_lazy[0].preview(max_side=100)
+    assert preview.shape == (2, 100)
+    assert np.array_equal(preview, image[::3, ::3])
+    assert np.array_equal(s[0].preview(max_side=100), preview)
+
+
+def sequential_content() -> bytes:
+    """Content of TEST_IV with an additional sequential page of 3 samples of
+    2 parameters
+    """
+    content = bytearray(TEST_IV.read_bytes())
+    header = bytearray(struct.pack("<6I", 0, 3, 2, 0, 0, 0))
+    for gain, label, unit in [(2.0, "Temp", "K"), (0.5, "Pres", "mbar")]:
+        header += struct.pack("<f", gain)
+        for string in (label, unit):
+            header += struct.pack("<H", len(string))
+            header += string.encode("utf-16-le")
+    data = np.arange(1, 7, dtype="<f4").tobytes()
+
+    header_offset = len(content)
+    content += header
+    data_offset = len(content)
+    content += data
+    # page index array entry after the 5 existing pages
+    struct.pack_into("<H14x4I", content, 522, 6, 6, 0, 2, 0)
+    struct.pack_into("<3I", content, 554, 3, header_offset, len(header))
+    struct.pack_into("<3I", content, 566, 4, data_offset, len(data))
+    struct.pack_into("<I", content, 38, 6)  # page count of file header
+    struct.pack_into("<I", content, 94, 6)  # page count of page index header
+    return bytes(content)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_sequential(lazy: bool) -> None:
+    s = Sm4(sequential_content(), lazy=lazy)
+    assert len(s) == 5
+    assert len(s.sequential_channels) == 1
+    ch = s.sequential_channels[0]
+    assert ch.param_labels == ["Temp", "Pres"]
+    assert ch.param_units == ["K", "mbar"]
+    assert ch.raw_data.shape == (3, 2)
+    assert np.array_equal(ch.data, [[2, 1], [6, 2], [10, 3]])
+
+
+def test_sequential_data_size() -> None:
+    def read(raw: bytes, gains: List[float]) -> SequentialData:
+        return SequentialData.from_buffer(
+            Cursor(io.BytesIO(raw)), len(raw), 0, gains
+        )
+
+    assert read(b"", []).raw_data.shape == (0, 0)
+    assert read(bytes(16), [1.0, 2.0]).raw_data.shape == (2, 2)
+    # a trailing incomplete sample
+    with pytest.raises(ValueError):
+        read(bytes(12), [1.0, 2.0])
+    with pytest.raises(ValueError):
+        read(bytes(8), [])
+
+
+def test_prm() -> None:
+    s = Sm4(str(TEST_IV))
+    assert s.prm._prm_data is None
+    assert (
+        s.prm_params["Head:Scanner"]["Scan head description"] == "RHK UHV-STM"
+    )
+    assert s.prm.get("Scan:Size", "missing") is None
+    assert s.prm_str.startswith("   WinSpm 2003.00")
+
+
+@pytest.mark.parametrize("compress_prm", [False, True])
+def test_synthetic(tmp_path: Path, compress_prm: bool) -> None:
+    path = tmp_path / "synthetic.SM4"
+    size = write_sm4(
+        path,
+        channels=2,
+        xres=64,
+        yres=32,
+        spectra=1,
+        compress_prm=compress_prm,
+        drift=True,
+    )
+    assert size == path.stat().st_size
+
+    s = Sm4(path)
+    assert [ch.page_type for ch in s] == [
+        RhkPageType.RHK_PAGE_TOPOGRAPHIC,
+        RhkPageType.RHK_PAGE_CURRENT,
+        RhkPageType.RHK_PAGE_IV_SPECTRA,
+    ]
+    assert s[0].data.shape == (32, 64)
+    assert s[2].data.shape == (512, 5)
+    assert s[0].datetime == datetime(2023, 6, 17, 11, 12, 42)
+    assert s.prm_params["Scan:Size"]["Scan X Size"] == "64"
+
+    sm4file = Sm4FileAll(path)
+    header = sm4file.pages[0].header
+    assert isinstance(header, Sm4PageHeaderDefault)
+    assert isinstance(header.page_header_objects[1], ImageDriftHeader)
+
+    # equal arguments give identical files
+    path_2 = tmp_path / "synthetic_2.SM4"
+    write_sm4(
+        path_2,
+        channels=2,
+        xres=64,
+        yres=32,
+        spectra=1,
+        compress_prm=compress_prm,
+        drift=True,
+    )
+    assert path_2.read_bytes() == path.read_bytes()
+
+
+def test_synthetic_main(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    args = [str(path), "--channels", "1", "--xres", "16", "--yres", "8"]
+    assert synthetic_main(args + ["--flip-x", "--grid", "2", "2"]) == path
+    assert Sm4(path)[0].data.shape == (8, 16)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "sm4file.synthetic", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert result.stdout == f"Wrote {path.stat().st_size} bytes to {path}\n"
+
+
+def test_synthetic_grid(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=1, xres=8, yres=8, spectra=2, grid=(3, 4))
+    pages = Sm4FileAll(path).pages
+    for page in pages[1:]:
+        assert isinstance(page.header, Sm4PageHeaderDefault)
+        assert (page.header.grid_x_size, page.header.grid_y_size) == (3, 4)
+        # a spectrum for every grid point
+        assert page.header.y_size == 12
+    assert isinstance(pages[0].header, Sm4PageHeaderDefault)
+    assert pages[0].header.grid_x_size == 0
+    assert Sm4(path)[1].data.shape == (512, 13)
+
+
+@pytest.mark.parametrize(
+    "flip_x, flip_y", [(False, True), (True, False), (True, True)]
+)
+def test_synthetic_flipped(tmp_path: Path, flip_x: bool, flip_y: bool) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=1, xres=64, yres=32)
+    flipped_path = tmp_path / "flipped.SM4"
+    write_sm4(
+        flipped_path,
+        channels=1,
+        xres=64,
+        yres=32,
+        flip_x=flip_x,
+        flip_y=flip_y,
+    )
+
+    image = Sm4(path)[0].data
+    s = Sm4(flipped_path)
+    s_lazy = Sm4(flipped_path, lazy=True)
+    flipped = s[0].data
+    flips = tuple(axis for axis, flip in [(0, flip_y), (1, flip_x)] if flip)
+    # the same raw data, stored in the other direction
+    assert np.array_equal(flipped, np.flip(image, flips))
+    rows, cols = slice(3, 20, 2), slice(None, 40, -3)
+    assert np.array_equal(
+        s_lazy[0].read_region(rows, cols), flipped[rows, cols]
+    )
+    assert np.array_equal(s_lazy[0].preview(max_side=32), flipped[::2, ::2])
+
+    page_index_header = Sm4FileAll(flipped_path).file_header.page_index_header
+    page_index_array = page_index_header.object_list[0]
+    assert page_index_array.size == 32 + 2 * 12
+
+
+def test_benchmark(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, xres=64, yres=64)
+    times = benchmark_file(path, repeat=1)
+    assert tuple(times) == PHASES
+
+    baseline = {"small": {"sm4": 0.1, "scale": 0.1}}
+    results = {"small": {"sm4": 0.5, "scale": 0.11, "prm": 1.0}}
+    regressions = find_regressions(baseline, results, tolerance=0.5)
+    assert [r.phase for r in regressions] == ["sm4"]
+    assert regressions[0].ratio == pytest.approx(5.0)
+
+
+def test_benchmark_baseline(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    args = ["--sizes", "small", "--repeat", "1", "--directory", str(tmp_path)]
+    path = tmp_path / "benchmarks" / "baseline.json"
+    assert benchmark_main(args + ["--save", str(path)]) == 0
+    host, results = load_baseline(path)
+    assert host == host_info()
+    assert list(results) == ["small"]
+
+    # impossibly fast baseline of this host
+    save_baseline(path, {"small": {"sm4": 1e-6}})
+    assert benchmark_main(args + ["--baseline", str(path)]) == 1
+
+    # timings of another host are not compared
+    baseline = json.loads(path.read_text())
+    baseline["host"]["node"] += "-other"
+    path.write_text(json.dumps(baseline))
+    capsys.readouterr()
+    assert benchmark_main(args + ["--baseline", str(path)]) == 0
+    assert "different host" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_stats(lazy: bool) -> None:
+    phases: List[str] = []
+    stats = LoadStats(hook=lambda phase, seconds: phases.append(phase))
+    s = Sm4(str(TEST_IV), lazy=lazy, stats=stats)
+    for ch in s:
+        ch.load_data()
+
+    assert phases[:3] == ["file_header", "page_index", "pages"]
+    assert set(phases) == set(stats.phase_times)
+    assert RhkObjectType.RHK_OBJECT_STRING_DATA in stats.object_times
+    assert RhkObjectType.RHK_OBJECT_PAGE_DATA in stats.object_times
+    assert RhkObjectType.RHK_OBJECT_UNDEFINED not in stats.object_times
+    assert stats.cursor.reads > 0
+    assert stats.cursor.seeks > 0
+    # all Page Data is read, 5 pages of 299 x 5 values
+    assert stats.cursor.nbytes >= 5 * 299 * 5 * 4
+    assert stats.nbytes_allocated >= 5 * 299 * 5 * 4
+
+
+def test_sm4_strings() -> None:
+    strings = ["Å Ångström", " V\x00", "\U0001f600 x", "V"]
+    raw = b"".join(
+        struct.pack("<H", len(string.encode("utf-16-le")) // 2)
+        + string.encode("utf-16-le")
+        for string in strings
+    )
+    cursor = Cursor(io.BytesIO(raw))
+    read = cursor.read_sm4_strings(3) + [cursor.read_sm4_string()]
+    assert read == ["Å Ångström", "V", "\U0001f600 x", "V"]
+    # short strings are interned
+    assert read[1] is read[3]
+    assert cursor.tell() == len(raw)
+
+
+def test_objects(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=2, xres=64, yres=32, drift=True)
+    stats = LoadStats()
+    stats_all = LoadStats()
+    sm4file = Sm4FileAll(path, objects="minimal", stats=stats)
+    sm4file_all = Sm4FileAll(path, stats=stats_all)
+    # the skipped objects are not read
+    assert stats.cursor.nbytes < stats_all.cursor.nbytes
+
+    for page, page_all in zip(sm4file.pages, sm4file_all.pages):
+        assert page.label == page_all.label
+        header = page.header
+        assert isinstance(header, Sm4PageHeaderDefault)
+        assert isinstance(page_all.header, Sm4PageHeaderDefault)
+        assert [type(obj) for obj in header.page_header_objects] == [
+            StringData
+        ]
+        drift_header = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER
+        drift = sm4file.load_page_header_object(page, drift_header)
+        assert isinstance(drift, ImageDriftHeader)
+        assert drift == page_all.header.objects_by_type[drift_header]
+        assert header.objects_by_type[drift_header] is drift
+
+    assert Sm4(path, objects="minimal")[0].datetime == Sm4(path)[0].datetime
+    with pytest.raises(ValueError):
+        Sm4FileAll(path, objects="unknown")
+
+
+def test_objects_without_string_data(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=2, xres=64, yres=32, drift=True)
+    drift_header = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER
+
+    sm4file = Sm4FileAll(path, objects={drift_header})
+    assert [page.label for page in sm4file.pages] == ["", ""]
+    header = sm4file.pages[0].header
+    assert isinstance(header, Sm4PageHeaderDefault)
+    assert set(header.objects_by_type) == {drift_header}
+
+    # the channels always get the labels and dates of the StringData
+    s_all = Sm4(path)
+    for objects in [set(), {drift_header}]:
+        s = Sm4(path, objects=objects)
+        assert [ch.label for ch in s] == [ch.label for ch in s_all]
+        assert [ch.datetime for ch in s] == [ch.datetime for ch in s_all]
+
+
+def test_register_object_decoder(tmp_path: Path) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=1, xres=64, yres=32, drift=True)
+    decoded: List[int] = []
+
+    def decode_drift_header(
+        cursor: Cursor, page_header: Sm4PageHeaderDefault
+    ) -> ImageDriftHeader:
+        decoded.append(page_header.string_count)
+        return ImageDriftHeader.from_buffer(cursor)
+
+    drift_header = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER
+    drift_data = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT
+    previous = register_object_decoder(drift_header, decode_drift_header)
+    previous_data = register_object_decoder(drift_data, None)
+    try:
+        header = Sm4FileAll(path).pages[0].header
+    finally:
+        register_object_decoder(drift_header, previous)
+        register_object_decoder(drift_data, previous_data)
+
+    assert isinstance(header, Sm4PageHeaderDefault)
+    assert decoded == [header.string_count]
+    assert set(header.objects_by_type) == {
+        RhkObjectType.RHK_OBJECT_STRING_DATA,
+        drift_header,
+    }
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_object_decoders(tmp_path: Path, stream: bool) -> None:
+    path = tmp_path / "synthetic.SM4"
+    write_sm4(path, channels=1, xres=64, yres=32, drift=True)
+    drift_header = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT_HEADER
+    drift_data = RhkObjectType.RHK_OBJECT_IMAGE_DRIFT
+
+    def decode_raw(cursor: Cursor, page_header: Sm4PageHeaderDefault) -> bytes:
+        return bytes(cursor.read(4))
+
+    decoders = {drift_header: decode_raw, drift_data: None}
+    if stream:
+        # parsed in a single forward pass
+        read_fd, write_fd = os.pipe()
+
+        def write() -> None:
+            with open(write_fd, "wb") as f:
+                f.write(path.read_bytes())
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        with open(read_fd, "rb") as f:
+            sm4file = Sm4FileAll(f, decoders=decoders)
+        writer.join()
+    else:
+        sm4file = Sm4FileAll(path, decoders=decoders)
+    header = sm4file.pages[0].header
+    assert isinstance(header, Sm4PageHeaderDefault)
+    # decoders of any return type, only for this file
+    assert isinstance(header.objects_by_type[drift_header], bytes)
+    assert drift_data not in header.objects_by_type
+    assert RhkObjectType.RHK_OBJECT_STRING_DATA in header.objects_by_type
+    other_header = Sm4FileAll(path).pages[0].header
+    assert isinstance(other_header, Sm4PageHeaderDefault)
+    assert isinstance(
+        other_header.objects_by_type[drift_header], ImageDriftHeader
+    )
+
+    lazy = Sm4FileAll(path, objects="minimal", decoders=decoders)
+    assert lazy.load_page_header_object(lazy.pages[0], drift_header) == (
+        header.objects_by_type[drift_header]
+    )
+    assert lazy.load_page_header_object(lazy.pages[0], drift_data) is None
+    assert Sm4(path, decoders=decoders)[0].label == "Topography"